@@ -1,8 +1,10 @@
+import functools
+import os
+import sys
 import pygame
-import random
 
-pygame.init()
-pygame.font.init()
+from drill_engine import GameState, LevelNames, TileTypes, TileCodes, UP, DOWN, LEFT, RIGHT, OTHER
+
 screen_width = 800
 screen_height = 600
 tile_size = 40
@@ -10,322 +12,430 @@ tiles_width = screen_width // tile_size
 tiles_height = screen_height // tile_size
 overhead_height = 3
 max_drill_level = tiles_height - overhead_height
-screen = pygame.display.set_mode((screen_width, screen_height))
-clock = pygame.time.Clock()
-
-pygame.key.set_repeat(500, 100)
-pygame.display.set_caption('Drill Baby Drill!')
+# set by Init(): importing the module opens no window and loads no assets
+screen = None
+clock = None
+renderer = None
 dt = 0
 
-bearimage = pygame.image.load("img/bear.png")
-boulderimage = pygame.image.load("img/boulder.png")
-dirtimage = pygame.image.load("img/dirt.png")
-drillbabyimage = pygame.image.load("img/drillbaby.png")
-drillbitimage = pygame.image.load("img/drillbit.png")
-drillshaftimage = pygame.image.load("img/drillshaft.png")
-emptyholebottomimage = pygame.image.load("img/emptyholebottom.png")
-shaftimage = pygame.image.load("img/shaft.png")
-skyimage = pygame.image.load("img/sky.png")
-surfaceimage = pygame.image.load("img/surface.png")
-surfaceholeimage = pygame.image.load("img/surfacehole.png")
-victoryimage = pygame.image.load("img/victory.png")
-
-gamefont = pygame.font.Font("fonts/VT323-Regular.ttf", 24)
-text_surface1 = gamefont.render("instruct: Use right/left to move baby and up/down to raise or lower your drill.",
-                               False, pygame.Color('yellow'))
-text_surface2 = gamefont.render("          find all the lost bears. don't drill into a rock. Win game.",
-                               False, pygame.Color('yellow'))
-flagfont = pygame.font.Font("fonts/VT323-Regular.ttf", 32)
-flag_text_surface = flagfont.render("nope@nope.nope", False, pygame.Color('black'))
-flag_message_text_surface1 = flagfont.render("You win! Drill Baby is reunited with", False, pygame.Color('yellow'))
-flag_message_text_surface2 = flagfont.render("all its bears. Welcome to Flare-On 12.", False, pygame.Color('yellow'))
-
-TileImages = {
-    'dirt':dirtimage,
-    'sky':skyimage,
-    'surface':surfaceimage,
-    'surfacehole':surfaceholeimage,
-    'shaft':shaftimage,
-    'emptyholebottom':emptyholebottomimage,
-    'boulder':boulderimage
-}
+instruct_text1 = "instruct: Use right/left to move baby and up/down to raise or lower your drill."
+instruct_text2 = "          find all the lost bears. don't drill into a rock. Win game."
+flag_message_text1 = "You win! Drill Baby is reunited with"
+flag_message_text2 = "all its bears. Welcome to Flare-On 12."
+
+
+def ConvertForDisplay(image):
+    # match the display's pixel format once so blits don't convert every time
+    if pygame.display.get_surface() is None:
+        return image
+    if image.get_flags() & pygame.SRCALPHA:
+        return image.convert_alpha()
+    return image.convert()
+
+
+class Assets:
+    """Images and fonts, each loaded the first time it is asked for.
+
+    Images are converted to the display format on load (convert_alpha() for
+    ones with per-pixel alpha, convert() for opaque ones). With use_atlas
+    (--atlas on the command line), and if img/atlas.bmp (written by PackAtlas)
+    is present and newer than the images it holds, every image is cut from
+    that one file instead of decoding its own PNG. It is opt-in because it has
+    not measured faster than the separate PNGs.
+    """
+    def __init__(self, imgdir="img", fontdir="fonts", use_atlas=False):
+        self.imgdir = imgdir
+        self.fontdir = fontdir
+        self.use_atlas = use_atlas
+        self.images = {}
+        self.atlas = None
+
+    def image(self, name):
+        image = self.images.get(name)
+        if image is None:
+            image = self.images[name] = self.load(name)
+        return image
+
+    def load(self, name):
+        if self.atlas is None:
+            self.atlas = self.use_atlas and self.loadAtlas()
+        if self.atlas and name in self.atlas[1]:
+            atlas, index = self.atlas
+            x, y, w, h, hasalpha = index[name]
+            image = atlas.subsurface((x, y, w, h))
+            if pygame.display.get_surface() is None:
+                return image
+            return image.convert_alpha() if hasalpha else image.convert()
+        return ConvertForDisplay(pygame.image.load(os.path.join(self.imgdir, name + ".png")))
+
+    def loadAtlas(self):
+        path = os.path.join(self.imgdir, "atlas.bmp")
+        try:
+            index = {}
+            with open(os.path.join(self.imgdir, "atlas.txt"), "r", encoding="utf-8") as f:
+                for line in f:
+                    name, x, y, w, h, hasalpha = line.split()
+                    index[name] = (int(x), int(y), int(w), int(h), hasalpha == "1")
+            built = os.path.getmtime(path)
+            if any(os.path.getmtime(os.path.join(self.imgdir, name + ".png")) > built for name in index):
+                return False
+        except (OSError, ValueError):
+            return False
+        return pygame.image.load(path), index
+
+    @functools.cached_property
+    def gamefont(self):
+        return pygame.font.Font(os.path.join(self.fontdir, "VT323-Regular.ttf"), 24)
+
+    @functools.cached_property
+    def flagfont(self):
+        return pygame.font.Font(os.path.join(self.fontdir, "VT323-Regular.ttf"), 32)
+
+assets = Assets()
+
+
+def PackAtlas(imgdir="img"):
+    """Pack every img/*.png into img/atlas.bmp, with "name x y w h alpha" lines in img/atlas.txt.
+
+    The atlas is an uncompressed 32-bit BMP, so loading it is a single read with
+    no PNG decoding. Assets only uses it with use_atlas (--atlas).
+    """
+    names = sorted(os.path.splitext(f)[0] for f in os.listdir(imgdir)
+                   if f.endswith(".png"))
+    images = {name: pygame.image.load(os.path.join(imgdir, name + ".png")) for name in names}
+    # shelf packing, tallest images first
+    width = max(1024, max(image.get_width() for image in images.values()))
+    x = y = shelf = 0
+    index = {}
+    for name in sorted(names, key=lambda n: (-images[n].get_height(), n)):
+        w, h = images[name].get_size()
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        hasalpha = bool(images[name].get_flags() & pygame.SRCALPHA) or images[name].get_colorkey() is not None
+        index[name] = [x, y, w, h, hasalpha]
+        x += w
+        shelf = max(shelf, h)
+    atlas = pygame.Surface((width, y + shelf), pygame.SRCALPHA)
+    for name, (x, y, w, h, hasalpha) in index.items():
+        image = images[name]
+        if image.get_colorkey() is not None:
+            # a plain blit skips colorkey pixels, so they stay alpha 0 in the atlas
+            atlas.blit(image, (x, y))
+        else:
+            # RGBA_MAX onto the all-zero atlas copies pixels and alpha exactly, no blending
+            atlas.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+    pygame.image.save(atlas, os.path.join(imgdir, "atlas.bmp"))
+    with open(os.path.join(imgdir, "atlas.txt"), "w", encoding="utf-8") as f:
+        for name, (x, y, w, h, hasalpha) in index.items():
+            f.write("%s %d %d %d %d %d\n" % (name, x, y, w, h, hasalpha))
+    return index
+
+
+def Init():
+    global screen, clock, renderer
+    pygame.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    clock = pygame.time.Clock()
+
+    pygame.key.set_repeat(500, 100)
+    pygame.display.set_caption('Drill Baby Drill!')
+    renderer = DirtyRenderer(screen)
+
+
+class DirtyRenderer:
+    """Collects the screen regions that changed since the last frame.
+
+    Everything that alters what is on screen marks its rect; flush() redraws only
+    those rects (with the clip set, so overlapping sprites and text are repainted
+    in order) and hands them to display.update(). A frame with nothing marked
+    draws nothing and updates nothing.
+    """
+    def __init__(self, surface):
+        self.surface = surface
+        self.rects = []
+
+    def mark(self, rect):
+        rect = pygame.Rect(rect).clip(self.surface.get_rect())
+        if not rect.w or not rect.h:
+            return
+        # fold into an overlapping rect so a region is never drawn twice
+        i = rect.collidelist(self.rects)
+        while i != -1:
+            rect.union_ip(self.rects.pop(i))
+            i = rect.collidelist(self.rects)
+        self.rects.append(rect)
+
+    def markAll(self):
+        self.rects = [self.surface.get_rect()]
+
+    def flush(self, drawfn):
+        if not self.rects:
+            return []
+        rects, self.rects = self.rects, []
+        for rect in rects:
+            self.surface.set_clip(rect)
+            drawfn(self.surface, rect)
+        self.surface.set_clip(None)
+        pygame.display.update(rects)
+        return rects
+
+@functools.lru_cache(maxsize=128)
+def RenderText(font, text, color):
+    # rasterised strings, least recently used evicted first; fonts hash by identity
+    return font.render(text, False, pygame.Color(color))
+
+class DigitAtlas:
+    """The digits 0-9 of one font and colour rendered once into a single strip.
+
+    Numbers are drawn by blitting areas of the strip, so a changing counter
+    never goes back to the font rasteriser.
+    """
+    def __init__(self, font, color):
+        self.strip = font.render('0123456789', False, pygame.Color(color))
+        height = self.strip.get_height()
+        offsets = [font.size('0123456789'[:i])[0] for i in range(11)]
+        self.areas = [pygame.Rect(offsets[i], 0, offsets[i + 1] - offsets[i], height) for i in range(10)]
+
+    def blits(self, value, pos):
+        # (source, dest, area) triples for Surface.blits(), plus the rect they cover
+        x, y = pos
+        parts = []
+        for digit in '%d' % value:
+            area = self.areas[ord(digit) - 48]
+            parts.append((self.strip, (x, y), area))
+            x += area.w
+        return parts, pygame.Rect(pos[0], y, x - pos[0], self.strip.get_height())
+
+@functools.lru_cache(maxsize=None)
+def GetDigitAtlas(font, color):
+    return DigitAtlas(font, color)
+
+# HUD slot -> (key, rect, blits); the blits list is built when the slot's content
+# changes and only replayed when its rect is redrawn
+hud_items = {}
+
+def SetHudItem(slot, key, rect, blits):
+    item = hud_items.get(slot)
+    if item is not None and item[0] == key:
+        return
+    if item is not None:
+        renderer.mark(item[1])
+    if key is None:
+        hud_items.pop(slot, None)
+        return
+    hud_items[slot] = (key, rect, blits)
+    renderer.mark(rect)
+
+def SetHudText(slot, text, font, color, pos):
+    if text is None:
+        SetHudItem(slot, None, None, None)
+        return
+    key = (font, text, color, pos)
+    if slot in hud_items and hud_items[slot][0] == key:
+        return
+    surface = RenderText(font, text, color)
+    SetHudItem(slot, key, surface.get_rect(topleft=pos), [(surface, pos)])
+
+def SetHudCounter(slot, label, value, font, color, pos):
+    key = (font, label, value, color, pos)
+    if slot in hud_items and hud_items[slot][0] == key:
+        return
+    labelsurface = RenderText(font, label, color)
+    digits, digitsrect = GetDigitAtlas(font, color).blits(value, (pos[0] + labelsurface.get_width(), pos[1]))
+    SetHudItem(slot, key, labelsurface.get_rect(topleft=pos).union(digitsrect),
+               [(labelsurface, pos)] + digits)
+
+class TileGrid:
+    """A GameState tile map (one type code per tile) pre-composited into one surface.
+
+    sync() copies the state's codes and blits just the tiles that changed into
+    the layer, so drawing any part of the background is a single blit from the
+    layer. The starting level is composited once; a new level is one blit of it.
+    """
+    def __init__(self, width, height, start_codes):
+        self.width = width
+        self.height = height
+        self.start_codes = start_codes
+        self.start_layer = pygame.Surface((width * tile_size, height * tile_size))
+        self.start_layer.blits([(assets.image(TileTypes[code]), ((i % width) * tile_size, (i // width) * tile_size))
+                                for i, code in enumerate(start_codes)], doreturn=False)
+        self.codes = bytearray(self.start_codes)
+        self.layer = self.start_layer.copy()
+
+    def sync(self, codes):
+        if self.codes == codes:
+            return
+        if codes == self.start_codes:
+            self.codes[:] = self.start_codes
+            self.layer.blit(self.start_layer, (0, 0))
+            renderer.mark(self.layer.get_rect())
+            return
+        for i, code in enumerate(codes):
+            if self.codes[i] != code:
+                self.setType(i % self.width, i // self.width, TileTypes[code])
+
+    def setType(self, x, y, type):
+        self.codes[y * self.width + x] = TileCodes[type]
+        rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+        self.layer.blit(assets.image(type), rect)
+        renderer.mark(rect)
+
+    def draw(self, surface, area):
+        surface.blit(self.layer, area, area)
 
-LevelNames = [
-    'California',
-    'Ohio',
-    'Death Valley',
-    'Mexico',
-    'The Grand Canyon'
-]
 
-class BackgroundTile(pygame.sprite.Sprite):
-    def __init__(self, x, y, type):
+class DrillBaby(pygame.sprite.Sprite):
+    """Draws the baby and its drill where a GameState says they are."""
+    def __init__(self, state):
         super().__init__()
-        self.setType(type)
+        self.state = state
+        self.image = assets.image('drillbaby')
         self.rect = self.image.get_rect()
-        self.x = x
-        self.y = y
+        self.sync()
+
+    def sync(self):
+        self.x = self.state.player_x
+        self.y = self.state.player_y
+        self.drill_level = self.state.drill.drill_level
         self.rect.top = self.y * tile_size
         self.rect.left = self.x * tile_size
 
-    def setType(self, type):
-        self.type = type
-        self.image = TileImages[self.type]
+    def columnRect(self):
+        # the baby, its drill and a found bear all live in the column below the baby
+        return pygame.Rect(self.x * tile_size, self.y * tile_size,
+                           tile_size, screen_height - self.y * tile_size)
 
     def draw(self, surface):
         surface.blit(self.image, self.rect)
-
-
-class Drill:
-    def __init__(self, max_levels):
-        self.drill_level = 0
-        self.max_levels = max_levels
-
-    def retract(self):
-        if self.drill_level > 0:
-            self.drill_level -= 1
-    
-    def drill(self):
-        if self.drill_level < self.max_levels:
-            self.drill_level += 1
-
-    def drillEngaged(self):
-        return self.drill_level != 0
-    
-    def draw(self, x, y, surface):
         remaining_tiles = self.drill_level
-        
+
         while remaining_tiles > 0:
-            drilly = y + remaining_tiles
+            drilly = self.y + remaining_tiles
             if remaining_tiles == self.drill_level:
-                drill_image = drillbitimage
+                drill_image = assets.image('drillbit')
             else:
-                drill_image = drillshaftimage
+                drill_image = assets.image('drillshaft')
             newrect = drill_image.get_rect()
             newrect.top = drilly * tile_size
-            newrect.left = x * tile_size
+            newrect.left = self.x * tile_size
             surface.blit(drill_image, newrect)
             remaining_tiles -= 1
 
+KeyActions = {
+    pygame.K_w: UP, pygame.K_UP: UP,
+    pygame.K_s: DOWN, pygame.K_DOWN: DOWN,
+    pygame.K_a: LEFT, pygame.K_LEFT: LEFT,
+    pygame.K_d: RIGHT, pygame.K_RIGHT: RIGHT,
+}
 
-class DrillBaby(pygame.sprite.Sprite):
-    def __init__(self, x, y, max_levels):
-        super().__init__()
-        self.drill = Drill(max_levels)
-        self.image = drillbabyimage
-        self.rect = self.image.get_rect()
-        self.x = x
-        self.y = y
-        self.rect.top = self.y * tile_size
-        self.rect.left = self.x * tile_size
-
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
-        self.drill.draw(self.x, self.y, surface)
-
-    def move(self, dx):
-        self.x += dx
-        self.rect.left = self.x * tile_size
-
-    def hitBoulder(self):
-        global boulder_layout
-        boulder_level = boulder_layout[self.x]
-        return boulder_level == self.drill.drill_level
-    
-    def hitBear(self):
-        return self.drill.drill_level == max_drill_level
-
-background_tiles = []
-boulder_layout = []
-
-
-def AttemptPlayerMove(dx, dy):
-    newx = player.x + dx
-
-    # Can only move within screen bounds
-    if newx < 0 or newx >= tiles_width:
-        return False
-
-    # Can only move side to side when drill is not engaged
-    if dx != 0 and player.drill.drillEngaged():
-        return False
-
-    # Operate drill if they moved up or down
-    if dy < 0:
-        player.drill.retract()
-    elif dy > 0:
-        DrillTile()
-
-    player.move(dx)
-    return True
-
+background_tiles = None
+state = None
 
-def DrillTile():
-    global player
-    player.drill.drill()
-    global background_tiles    
 
-    background_tile = background_tiles[player.y + player.drill.drill_level][player.x]
+def main():
+    global background_tiles
+    global state
+    Init()
+    running = True
+    victory_overlays = ()
 
-    if background_tile.type == 'dirt':
-        if player.hitBoulder():
-            background_tile.setType('boulder')
-        else:
-            background_tile.setType('emptyholebottom')
+    # the rules live in drill_engine; everything below only draws what the state says
+    state = GameState(tiles_width, tiles_height, overhead_height, LevelNames)
+    background_tiles = TileGrid(tiles_width, tiles_height, state.start_tiles)
+    player = DrillBaby(state)
+    shown_level = None
+    shown_bear = False
+    shown_victory = False
 
-        tile_above = background_tiles[player.y + player.drill.drill_level - 1][player.x]
-        
-        if player.drill.drill_level == 1:
-            tile_above.setType('surfacehole')
-        if player.drill.drill_level > 1:
-            tile_above.setType('shaft')
+    def DrawScene(surface, area):
+        #draw the background under the dirty area
+        background_tiles.draw(surface, area)
 
+        # display the instructions
+        surface.blit(RenderText(assets.gamefont, instruct_text1, 'yellow'), (0, 0))
+        surface.blit(RenderText(assets.gamefont, instruct_text2, 'yellow'), (0, 24))
 
-def GenerateFlagText(sum):
-    #key = sum >> 8
-    key = 180
-    encoded = "\xd0\xc7\xdf\xdb\xd4\xd0\xd4\xdc\xe3\xdb\xd1\xcd\x9f\xb5\xa7\xa7\xa0\xac\xa3\xb4\x88\xaf\xa6\xaa\xbe\xa8\xe3\xa0\xbe\xff\xb1\xbc\xb9"
-    plaintext = []
-    for i in range(0, len(encoded)):
-        plaintext.append(chr(ord(encoded[i]) ^ (key+i)))
-    return ''.join(plaintext)
+        # display status, level and location text
+        for key, rect, blits in hud_items.values():
+            surface.blits(blits, doreturn=False)
 
+        # draw the baby
+        player.draw(surface)
 
-def main():
-    global background_tiles  
-    global player
-    global LevelNames
-    global boulder_layout
-    victory_mode = False
-    bear_mode = False
-    next_level_mode = False
-    boulder_mode = False
-    bear_sum = 1
-    running = True
-    current_level = 0
-    flag_text = None
+        if shown_bear:
+            surface.blit(assets.image('bear'), (player.rect.x, screen_height - tile_size))
 
-    random.shuffle(LevelNames)
+        if shown_victory:
+            for overlay, pos in victory_overlays:
+                surface.blit(overlay, pos)
 
     while running:
-        background_tiles = BuildBackground()
-        player = DrillBaby(7, 2, max_drill_level)
-        boulder_layout = []
-        for i in range(0, tiles_width):
-            if (i != len(LevelNames[current_level])):
-                boulder_layout.append(random.randint(2, max_drill_level))
-            else:
-                boulder_layout.append(-1)
-
-        while running and not next_level_mode:
-
-            # poll for events
-            # pygame.QUIT event means the user clicked X to close your window
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN and not (boulder_mode or victory_mode):
-                    if bear_mode:
-                        bear_mode = False
-                        next_level_mode = True
-                    elif event.key == pygame.K_w or event.key == pygame.K_UP:
-                        AttemptPlayerMove(0, -1)
-                    elif event.key == pygame.K_s or event.key == pygame.K_DOWN:
-                        AttemptPlayerMove(0, 1)
-                    elif event.key == pygame.K_a or event.key == pygame.K_LEFT:
-                        AttemptPlayerMove(-1, 0)
-                    elif event.key == pygame.K_d or event.key == pygame.K_RIGHT:
-                        AttemptPlayerMove(1, 0)
-
-            #draw the background tiles
-            for tilerow in background_tiles:
-                for tile in tilerow:
-                    tile.draw(screen)
-
-            # display the instructions
-            screen.blit(text_surface1, (0, 0))
-            screen.blit(text_surface2, (0, 24))
-
-            # display status message
-            if boulder_mode:
-                statustext = "You Hit a Boulder, please reload try again when you are better at video games"
-                statussurface = gamefont.render(statustext, False, pygame.Color('red'))
-                screen.blit(statussurface, (0, 48))
+        # poll for events
+        # pygame.QUIT event means the user clicked X to close your window
+        actions = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                actions.append(KeyActions.get(event.key, OTHER))
+        state.step(actions)
+
+        # mark whatever the step changed
+        if state.current_level != shown_level:
+            shown_level = state.current_level
+            renderer.markAll()
+        background_tiles.sync(state.tiles)
+        if (player.x, player.drill_level, shown_bear) != (state.player_x, state.drill.drill_level, state.bear_mode):
+            renderer.mark(player.columnRect())
+            player.sync()
+            shown_bear = state.bear_mode
+            renderer.mark(player.columnRect())
+
+        # display status message
+        if state.boulder_mode:
+            SetHudText('status', "You Hit a Boulder, please reload try again when you are better at video games",
+                       assets.gamefont, 'red', (0, 48))
+            SetHudText('level', None, assets.gamefont, 'green', None)
+        else:
+            if state.bear_mode:
+                SetHudText('status', "You found a bear, press any key to drill for another!",
+                           assets.gamefont, 'green', (0, 48))
             else:
-                if bear_mode:
-                    statustext = "You found a bear, press any key to drill for another!"
-                    statussurface = gamefont.render(statustext, False, pygame.Color('green'))
-                    screen.blit(statussurface, (0, 48))
-                
-                # display stage name
-                leveltext = 'Level: ' + LevelNames[current_level]
-                levelnamesurface = gamefont.render(leveltext, False, pygame.Color('green'))
-                screen.blit(levelnamesurface, (screen_width - 12*len(leveltext), 48))
-
-            # display location info
-            locationtext = "Loc: %d" % player.x
-            depthtext = "Depth: %d" % player.drill.drill_level
-            locationtextsurface = gamefont.render(locationtext, False, pygame.Color('cyan'))
-            depthtextsurface = gamefont.render(depthtext, False, pygame.Color('cyan'))
-            screen.blit(locationtextsurface, (700, 72))
-            screen.blit(depthtextsurface, (700, 96))
-
-            # draw the baby
-            player.draw(screen)
-
-            if player.hitBoulder():
-                boulder_mode = False
-
-            if player.hitBear():
-                player.drill.retract()
-                bear_sum *= player.x
-                bear_mode = True
-
-            if bear_mode:
-                screen.blit(bearimage, (player.rect.x, screen_height - tile_size))
-                if current_level == len(LevelNames) - 1 and not victory_mode:
-                    victory_mode = True
-                    flag_text = GenerateFlagText(bear_sum)
-                    print("Your Flag: " + flag_text)
-
-            if victory_mode:
-                flag_text_surface = flagfont.render(flag_text, False, pygame.Color('black'))
-                screen.blit(victoryimage, (111, 50))
-                screen.blit(flag_message_text_surface1, (150, 60))
-                screen.blit(flag_message_text_surface2, (150, 92))
-                screen.blit(flag_text_surface, (200, 125))
-
-            # flip() the display to put your work on screen
-            pygame.display.flip()
-
-            # limits FPS to 60
-            # dt is delta time in seconds since last frame, used for framerate-
-            # independent physics.
-            dt = clock.tick(60) / 1000
-        
-        next_level_mode = False
-        current_level += 1
+                SetHudText('status', None, assets.gamefont, 'green', None)
+
+            # display stage name
+            leveltext = 'Level: ' + state.level_names[state.current_level]
+            SetHudText('level', leveltext, assets.gamefont, 'green', (screen_width - 12*len(leveltext), 48))
+
+        # display location info
+        SetHudCounter('loc', "Loc: ", state.player_x, assets.gamefont, 'cyan', (700, 72))
+        SetHudCounter('depth', "Depth: ", state.drill.drill_level, assets.gamefont, 'cyan', (700, 96))
+
+        if state.victory_mode and not shown_victory:
+            shown_victory = True
+            print("Your Flag: " + state.flag_text)
+            victory_overlays = ((assets.image('victory'), (111, 50)),
+                                (RenderText(assets.flagfont, flag_message_text1, 'yellow'), (150, 60)),
+                                (RenderText(assets.flagfont, flag_message_text2, 'yellow'), (150, 92)),
+                                (RenderText(assets.flagfont, state.flag_text, 'black'), (200, 125)))
+            for overlay, pos in victory_overlays:
+                renderer.mark(overlay.get_rect(topleft=pos))
+
+        # redraw and push only what changed; an idle frame does no drawing at all
+        renderer.flush(DrawScene)
+
+        # limits FPS to 60
+        # dt is delta time in seconds since last frame, used for framerate-
+        # independent physics.
+        dt = clock.tick(60) / 1000
 
     pygame.quit()
     return
 
-def BuildBackground():
-    tileset = []
-    # make two rows of pure sky, one surface row, then fill the remaining rows with dirt
-    for y in range(0, tiles_height):
-        row = []
-        for x in range(0, tiles_width):
-            if y < 2:
-                type = 'sky'
-            elif y == 2:
-                type = 'surface'
-            else:
-                type = 'dirt'
-            
-            row.append(BackgroundTile(x, y, type))
-        tileset.append(row)
-
-    return tileset
-
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if '--pack-atlas' in sys.argv:
+        print("Packed %d images into img/atlas.bmp" % len(PackAtlas()))
+    else:
+        assets.use_atlas = '--atlas' in sys.argv
+        main()
\ No newline at end of file
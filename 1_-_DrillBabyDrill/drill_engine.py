@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+drill_engine.py
+
+The rules of Drill Baby Drill with no pygame: importable and runnable without
+a display, so games can be simulated by the thousand.
+
+GameState holds everything main() used to keep in module globals and locals
+(player position, drill depth, boulder layout, tile map, bear / boulder /
+victory modes, bear_sum). A frame is state.step(actions):
+
+  - a level whose bear was acknowledged is replaced by the next one (main()'s
+    next_level_mode check at the top of its loop);
+  - each action is one key press: UP / DOWN / LEFT / RIGHT, anything else is
+    "some other key" (it only matters in bear mode);
+  - the end-of-frame checks run: hitting a bear retracts the drill and
+    multiplies bear_sum by the column, finding the last level's bear is victory.
+
+Randomness (level order, boulder depths) comes from `rng`, the random module by
+default, in the same order as the game, so a seeded game replays identically.
+The tile map is a bytearray of TileCodes; DrillBabyDrill.py is a view over it.
+
+Usage:
+  python3 drill_engine.py --games 10000
+  python3 drill_engine.py --games 1000 --policy random --seed 7
+"""
+import random, time
+
+UP, DOWN, LEFT, RIGHT = 'up', 'down', 'left', 'right'
+OTHER = 'other'
+
+# tile type <-> one-byte code used for the tile map
+TileTypes = ['sky', 'surface', 'dirt', 'surfacehole', 'shaft', 'emptyholebottom', 'boulder']
+TileCodes = {type: code for code, type in enumerate(TileTypes)}
+
+LevelNames = [
+    'California',
+    'Ohio',
+    'Death Valley',
+    'Mexico',
+    'The Grand Canyon'
+]
+
+def StartingTileType(y):
+    # two rows of pure sky, one surface row, then the remaining rows are dirt
+    if y < 2:
+        return 'sky'
+    elif y == 2:
+        return 'surface'
+    else:
+        return 'dirt'
+
+def GenerateFlagText(sum):
+    #key = sum >> 8
+    key = 180
+    encoded = "\xd0\xc7\xdf\xdb\xd4\xd0\xd4\xdc\xe3\xdb\xd1\xcd\x9f\xb5\xa7\xa7\xa0\xac\xa3\xb4\x88\xaf\xa6\xaa\xbe\xa8\xe3\xa0\xbe\xff\xb1\xbc\xb9"
+    plaintext = []
+    for i in range(0, len(encoded)):
+        plaintext.append(chr(ord(encoded[i]) ^ (key+i)))
+    return ''.join(plaintext)
+
+
+class Drill:
+    def __init__(self, max_levels):
+        self.drill_level = 0
+        self.max_levels = max_levels
+
+    def retract(self):
+        if self.drill_level > 0:
+            self.drill_level -= 1
+
+    def drill(self):
+        if self.drill_level < self.max_levels:
+            self.drill_level += 1
+
+    def drillEngaged(self):
+        return self.drill_level != 0
+
+
+class GameState:
+    def __init__(self, width=20, height=15, overhead_height=3, level_names=LevelNames, rng=random):
+        self.width = width
+        self.height = height
+        self.max_drill_level = height - overhead_height
+        self.rng = rng
+        self.level_names = list(level_names)
+        rng.shuffle(self.level_names)
+        self.start_tiles = bytes(TileCodes[StartingTileType(y)] for y in range(height) for x in range(width))
+        self.tiles = bytearray(self.start_tiles)
+        self.drill = Drill(self.max_drill_level)
+        self.boulder_layout = [0] * width
+        self.victory_mode = False
+        self.bear_mode = False
+        self.next_level_mode = False
+        self.boulder_mode = False
+        self.bear_sum = 1
+        self.current_level = 0
+        self.flag_text = None
+        self.frames = 0
+        self.startLevel()
+
+    def startLevel(self):
+        self.tiles[:] = self.start_tiles
+        self.player_x = 7
+        self.player_y = 2
+        self.drill.drill_level = 0
+        bear_column = len(self.level_names[self.current_level])
+        for i in range(0, self.width):
+            if i != bear_column:
+                self.boulder_layout[i] = self.rng.randint(2, self.max_drill_level)
+            else:
+                self.boulder_layout[i] = -1
+
+    def tileType(self, x, y):
+        return TileTypes[self.tiles[y * self.width + x]]
+
+    def setTileType(self, x, y, type):
+        self.tiles[y * self.width + x] = TileCodes[type]
+
+    def hitBoulder(self):
+        return self.boulder_layout[self.player_x] == self.drill.drill_level
+
+    def hitBear(self):
+        return self.drill.drill_level == self.max_drill_level
+
+    def attemptPlayerMove(self, dx, dy):
+        newx = self.player_x + dx
+
+        # Can only move within screen bounds
+        if newx < 0 or newx >= self.width:
+            return False
+
+        # Can only move side to side when drill is not engaged
+        if dx != 0 and self.drill.drillEngaged():
+            return False
+
+        # Operate drill if they moved up or down
+        if dy < 0:
+            self.drill.retract()
+        elif dy > 0:
+            self.drillTile()
+
+        self.player_x = newx
+        return True
+
+    def drillTile(self):
+        self.drill.drill()
+        tiley = self.player_y + self.drill.drill_level
+
+        if self.tileType(self.player_x, tiley) == 'dirt':
+            if self.hitBoulder():
+                self.setTileType(self.player_x, tiley, 'boulder')
+            else:
+                self.setTileType(self.player_x, tiley, 'emptyholebottom')
+
+            if self.drill.drill_level == 1:
+                self.setTileType(self.player_x, tiley - 1, 'surfacehole')
+            if self.drill.drill_level > 1:
+                self.setTileType(self.player_x, tiley - 1, 'shaft')
+
+    def key(self, action):
+        if self.boulder_mode or self.victory_mode:
+            return
+        if self.bear_mode:
+            self.bear_mode = False
+            self.next_level_mode = True
+        elif action == UP:
+            self.attemptPlayerMove(0, -1)
+        elif action == DOWN:
+            self.attemptPlayerMove(0, 1)
+        elif action == LEFT:
+            self.attemptPlayerMove(-1, 0)
+        elif action == RIGHT:
+            self.attemptPlayerMove(1, 0)
+
+    def tick(self):
+        if self.hitBoulder():
+            self.boulder_mode = False
+
+        if self.hitBear():
+            self.drill.retract()
+            self.bear_sum *= self.player_x
+            self.bear_mode = True
+
+        if self.bear_mode:
+            if self.current_level == len(self.level_names) - 1 and not self.victory_mode:
+                self.victory_mode = True
+                self.flag_text = GenerateFlagText(self.bear_sum)
+
+    def step(self, actions=()):
+        """One frame: advance a finished level, apply the key presses, run the end-of-frame checks."""
+        if self.next_level_mode:
+            self.next_level_mode = False
+            self.current_level += 1
+            self.startLevel()
+        for action in actions:
+            self.key(action)
+        self.tick()
+        self.frames += 1
+
+# --- simulation ----------------------------------------------------------------------
+
+def drill_policy(state, rng):
+    """Drill straight down wherever the baby stands; acknowledge every bear."""
+    return (OTHER,) if state.bear_mode else (DOWN,)
+
+def random_policy(state, rng):
+    return (rng.choice((UP, DOWN, LEFT, RIGHT, OTHER)),)
+
+Policies = {'drill': drill_policy, 'random': random_policy}
+
+def play(policy, rng=random, max_frames=100000, **options):
+    """Run one game to victory (or max_frames); returns the final GameState."""
+    state = GameState(rng=rng, **options)
+    while not state.victory_mode and state.frames < max_frames:
+        state.step(policy(state, rng))
+    return state
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Simulate Drill Baby Drill games without a display")
+    p.add_argument("--games", type=int, default=1000)
+    p.add_argument("--policy", choices=sorted(Policies), default="drill")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--max-frames", type=int, default=100000, help="give up on a game after this many frames")
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    policy = Policies[args.policy]
+    wins = frames = 0
+    flags = {}
+    start = time.perf_counter()
+    for _ in range(args.games):
+        state = play(policy, rng, args.max_frames)
+        frames += state.frames
+        if state.victory_mode:
+            wins += 1
+            flags[state.flag_text] = flags.get(state.flag_text, 0) + 1
+    elapsed = time.perf_counter() - start
+    print(f"[+] {args.games} games ({args.policy}) in {elapsed:.2f}s: {args.games / elapsed:.0f} games/s, "
+          f"{frames / elapsed:.0f} frames/s, {wins} won")
+    for flag, n in sorted(flags.items(), key=lambda kv: -kv[1]):
+        print(f"    {n:6d}  {flag}")
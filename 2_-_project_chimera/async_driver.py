@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+async_driver.py
+
+Run many async payload invocations on one event loop.
+
+testing68.py called asyncio.run(func()) per candidate: a new event loop per call
+plus the payload's real asyncio.sleep(0.01). run_all() instead starts a single
+loop, spawns `concurrency` worker tasks that pull items from a shared iterator
+(so a million candidates never means a million pending tasks) and awaits
+run_one(item) for each; results come back in input order, or are handed to
+on_result(item, result) as they finish and not kept at all.
+
+VirtualClock is a drop-in for asyncio.sleep inside the payload's globals: a
+sleep adds its delay to the calling task's virtual time and only yields once
+(asyncio.sleep(0)), so tasks still interleave at every await but no wall time is
+spent. Virtual time is kept per task in a ContextVar; clock.reset() at the start
+of a run and clock.time() at the end give the seconds the run would have slept.
+
+Usage:
+  clock = VirtualClock()
+  g["asyncio"] = clock.asyncio          # asyncio with sleep() replaced
+  async def one(cand): ...; return record
+  results = run_all(candidates, one, concurrency=64)
+"""
+import asyncio, contextvars, time, types
+
+class VirtualClock:
+    def __init__(self):
+        self._now = contextvars.ContextVar("virtual_now", default=0.0)
+        self.total = 0.0          # virtual seconds slept across all tasks
+        self.sleeps = 0
+        self.asyncio = types.SimpleNamespace(**vars(asyncio))
+        self.asyncio.sleep = self.sleep
+
+    async def sleep(self, delay, result=None):
+        delay = max(0.0, float(delay))
+        self._now.set(self._now.get() + delay)
+        self.total += delay
+        self.sleeps += 1
+        await asyncio.sleep(0)
+        return result
+
+    def time(self):
+        """Virtual seconds the current task has slept since its last reset()."""
+        return self._now.get()
+
+    def reset(self):
+        self._now.set(0.0)
+
+async def _drive(items, run_one, concurrency, on_result):
+    results = []
+    it = enumerate(items)
+
+    async def worker():
+        for i, item in it:
+            res = await run_one(item)
+            if on_result is not None:
+                on_result(item, res)
+            else:
+                results.append((i, res))
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    results.sort(key=lambda r: r[0])
+    return [r for _, r in results]
+
+def run_all(items, run_one, concurrency=64, on_result=None):
+    """Await run_one(item) for every item on one event loop, at most `concurrency` at a time.
+
+    Returns the results in input order, or [] when on_result is given.
+    """
+    return asyncio.run(_drive(items, run_one, concurrency, on_result))
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Benchmark run_all() with real vs virtual asyncio.sleep")
+    p.add_argument("-n", type=int, default=2000, help="number of simulated payload runs")
+    p.add_argument("--concurrency", type=int, default=64)
+    p.add_argument("--delay", type=float, default=0.01, help="sleep inside each run (activate_catalyst: 0.01)")
+    args = p.parse_args()
+
+    for label, clock in (("real sleep", None), ("virtual clock", VirtualClock())):
+        sleep = clock.sleep if clock else asyncio.sleep
+
+        async def one(i):
+            await sleep(args.delay)
+            return i
+
+        start = time.perf_counter()
+        out = run_all(range(args.n), one, args.concurrency)
+        wall = time.perf_counter() - start
+        extra = f", {clock.total:.1f}s virtual" if clock else ""
+        print(f"[+] {label}: {len(out)} runs in {wall:.3f}s ({len(out) / wall:.0f}/s{extra})")
@@ -3,25 +3,29 @@
 auto_find_pyc.py
 
 Auto-detect concatenation order for blobs in testing3.py, try small header offsets,
-attempt to unmarshal code objects, write a valid .pyc for the successful
-combination, and save every failed attempt to disk for inspection.
+attempt to unmarshal code objects and write a valid .pyc for the successful
+combination. The order is derived from the marshal structure by
+blob_assembler.assemble() (no permutations); only the winning combination is
+written to pyc_attempts/, failed attempts go to the optional --journal file.
 """
 
-import importlib
-import importlib.util
-import itertools
+import argparse
 import marshal
 import os
-import struct
-import time
-import types
 import zlib
 import base64
 import sys
 from pathlib import Path
 
+from blob_assembler import Journal, assemble
+from pyc_header import build_header
+
+p = argparse.ArgumentParser(description="Find the blob order that unmarshals to a code object")
+p.add_argument("--max-offset", type=int, default=32, help="largest header offset to try in the first chunk")
+p.add_argument("--journal", default=None, help="optional JSON-lines file recording every assembly attempt")
+args = p.parse_args()
+
 OUT_DIR = Path("pyc_attempts")
-OUT_DIR.mkdir(exist_ok=True)
 
 
 # Get blobs
@@ -59,114 +63,60 @@ named_chunks = [
 # filter out empty chunks (shouldn't be empty but be defensive)
 named_chunks = [(n, b) for n, b in named_chunks if b]
 
-# helper to produce a safe filename for a permutation
-def perm_name(order):
-    names = [n for n, _ in order]
+# helper to produce a safe filename for a chunk order
+def perm_name(names):
     return "_".join(names)
 
-# logging
-summary = []
-found = False
-found_info = None
-
-# try all permutations
-for perm in itertools.permutations(named_chunks):
-    order_name = perm_name(perm)
-    combo = b"".join(b for _, b in perm)
-
-    # For inspection: save raw combo to disk (we will overwrite later if success)
-    attempt_raw_path = OUT_DIR / f"attempt_raw_{order_name}.bin"
-    with open(attempt_raw_path, "wb") as f:
-        f.write(combo)
-
-    # Try a set of small offsets in case the marshalled object is preceded by a header
-    # offsets range tuned to 0..32 bytes (covers small pyc headers or padding)
-    success = False
-    success_offset = None
-    success_codeobj = None
-    tried_offsets = []
-    errors_for_offsets = {}
-
-    for offset in range(0, 33):
-        tried_offsets.append(offset)
-        try:
-            candidate = combo[offset:]
-            obj = marshal.loads(candidate)
-            if isinstance(obj, types.CodeType):
-                success = True
-                success_offset = offset
-                success_codeobj = obj
-                break
-            else:
-                # got something but not a code object; record and continue
-                errors_for_offsets[offset] = f"marshal.loads returned {type(obj)}"
-        except Exception as e:
-            errors_for_offsets[offset] = repr(e)
-            continue
-
-    if success:
-        found = True
-        found_info = {
-            "order_name": order_name,
-            "offset": success_offset,
-            "raw_file": str(attempt_raw_path),
-            "pyc_file": None,
-        }
-
-        # Save the successful slice that was unmarshalled (for inspection)
-        success_slice_path = OUT_DIR / f"successful_slice_{order_name}_off{success_offset}.bin"
-        with open(success_slice_path, "wb") as f:
-            f.write(combo[success_offset:])
-
-        # Build a proper .pyc using this code object
-        pyc_filename = OUT_DIR / f"chimera_payload_{order_name}_off{success_offset}.pyc"
-        magic = importlib.util.MAGIC_NUMBER
-        # timestamp (4 bytes little-endian)
-        ts = struct.pack("<I", int(time.time()))
-        # For pyc format variants, we supply a 4-byte zero padding after timestamp (PEP 552 style uses 4 more bytes)
-        padding = b"\x00\x00\x00\x00"
-        with open(pyc_filename, "wb") as f:
-            f.write(magic)
-            f.write(ts)
-            f.write(padding)
-            f.write(marshal.dumps(success_codeobj))
-
-        found_info["pyc_file"] = str(pyc_filename)
-
-        # Save a small logfile describing the successful permutation and the offset
-        log_path = OUT_DIR / f"success_{order_name}_off{success_offset}.txt"
-        with open(log_path, "w") as L:
-            L.write(f"Permutation: {order_name}\n")
-            L.write(f"Offset used: {success_offset}\n")
-            L.write(f"Raw saved at: {attempt_raw_path}\n")
-            L.write(f"Successful slice saved at: {success_slice_path}\n")
-            L.write(f"Written .pyc: {pyc_filename}\n")
-            L.write(f"marshal.loads produced code object: {repr(success_codeobj)}\n")
-
-        print("✅ SUCCESS")
-        print(f"  Order: {order_name}")
-        print(f"  Offset: {success_offset}")
-        print(f"  Raw combo saved to: {attempt_raw_path}")
-        print(f"  Successful slice saved to: {success_slice_path}")
-        print(f"  Wrote .pyc to: {pyc_filename}")
-        # we stop after first success (user asked to detect the correct order); remove break to find all
-        break
-    else:
-        # save a small error log for this permutation
-        errlog = OUT_DIR / f"failed_{order_name}.log"
-        with open(errlog, "w") as EL:
-            EL.write(f"Permutation: {order_name}\n")
-            EL.write("Tried offsets: {}\n\n".format(tried_offsets))
-            for off, err in errors_for_offsets.items():
-                EL.write(f"Offset {off}: {err}\n")
-        summary.append((order_name, str(attempt_raw_path), str(errlog)))
-        print(f"✖ permutation {order_name} did NOT yield a code object (raw -> {attempt_raw_path}, log -> {errlog})")
-
-if not found:
-    print("\n❌ No valid marshal code object found in any permutation+offset (0..32).")
-    print("Saved raw attempts and logs to:", OUT_DIR.resolve())
-    print("Check the .bin/.log files for manual inspection.")
+# Build the order chunk by chunk from the marshal structure (see blob_assembler.py)
+# instead of trying every permutation x offset; nothing is written until we have a winner.
+journal = Journal(args.journal)
+result = assemble(named_chunks, max_offset=args.max_offset, journal=journal)
+journal.close()
+
+if result is None:
+    print(f"\n❌ No chunk order yields a valid marshal code object (offsets 0..{args.max_offset}).")
+    if args.journal:
+        print("Attempt journal written to:", args.journal)
     sys.exit(2)
-else:
-    print("\nDone. Summary written to:", OUT_DIR.resolve())
-    print("If you want me to continue and try larger offsets, or to try partial-trimming heuristics (prefix/suffix cropping), tell me and I'll extend the search.")
\ No newline at end of file
+
+order_name = perm_name(result["order"])
+success_offset = result["offset"]
+success_codeobj = result["code"]
+combo = result["combo"]
+
+OUT_DIR.mkdir(exist_ok=True)
+attempt_raw_path = OUT_DIR / f"attempt_raw_{order_name}.bin"
+with open(attempt_raw_path, "wb") as f:
+    f.write(combo)
+
+# Save the successful slice that was unmarshalled (for inspection)
+success_slice_path = OUT_DIR / f"successful_slice_{order_name}_off{success_offset}.bin"
+with open(success_slice_path, "wb") as f:
+    f.write(combo[success_offset:])
+
+# Build a proper .pyc using this code object
+pyc_filename = OUT_DIR / f"chimera_payload_{order_name}_off{success_offset}.pyc"
+header = build_header()   # 16-byte PEP 552 header (flags=0, mtime, size)
+with open(pyc_filename, "wb") as f:
+    f.write(header)
+    f.write(marshal.dumps(success_codeobj))
+
+# Save a small logfile describing the successful order and the offset
+log_path = OUT_DIR / f"success_{order_name}_off{success_offset}.txt"
+with open(log_path, "w") as L:
+    L.write(f"Permutation: {order_name}\n")
+    L.write(f"Unused chunks: {', '.join(result['unused']) or '-'}\n")
+    L.write(f"Offset used: {success_offset}\n")
+    L.write(f"Code layout: {result['layout']}\n")
+    L.write(f"Raw saved at: {attempt_raw_path}\n")
+    L.write(f"Successful slice saved at: {success_slice_path}\n")
+    L.write(f"Written .pyc: {pyc_filename}\n")
+    L.write(f"marshal.loads produced code object: {repr(success_codeobj)}\n")
+
+print("✅ SUCCESS")
+print(f"  Order: {order_name}" + (f" (unused: {', '.join(result['unused'])})" if result["unused"] else ""))
+print(f"  Offset: {success_offset}")
+print(f"  Raw combo saved to: {attempt_raw_path}")
+print(f"  Successful slice saved to: {success_slice_path}")
+print(f"  Wrote .pyc to: {pyc_filename}")
+print("\nDone. Summary written to:", OUT_DIR.resolve())
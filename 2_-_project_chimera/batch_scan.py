@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+batch_scan.py
+
+Run the marshal code-object locator over many dump files at once.
+
+deep_scan_marshal.py / auto_find_pyc.py handle one blob per run. Here every
+input (directory, glob or plain path) is split into shards -- whole files, or
+fixed-size offset ranges [start, end) for large ones -- and the shards are spread
+over a multiprocessing Pool. Each worker mmaps its file (no read into memory),
+runs marshal_scan.find_code_objects() restricted to its range, and returns the
+hits; objects may extend past the end of the range, only the start has to lie
+inside it.
+
+Results are streamed to stdout (or --out) as JSON lines as soon as they arrive:
+  {"type": "hit",  "file": ..., "offset": 0, "name": "<module>", "filename": ..., "firstlineno": 1}
+  {"type": "file", "file": ..., "size": 2828, "shards": 1, "hits": 2, "candidates": 3,
+   "cpu_seconds": 0.0004, "wall_seconds": 0.01}
+("cpu_seconds" is worker CPU time summed over the file's shards; "wall_seconds"
+runs from the start of its first shard to the end of its last one)
+  {"type": "error", "file": ..., "error": "..."}
+and a final {"type": "summary", ...} line.
+
+Usage:
+  python3 batch_scan.py . --pattern "*.pyc" --pattern "*.bin"
+  python3 batch_scan.py "dumps/**/*.bin" --workers 8 --shard-mb 4 --out scan.jsonl
+"""
+import argparse, glob, json, mmap, os, sys, time
+from multiprocessing import Pool, cpu_count
+
+from marshal_scan import candidate_offsets, find_code_objects
+
+DEFAULT_PATTERNS = ("*.pyc", "*.bin")
+
+def expand_inputs(inputs, patterns=DEFAULT_PATTERNS):
+    """Resolve directories (matched against patterns), globs and file paths into a sorted file list."""
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for pat in patterns:
+                files.update(glob.glob(os.path.join(item, "**", pat), recursive=True))
+        elif os.path.isfile(item):
+            files.add(item)
+        else:
+            files.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(files)
+
+def make_shards(files, shard_bytes):
+    """Return ([(path, start, end)], {path: (size, nshards)}); largest files first."""
+    shards, info = [], {}
+    for path in sorted(files, key=os.path.getsize, reverse=True):
+        size = os.path.getsize(path)
+        bounds = list(range(0, size, shard_bytes)) or [0]
+        info[path] = (size, len(bounds))
+        shards.extend((path, s, min(s + shard_bytes, size)) for s in bounds)
+    return shards, info
+
+def scan_shard(task):
+    path, start, end = task
+    began, t0 = time.time(), time.process_time()
+    try:
+        with open(path, "rb") as f:
+            if end == 0:
+                return {"file": path, "start": start, "end": end, "hits": [], "candidates": 0,
+                        "began": began, "cpu": time.process_time() - t0}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                ncand = sum(1 for _ in candidate_offsets(mm, start, end))
+                found = find_code_objects(mm, first_only=False, limit=end, start=start)
+                hits = [{"offset": off, "name": co.co_name, "filename": co.co_filename,
+                         "firstlineno": co.co_firstlineno} for off, co in found]
+    except (OSError, ValueError) as e:
+        return {"file": path, "start": start, "end": end, "error": str(e),
+                "began": began, "cpu": time.process_time() - t0}
+    return {"file": path, "start": start, "end": end, "hits": hits, "candidates": ncand,
+            "began": began, "cpu": time.process_time() - t0}
+
+def run(files, workers, shard_bytes, out):
+    shards, info = make_shards(files, shard_bytes)
+    pending = {p: n for p, (_, n) in info.items()}
+    # began: wall-clock start (time.time(), comparable across workers) of the file's first shard
+    totals = {p: {"hits": 0, "candidates": 0, "cpu": 0.0, "began": None} for p in info}
+    started = time.perf_counter()
+    nhits = nerrors = 0
+
+    def emit(rec):
+        out.write(json.dumps(rec) + "\n")
+        out.flush()
+
+    with Pool(processes=workers) as pool:
+        for res in pool.imap_unordered(scan_shard, shards):
+            path = res["file"]
+            t = totals[path]
+            t["cpu"] += res["cpu"]
+            t["began"] = res["began"] if t["began"] is None else min(t["began"], res["began"])
+            if "error" in res:
+                nerrors += 1
+                emit({"type": "error", "file": path, "start": res["start"], "end": res["end"],
+                      "error": res["error"]})
+            else:
+                t["hits"] += len(res["hits"])
+                t["candidates"] += res["candidates"]
+                for h in res["hits"]:
+                    emit({"type": "hit", "file": path, **h})
+            pending[path] -= 1
+            if pending[path] == 0:
+                size, n = info[path]
+                nhits += t["hits"]
+                emit({"type": "file", "file": path, "size": size, "shards": n, "hits": t["hits"],
+                      "candidates": t["candidates"], "cpu_seconds": round(t["cpu"], 6),
+                      "wall_seconds": round(time.time() - t["began"], 6)})
+    emit({"type": "summary", "files": len(info), "shards": len(shards), "hits": nhits,
+          "errors": nerrors, "workers": workers,
+          "bytes": sum(size for size, _ in info.values()),
+          "wall_seconds": round(time.perf_counter() - started, 6)})
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Scan many dump files for marshalled code objects in parallel")
+    p.add_argument("inputs", nargs="+", help="files, directories or glob patterns")
+    p.add_argument("--pattern", action="append", default=None,
+                   help=f"file pattern used inside directories (default: {' '.join(DEFAULT_PATTERNS)})")
+    p.add_argument("--workers", type=int, default=cpu_count())
+    p.add_argument("--shard-mb", type=float, default=4.0, help="split files larger than this into offset ranges")
+    p.add_argument("--out", help="write JSON lines here instead of stdout")
+    args = p.parse_args()
+
+    files = expand_inputs(args.inputs, tuple(args.pattern or DEFAULT_PATTERNS))
+    if not files:
+        sys.exit("no input files matched")
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        run(files, args.workers, max(1, int(args.shard_mb * (1 << 20))), out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
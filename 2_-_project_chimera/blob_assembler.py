@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+blob_assembler.py
+
+Find the concatenation order of marshal fragments without trying permutations.
+
+auto_find_pyc.py / testing33.py used to run marshal.loads() on every
+itertools.permutations() of the chunks times 33 start offsets, writing a .bin and
+a .log per attempt. Here the order is built one chunk at a time:
+
+  - marshal_scan.marshal_extent() walks the partial buffer structurally
+    (code header -> co_code length prefix -> consts tuple -> names ...);
+  - if it raises Truncated, the buffer so far is a valid prefix and we only
+    need to decide which remaining chunk comes next;
+  - if it raises ValueError, no ordering that starts with this prefix can work,
+    so the whole subtree is pruned;
+  - once it returns, the code object is complete and marshal.loads() confirms it.
+
+A wrong chunk is normally rejected within a few bytes of the join, so the search
+is close to linear in the number of chunks instead of factorial.
+
+Optionally every decision is appended to one JSON-lines journal file instead of
+one file per failed permutation.
+"""
+import json, marshal, types
+
+from marshal_scan import CODE_LAYOUTS, CODE_TAGS, Truncated, marshal_extent
+
+class Journal:
+    """Single append-only JSON-lines file recording assembly attempts (or nothing)."""
+
+    def __init__(self, path=None):
+        self.f = open(path, "a", encoding="utf-8") if path else None
+
+    def write(self, **rec):
+        if self.f is not None:
+            self.f.write(json.dumps(rec) + "\n")
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+def assemble(named_chunks, max_offset=32, layouts=tuple(CODE_LAYOUTS), journal=None):
+    """Return a dict describing the first chunk order that unmarshals to a code object, or None.
+
+    Result keys: order (names of chunks used), unused (names not needed), offset,
+    layout, combo (bytes of the used chunks), code (the code object).
+    """
+    journal = journal or Journal()
+    chunks = [(n, bytes(b)) for n, b in named_chunks if b]
+
+    def dfs(order, buf, offset, layout, remaining):
+        names = [n for n, _ in order]
+        try:
+            end = marshal_extent(buf, offset, layout)
+        except Truncated:
+            journal.write(order=names, offset=offset, layout=layout, result="truncated")
+            for k, chunk in enumerate(remaining):
+                hit = dfs(order + [chunk], buf + chunk[1], offset, layout,
+                          remaining[:k] + remaining[k + 1:])
+                if hit:
+                    return hit
+            return None
+        except ValueError as e:
+            journal.write(order=names, offset=offset, layout=layout, result=f"invalid: {e}")
+            return None
+        try:
+            obj = marshal.loads(memoryview(buf)[offset:end])
+        except Exception as e:
+            journal.write(order=names, offset=offset, layout=layout, result=f"loads failed: {e!r}")
+            return None
+        if not isinstance(obj, types.CodeType):
+            journal.write(order=names, offset=offset, layout=layout, result=f"not code: {type(obj).__name__}")
+            return None
+        journal.write(order=names, offset=offset, layout=layout, result="ok", end=end)
+        return {"order": names, "unused": [n for n, _ in remaining], "offset": offset,
+                "layout": layout, "combo": buf, "code": obj}
+
+    for k, first in enumerate(chunks):
+        rest = chunks[:k] + chunks[k + 1:]
+        data = first[1]
+        for offset in range(0, min(max_offset, len(data) - 1) + 1):
+            if data[offset:offset + 1] not in CODE_TAGS:
+                continue
+            for layout in layouts:
+                hit = dfs([first], data, offset, layout, rest)
+                if hit:
+                    return hit
+    return None
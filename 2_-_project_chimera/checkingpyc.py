@@ -1,5 +1,4 @@
-import marshal, dis
-with open("chimera_payload_fixed_off0.pyc", "rb") as f:
-    f.read(16)          # skip .pyc header
-    code = marshal.load(f)
-dis.dis(code)
\ No newline at end of file
+import dis
+from pyc_header import load_pyc
+hdr, code = load_pyc("chimera_payload_fixed_off0.pyc")   # header layout detected from magic/flags
+dis.dis(code)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+checkpoint.py
+
+Small resumable-state file for the offline key-search (largeFile.py).
+
+The search is split into deterministic wordlist byte ranges (wordlist_stream.byte_ranges),
+so progress is just the set of finished ranges. Checkpoint keeps them merged into
+a sorted list of [start, end) intervals plus the run options and per-worker attempt
+counters, and rewrites the JSON state file atomically (tmp file + os.replace) at most
+every `interval` seconds, so a crash mid-write never corrupts the previous state.
+
+State file layout:
+  {
+    "wordlist": "...", "size": 139921507,
+    "options": {"mode": "full", "domain_variants": false, "chunk_bytes": 4096},
+    "completed": [[0, 1048576], [2097152, 2101248]],
+    "attempts": {"ForkPoolWorker-1": 123456, ...},
+    "updated": 1760000000.0
+  }
+"""
+import bisect, json, os, time
+
+class Checkpoint:
+    def __init__(self, path, wordlist, options, interval=30.0):
+        self.path = path
+        self.wordlist = os.path.abspath(wordlist)
+        self.size = os.path.getsize(wordlist)
+        self.options = dict(options)
+        self.interval = interval
+        self.completed = []          # sorted, non-overlapping [start, end] pairs
+        self.attempts = {}           # worker name -> attempts
+        self._last_save = time.time()
+
+    @classmethod
+    def load(cls, path, wordlist, options, interval=30.0):
+        """Load an existing state file; raises ValueError if it belongs to a different run."""
+        cp = cls(path, wordlist, options, interval)
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("wordlist") != cp.wordlist or state.get("size") != cp.size:
+            raise ValueError(f"checkpoint {path} was written for {state.get('wordlist')!r} "
+                             f"({state.get('size')} bytes), not {cp.wordlist!r} ({cp.size} bytes)")
+        if state.get("options") != cp.options:
+            raise ValueError(f"checkpoint {path} options {state.get('options')} differ from {cp.options}")
+        cp.completed = [list(r) for r in state.get("completed", [])]
+        cp.attempts = {k: int(v) for k, v in state.get("attempts", {}).items()}
+        return cp
+
+    def is_done(self, start, end):
+        """True if [start, end) is fully covered by finished ranges."""
+        i = bisect.bisect_right(self.completed, [start, float("inf")]) - 1
+        return i >= 0 and self.completed[i][0] <= start and end <= self.completed[i][1]
+
+    def mark_done(self, start, end, worker=None, attempts=0):
+        i = bisect.bisect_left(self.completed, [start, end])
+        self.completed.insert(i, [start, end])
+        # merge with neighbours that touch or overlap
+        lo = max(i - 1, 0)
+        merged = []
+        for s, e in self.completed[lo:i + 2]:
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        self.completed[lo:i + 2] = merged
+        if worker is not None:
+            self.attempts[worker] = self.attempts.get(worker, 0) + attempts
+
+    def bytes_done(self):
+        return sum(e - s for s, e in self.completed)
+
+    def total_attempts(self):
+        return sum(self.attempts.values())
+
+    def maybe_save(self):
+        if time.time() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        state = {
+            "wordlist": self.wordlist,
+            "size": self.size,
+            "options": self.options,
+            "completed": self.completed,
+            "attempts": self.attempts,
+            "updated": time.time(),
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._last_save = time.time()
@@ -8,7 +8,7 @@
 #
 # IMPORTANT: run locally (I will not execute this for you).
 
-import zlib, marshal, sys, getpass, binascii
+import zlib, marshal, os, sys, getpass, binascii
 from hashlib import sha256, md5
 import base64
 
@@ -22,29 +22,14 @@ ENC_HEX = "7232622d0d9ef21f70183582cffc9014f14fad235df3e2c04cd0c1650ceaecae1162a
 ENC = binascii.unhexlify(ENC_HEX)
 ENCRYPTED_CHIMERA_FORMULA = ENC
 
-# ---------- RC4 (ARC4) implementation ----------
-def rc4(key: bytes, data: bytes, drop=0) -> bytes:
-    S = list(range(256))
-    j = 0
-    key = key if isinstance(key, (bytes, bytearray)) else key.encode('utf-8')
-    for i in range(256):
-        j = (j + S[i] + key[i % len(key)]) & 0xff
-        S[i], S[j] = S[j], S[i]
-    i = j = 0
-    # drop keystream bytes if requested
-    for _ in range(drop):
-        i = (i + 1) & 0xff
-        j = (j + S[i]) & 0xff
-        S[i], S[j] = S[j], S[i]
-        _ = S[(S[i] + S[j]) & 0xff]
-    out = bytearray()
-    for ch in data:
-        i = (i + 1) & 0xff
-        j = (j + S[i]) & 0xff
-        S[i], S[j] = S[j], S[i]
-        K = S[(S[i] + S[j]) & 0xff]
-        out.append(ch ^ K)
-    return bytes(out)
+# ---------- RC4 (ARC4) (shared implementation, see rc4_batch.py) ----------
+from rc4_batch import rc4
+from signature_solver import solved_inputs
+
+# payload whose signature check is solved first (see signature_solver.py); its
+# solved logins are tried before the guessed username list
+PAYLOAD = "decompressed.bin"
+PAYLOAD_VERSION = "3.12"
 
 # ---------- Key derivation candidates ----------
 def xor_derive(sig: bytes, usr: bytes) -> bytes:
@@ -73,6 +58,7 @@ def b64_derive(sig: bytes, usr: bytes) -> bytes:
 
 # pack strategies in list (name, fn)
 strategies = [
+    ("usr-as-key", lambda s,u: u),   # activate_catalyst: ARC4(current_user)
     ("sig-as-key", lambda s,u: s),
     ("xor(sig,usr)", xor_derive),
     ("sig+usr", concat),
@@ -180,7 +166,11 @@ def try_all(user_hint=None):
 
 def main():
     results = []
-    for candidate in candidate_usernames:
+    solved = []
+    if os.path.exists(PAYLOAD):
+        solved = [s.decode('latin1') for s in solved_inputs(PAYLOAD, PAYLOAD_VERSION)]
+        print(f"Solved logins from {PAYLOAD}: {solved}")
+    for candidate in solved + candidate_usernames:
         if candidate is None:
             # try OS login
             try:
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+const_archive.py
+
+Streaming constant walker and a packed on-disk archive for pyc constants.
+
+walk_code_consts() in dump_pyc_consts*.py recursed through nested code objects
+into one big list, and every constant then became its own .bin/.hex/.txt file.
+iter_code_consts() yields the same constants in the same order (pre-order, a
+code object's consts before those of the code objects after it) from an explicit
+stack, so depth is not bound by the recursion limit and nothing is collected.
+
+ArchiveWriter packs all constants into two files in one directory:
+  consts.blob   every payload back to back
+  consts.idx    16-byte header b"PYCONST\\x01" + nentries u64, then per constant
+                offset u64 | length u32 | kind u8 | pad[3]
+kind is 0 = bytes (raw), 1 = str (utf-8, surrogatepass), 2 = other (repr(), utf-8).
+Both files are written through ordinary buffered I/O and fsynced once on close.
+
+Usage:
+  for i, c in enumerate(iter_code_consts(code)): ...
+  with ArchiveWriter("out") as w: w.add(c)
+  with ArchiveReader("out") as r: data, kind = r[3]
+  python3 const_archive.py out            # list the archive
+"""
+import mmap, os, struct, types
+
+from marshal_reader import Code
+
+IDX_MAGIC = b"PYCONST\x01"
+IDX_HEADER = struct.Struct("<8sQ")
+IDX_ENTRY = struct.Struct("<QIB3x")
+KIND_BYTES, KIND_STR, KIND_REPR = 0, 1, 2
+KIND_NAMES = ("bytes", "str", "repr")
+
+def _consts(co):
+    # native code objects and marshal_reader.Code records
+    return co.co_consts if isinstance(co, types.CodeType) else co.consts
+
+def iter_code_consts(co):
+    """Yield every non-code constant of co and its nested code objects, depth first.
+
+    co may be a native code object or a marshal_reader.Code (any 3.8 - 3.13 dump).
+    """
+    stack = [iter(_consts(co))]
+    while stack:
+        for c in stack[-1]:
+            if isinstance(c, (types.CodeType, Code)):
+                stack.append(iter(_consts(c)))
+                break
+            yield c
+        else:
+            stack.pop()
+
+def encode_const(c):
+    """Return (kind, payload bytes) for one constant."""
+    if isinstance(c, (bytes, bytearray, memoryview)):
+        return KIND_BYTES, bytes(c)
+    if isinstance(c, str):
+        return KIND_STR, c.encode("utf-8", "surrogatepass")
+    return KIND_REPR, repr(c).encode("utf-8", "backslashreplace")
+
+class ArchiveWriter:
+    def __init__(self, outdir):
+        os.makedirs(outdir, exist_ok=True)
+        self.outdir = outdir
+        self._blob = open(os.path.join(outdir, "consts.blob"), "wb")
+        self._idx = open(os.path.join(outdir, "consts.idx"), "wb")
+        self._idx.write(IDX_HEADER.pack(IDX_MAGIC, 0))
+        self.count = 0
+        self.offset = 0
+
+    def add(self, c):
+        """Append one constant; returns its index."""
+        kind, payload = encode_const(c)
+        self._blob.write(payload)
+        self._idx.write(IDX_ENTRY.pack(self.offset, len(payload), kind))
+        self.offset += len(payload)
+        self.count += 1
+        return self.count - 1
+
+    def close(self):
+        if self._blob is None:
+            return
+        self._idx.seek(0)
+        self._idx.write(IDX_HEADER.pack(IDX_MAGIC, self.count))
+        for f in (self._blob, self._idx):
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+        self._blob = self._idx = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ArchiveReader:
+    """Random access to an archive written by ArchiveWriter; payloads are read via mmap."""
+
+    def __init__(self, outdir):
+        with open(os.path.join(outdir, "consts.idx"), "rb") as f:
+            raw = f.read()
+        magic, n = IDX_HEADER.unpack_from(raw)
+        if magic != IDX_MAGIC:
+            raise ValueError(f"{outdir}: not a constant archive (magic {magic!r})")
+        self.entries = list(IDX_ENTRY.iter_unpack(raw[IDX_HEADER.size:IDX_HEADER.size + n * IDX_ENTRY.size]))
+        self._f = open(os.path.join(outdir, "consts.blob"), "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        """Return (payload bytes, kind name) of constant i."""
+        off, ln, kind = self.entries[i]
+        return self._mm[off:off + ln], KIND_NAMES[kind]
+
+    def __iter__(self):
+        for i in range(len(self.entries)):
+            yield self[i]
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="List the constants in a packed constant archive")
+    p.add_argument("archive", help="directory containing consts.idx / consts.blob")
+    p.add_argument("--show", type=int, default=60, help="characters of each payload to preview")
+    args = p.parse_args()
+    with ArchiveReader(args.archive) as r:
+        print("index,kind,length,preview")
+        for i, (data, kind) in enumerate(r):
+            print(f"{i},{kind},{len(data)},{data[:args.show]!r}")
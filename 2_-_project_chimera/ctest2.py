@@ -6,6 +6,7 @@ import sys
 import struct
 import time
 import types # Added 'types' for the execution part, as the code object might be a function
+from pyc_header import build_header
 
 # --- Original Blobs ---
 # ------------------------------
@@ -56,15 +57,10 @@ try:
 
     # 4. Optional: Write the .pyc file (as you intended)
     pyc_filename = "chimera_payload_fixed.pyc"
-    magic = importlib.util.MAGIC_NUMBER
-    timestamp = struct.pack("I", int(time.time()))
-    # Padding is for hash-based pyc (Python 3.3+), used as filler here
-    padding = b'\x00\x00\x00\x00'  
+    header = build_header()   # 16-byte PEP 552 header (flags=0, mtime, size)
 
     with open(pyc_filename, "wb") as f:
-        f.write(magic)
-        f.write(timestamp)
-        f.write(padding)
+        f.write(header)
         f.write(marshal.dumps(code_object))
 
     print(f"✅ Successfully wrote the extracted code object to {pyc_filename}")
@@ -0,0 +1,1000 @@
+#!/usr/bin/env python3
+"""
+decompile.py
+
+Version-aware disassembler, control-flow graph and pseudo-source emitter for
+CPython 3.8 - 3.13 code objects (native or marshal_reader.Code).
+
+decompiled_chimera_pretty.py was produced by a heuristic pass that read every
+code unit as an opcode, so 3.11+/3.12 inline CACHE entries showed up as
+instructions and operands like "STORE_NAME 25600" were garbage. Here:
+
+  - instructions() walks the bytecode with the opcode table of the code's own
+    version (opcode_tables.py), accumulates EXTENDED_ARG, skips the per-opcode number
+    of inline CACHE units and resolves operands the way that version encodes them
+    (LOAD_GLOBAL / LOAD_ATTR low bits, COMPARE_OP shifts, localsplus indices,
+    relative jumps in bytes or code units, forward/backward);
+  - line numbers come from lnotab (3.8/3.9), the 3.10 line table or the 3.11+
+    location table; exception_table() decodes the 3.11+ exception table;
+  - build_cfg() splits basic blocks at jump targets, terminators and exception
+    handler entries and records fallthrough / jump / exception edges;
+  - pseudo_source() runs a symbolic stack over each block and prints statements
+    (assignments, calls, returns, imports, conditional gotos), and nests the
+    bodies of functions and classes under their def/class line. 3.11+ await /
+    yield from loops (SEND ... JUMP_BACKWARD_NO_INTERRUPT) collapse into one
+    expression; lambdas and comprehensions used inside a statement get their
+    bodies printed, commented, right after it.
+
+The result is not re-compilable Python, but it is structured and every
+statement maps back to a block label and line.
+
+Rendered text is cached on disk by a hash of the code object (bytecode,
+constants, names, tables, recursively) plus the output mode, so re-running over
+an unchanged corpus only hashes.
+
+Usage:
+  python3 decompile.py chimera_payload_fixed_off0.pyc            # pseudo-source
+  python3 decompile.py chimera_payload3.pyc --version 3.12 --asm --cfg   # bare dump: listing + CFG
+  python3 decompile.py dumps/*.pyc --cache decompile_cache -o out_dir
+  python3 decompile.py --selftest                      # regression check on the payloads here
+"""
+import argparse, glob, hashlib, os, sys, types
+from collections import namedtuple
+
+from marshal_reader import Code, MissingVersion, from_native, load_code
+from opcode_tables import get_table
+
+ENGINE_VERSION = 2
+
+Instr = namedtuple("Instr", "offset opname arg argval argrepr line target")
+Block = namedtuple("Block", "start end instrs succ")        # succ: [(kind, target_offset)]
+ExcEntry = namedtuple("ExcEntry", "start end target depth lasti")
+
+# BINARY_OP operand (3.11+), Include/opcode.h NB_*
+NB_OPS = ("+", "&", "//", "<<", "@", "*", "%", "|", "**", ">>", "-", "/", "^",
+          "+=", "&=", "//=", "<<=", "@=", "*=", "%=", "|=", "**=", ">>=", "-=", "/=", "^=")
+# pre-3.11 BINARY_* / INPLACE_* opcodes
+OLD_BINARY = {
+    "POWER": "**", "MULTIPLY": "*", "MATRIX_MULTIPLY": "@", "FLOOR_DIVIDE": "//", "TRUE_DIVIDE": "/",
+    "MODULO": "%", "ADD": "+", "SUBTRACT": "-", "LSHIFT": "<<", "RSHIFT": ">>", "AND": "&", "XOR": "^", "OR": "|",
+}
+UNARY = {"UNARY_NEGATIVE": "-", "UNARY_POSITIVE": "+", "UNARY_NOT": "not ", "UNARY_INVERT": "~"}
+
+UNCONDITIONAL = {"JUMP_FORWARD", "JUMP_ABSOLUTE", "JUMP_BACKWARD", "JUMP_BACKWARD_NO_INTERRUPT",
+                 "JUMP", "JUMP_NO_INTERRUPT"}
+TERMINATORS = {"RETURN_VALUE", "RETURN_CONST", "RAISE_VARARGS", "RERAISE"}
+# pre-3.11 block setup opcodes: the jump target is an exception/cleanup handler, not a branch
+SETUP_OPS = {"SETUP_FINALLY", "SETUP_WITH", "SETUP_ASYNC_WITH", "SETUP_CLEANUP", "CALL_FINALLY"}
+SILENT = {"NOP", "RESUME", "CACHE", "PRECALL", "COPY_FREE_VARS", "MAKE_CELL", "EXTENDED_ARG",
+          "RETURN_GENERATOR", "SETUP_ANNOTATIONS", "TO_BOOL", "GET_YIELD_FROM_ITER", "POP_BLOCK",
+          "INTERPRETER_EXIT", "END_FOR", "BEGIN_FINALLY", "NOT_TAKEN"}
+
+CO_VARARGS, CO_VARKEYWORDS = 0x04, 0x08
+CO_GENERATOR, CO_COROUTINE, CO_ASYNC_GENERATOR = 0x20, 0x80, 0x200
+
+def _vtuple(version):
+    return tuple(int(x) for x in version.split("."))
+
+def as_code(co):
+    """Return a marshal_reader.Code for a native code object or Code."""
+    return co if isinstance(co, Code) else from_native(co)
+
+# --- line tables ---------------------------------------------------------------
+
+def _varint(it):
+    b = next(it)
+    val, shift = b & 63, 6
+    while b & 64:
+        b = next(it)
+        val |= (b & 63) << shift
+        shift += 6
+    return val
+
+def _svarint(it):
+    v = _varint(it)
+    return -(v >> 1) if v & 1 else v >> 1
+
+def line_starts(co):
+    """Return {offset: line} for offsets where a new source line starts (like dis.findlinestarts)."""
+    table = bytes(co.linetable or b"")
+    v = _vtuple(co.version)
+    starts = {}
+    last = None
+
+    # 3.13's findlinestarts() reports a line again after a range without one
+    reset_on_none = v >= (3, 13)
+
+    def mark(addr, line):
+        nonlocal last
+        if line is None:
+            if reset_on_none:
+                last = None
+        elif line != last:
+            starts.setdefault(addr, line)
+            last = line
+
+    if v < (3, 10):
+        line, addr = co.firstlineno, 0
+        for i in range(0, len(table) - 1, 2):
+            byte_incr, line_incr = table[i], table[i + 1]
+            if byte_incr:
+                mark(addr, line)
+                addr += byte_incr
+            line += line_incr - 256 if line_incr >= 0x80 else line_incr
+        mark(addr, line)
+    elif v < (3, 11):
+        line, end = co.firstlineno, 0
+        for i in range(0, len(table) - 1, 2):
+            sdelta, ldelta = table[i], table[i + 1]
+            ldelta = ldelta - 256 if ldelta >= 0x80 else ldelta
+            start, end = end, end + sdelta
+            if ldelta == -128:
+                continue
+            line += ldelta
+            if end > start:
+                mark(start, line)
+    else:
+        it = iter(table)
+        line, addr = co.firstlineno, 0
+        for first in it:
+            kind, length = (first >> 3) & 15, (first & 7) + 1
+            if kind == 15:
+                cur = None
+            elif kind == 14:
+                line += _svarint(it)
+                _varint(it); _varint(it); _varint(it)
+                cur = line
+            elif kind == 13:
+                line += _svarint(it)
+                cur = line
+            elif kind >= 10:
+                line += kind - 10
+                next(it); next(it)
+                cur = line
+            else:
+                next(it)
+                cur = line
+            mark(addr, cur)
+            addr += length * 2
+    return starts
+
+def exception_table(co):
+    """Decode the 3.11+ exception table into ExcEntry(start, end, target, depth, lasti) byte offsets."""
+    out = []
+    table = bytes(co.exceptiontable or b"")
+    it = iter(table)
+
+    def be_varint():
+        b = next(it)
+        val = b & 63
+        while b & 64:
+            b = next(it)
+            val = (val << 6) | (b & 63)
+        return val
+
+    try:
+        while True:
+            start = be_varint() * 2
+            length = be_varint() * 2
+            target = be_varint() * 2
+            dl = be_varint()
+            out.append(ExcEntry(start, start + length, target, dl >> 1, bool(dl & 1)))
+    except StopIteration:
+        pass
+    return out
+
+# --- instructions --------------------------------------------------------------
+
+def _item(seq, idx, what):
+    # obfuscated or truncated payloads carry opargs past the end of their tables;
+    # show them instead of failing the whole code object like dis does
+    if 0 <= idx < len(seq):
+        return seq[idx]
+    return f"<{what}[{idx}]?>"
+
+def instructions(co):
+    """Decode co's bytecode into a list of Instr (CACHE units skipped, EXTENDED_ARG kept like dis)."""
+    co = as_code(co)
+    v = _vtuple(co.version)
+    tbl = get_table(f"{v[0]}.{v[1]}")
+    code = bytes(co.code)
+    lines = line_starts(co)
+    lp = co.localsplusnames if v >= (3, 11) else None
+    cells = tuple(co.cellvars) + tuple(co.freevars)
+    unit = 1 if v < (3, 10) else 2             # jump operands: bytes before 3.10, code units after
+    out = []
+    ext = 0
+    i = 0
+    line = None
+    while i < len(code) - 1:
+        op, raw = code[i], code[i + 1]
+        name = tbl.opnames.get(op, f"<{op}>")
+        arg = raw | ext
+        ext = (arg << 8) if op == tbl.extended_arg else 0
+        ncache = tbl.caches.get(name, 0)
+        nxt = i + 2 + 2 * ncache
+        line = lines.get(i, line)
+        argval, argrepr, target = arg, "", None
+        if name not in tbl.hasarg:
+            argval = None
+        elif name in tbl.const:
+            argval = _item(co.consts, arg, "consts")
+            argrepr = _const_repr(argval)
+        elif name in tbl.name:
+            idx = arg
+            if name == "LOAD_GLOBAL" and v >= (3, 11):
+                idx = arg >> 1
+                argrepr = "NULL + " if arg & 1 else ""
+            elif name == "LOAD_ATTR" and v >= (3, 12):
+                idx = arg >> 1
+                argrepr = "NULL|self + " if arg & 1 else ""
+            elif name == "LOAD_SUPER_ATTR":
+                idx = arg >> 2
+            argval = _item(co.names, idx, "names")
+            argrepr += argval
+        elif name in tbl.local:
+            names = lp if lp is not None else co.varnames
+            if name in ("LOAD_FAST_LOAD_FAST", "STORE_FAST_STORE_FAST", "STORE_FAST_LOAD_FAST"):
+                argval = (_item(names, arg >> 4, "locals"), _item(names, arg & 15, "locals"))
+                argrepr = ", ".join(argval)
+            else:
+                argval = _item(names, arg, "locals")
+                argrepr = argval
+        elif name in tbl.free:
+            argval = _item(lp if lp is not None else cells, arg, "cells")
+            argrepr = argval
+        elif name in tbl.compare:
+            shift = 5 if v >= (3, 13) else 4 if v >= (3, 12) else 0
+            argval = _item(tbl.cmp_op, arg >> shift, "cmp_op")
+            argrepr = argval
+        elif name in tbl.jrel:
+            after = nxt if v >= (3, 11) else i + 2
+            delta = arg * unit
+            target = after - delta if "BACKWARD" in name else after + delta
+            argval, argrepr = target, f"to {target}"
+        elif name in tbl.jabs:
+            target = arg * unit
+            argval, argrepr = target, f"to {target}"
+        elif name == "BINARY_OP":
+            argval = argrepr = NB_OPS[arg] if arg < len(NB_OPS) else str(arg)
+        elif name in ("IS_OP", "CONTAINS_OP"):
+            argval = argrepr = ("is", "is not")[arg] if name == "IS_OP" else ("in", "not in")[arg]
+        else:
+            argrepr = str(arg)
+        out.append(Instr(i, name, arg if name in tbl.hasarg else None, argval, argrepr,
+                         lines.get(i), target))
+        i = nxt
+    return out
+
+def _const_repr(c):
+    if isinstance(c, Code):
+        return f"<code {c.qualname}>"
+    if isinstance(c, types.CodeType):
+        return f"<code {c.co_name}>"
+    if isinstance(c, memoryview):
+        c = bytes(c)
+    r = repr(c)
+    return r if len(r) <= 80 else r[:77] + "..."
+
+# --- control flow --------------------------------------------------------------
+
+def build_cfg(co, instrs=None):
+    """Split co into basic blocks; returns {start_offset: Block} in offset order."""
+    co = as_code(co)
+    instrs = instrs if instrs is not None else instructions(co)
+    if not instrs:
+        return {}
+    exc = exception_table(co) if co.exceptiontable is not None else []
+    offsets = [ins.offset for ins in instrs]
+    leaders = {offsets[0]}
+    for k, ins in enumerate(instrs):
+        if ins.target is not None:
+            leaders.add(ins.target)
+            if k + 1 < len(instrs):
+                leaders.add(offsets[k + 1])
+        elif ins.opname in TERMINATORS and k + 1 < len(instrs):
+            leaders.add(offsets[k + 1])
+    leaders.update(e.target for e in exc)
+    leaders = sorted(l for l in leaders if l in set(offsets))
+    blocks = {}
+    pos = 0
+    for n, start in enumerate(leaders):
+        end = leaders[n + 1] if n + 1 < len(leaders) else None
+        body = []
+        while pos < len(instrs) and (end is None or instrs[pos].offset < end):
+            body.append(instrs[pos])
+            pos += 1
+        last = body[-1]
+        succ = []
+        if last.target is not None:
+            kind = "exception" if last.opname in SETUP_OPS else \
+                   "jump" if last.opname in UNCONDITIONAL else "branch"
+            succ.append((kind, last.target))
+        if last.opname not in UNCONDITIONAL and last.opname not in TERMINATORS and end is not None:
+            succ.append(("fallthrough", end))
+        for e in exc:
+            if any(e.start <= i.offset < e.end for i in body) and ("exception", e.target) not in succ:
+                succ.append(("exception", e.target))
+        blocks[start] = Block(start, end, body, succ)
+    return blocks
+
+# --- pseudo-source -------------------------------------------------------------
+
+class _Null:
+    def __repr__(self):
+        return "NULL"
+
+NULL = _Null()
+SELF = _Null()
+
+class Expr(str):
+    """Rendered expression; subclasses carry what later statements need to know."""
+
+class Func(Expr):
+    def __new__(cls, text, code, defaults=None):
+        self = super().__new__(cls, text)
+        self.code, self.defaults = code, defaults
+        return self
+
+class ClassExpr(Expr):
+    def __new__(cls, text, func, bases):
+        self = super().__new__(cls, text)
+        self.func, self.bases = func, bases
+        return self
+
+class InPlace(Expr):
+    def __new__(cls, text, left, op, right):
+        self = super().__new__(cls, text)
+        self.left, self.op, self.right = left, op, right
+        return self
+
+class Import(Expr):
+    def __new__(cls, text, module, fromlist):
+        self = super().__new__(cls, text)
+        self.module, self.fromlist = module, fromlist
+        return self
+
+class _BlockRenderer:
+    def __init__(self, co, indent, emit_nested):
+        self.co = co
+        self.v = _vtuple(co.version)
+        self.stack = []
+        self.lines = []
+        self.indent = indent
+        self.emit_nested = emit_nested
+        self.kwnames = None
+        self.inline = []        # lambdas / comprehensions used inside the current statement
+
+    def pop(self):
+        return self.stack.pop() if self.stack else Expr("$stack")
+
+    def popn(self, n):
+        items = [self.pop() for _ in range(n)]
+        return items[::-1]
+
+    def push(self, e):
+        self.stack.append(e)
+
+    def out(self, text):
+        self.lines.append(self.indent + text)
+        # their bodies are shown (commented) right after the statement that uses them
+        inline, self.inline = self.inline, []
+        for f in inline:
+            self.lines.extend(self.emit_nested(f.code, self.indent + "# ", f.defaults, None))
+
+    def call(self, func, args, kwnames=None):
+        used = [func, *args]
+        kw = []
+        if kwnames:
+            kws = args[len(args) - len(kwnames):]
+            args = args[:len(args) - len(kwnames)]
+            kw = [f"{k}={a}" for k, a in zip(kwnames, kws)]
+        if func == "__build_class__" and args and isinstance(args[0], Func):
+            return ClassExpr(f"class {args[1].strip(chr(39))}", args[0], args[2:])
+        self.nested_after(*used)
+        return Expr(f"{func}({', '.join(list(args) + kw)})")
+
+    def store(self, target, value):
+        if isinstance(value, Func) and value.code.name not in ("<lambda>", "<genexpr>", "<listcomp>",
+                                                                 "<dictcomp>", "<setcomp>"):
+            self.lines.extend(self.emit_nested(value.code, self.indent, value.defaults, target))
+        elif isinstance(value, ClassExpr):
+            bases = f"({', '.join(value.bases)})" if value.bases else ""
+            self.out(f"class {target}{bases}:")
+            self.lines.extend(self.emit_nested(value.func.code, self.indent + "    ", None, None, body_only=True))
+        elif isinstance(value, InPlace) and value.left == target:
+            self.out(f"{target} {value.op} {value.right}")
+        elif isinstance(value, Import):
+            mod = value.module
+            if value.fromlist in ("None", "()"):
+                head = mod.split(".")[0]
+                self.out(f"import {mod}" if target == head else f"import {mod} as {target}")
+            else:
+                self.out(f"from {mod} import {value.fromlist}")
+        elif isinstance(value, Expr) and value.startswith("from ") and " import " in value:
+            name = value.rsplit(" import ", 1)[1]
+            self.out(value if name == target else f"{value} as {target}")
+        else:
+            self.nested_after(value)
+            self.out(f"{target} = {value}")
+
+    def nested_after(self, *values):
+        # lambdas / comprehensions used as expressions, also as call arguments or callees:
+        # out() shows their bodies after the statement
+        self.inline.extend(v for v in values if isinstance(v, Func) 
+                           and not any(v is w for w in self.inline))
+
+    def run(self, ins, labels, send_loop=False):
+        n, a, av = ins.opname, ins.arg, ins.argval
+        v = self.v
+        if n in SILENT:
+            return
+        if n == "LOAD_CONST":
+            self.push(Func(f"<code {av.qualname}>", av) if isinstance(av, Code) else Expr(_const_repr(av)))
+        elif n == "RETURN_CONST":
+            self.out(f"return {_const_repr(av)}")
+        elif n in ("LOAD_NAME", "LOAD_FAST", "LOAD_DEREF", "LOAD_CLASSDEREF", "LOAD_CLOSURE",
+                   "LOAD_FAST_CHECK", "LOAD_FAST_AND_CLEAR", "LOAD_FROM_DICT_OR_DEREF",
+                   "LOAD_FROM_DICT_OR_GLOBALS", "LOAD_LOCALS"):
+            if n in ("LOAD_FROM_DICT_OR_DEREF", "LOAD_FROM_DICT_OR_GLOBALS"):
+                self.pop()
+            self.push(Expr(av if n != "LOAD_LOCALS" else "locals()"))
+        elif n == "LOAD_FAST_LOAD_FAST":
+            self.push(Expr(av[0])); self.push(Expr(av[1]))
+        elif n == "LOAD_GLOBAL":
+            if v >= (3, 11) and a & 1:
+                if v >= (3, 13):
+                    self.push(Expr(av)); self.push(NULL)
+                else:
+                    self.push(NULL); self.push(Expr(av))
+            else:
+                self.push(Expr(av))
+        elif n == "PUSH_NULL":
+            self.push(NULL)
+        elif n == "LOAD_BUILD_CLASS":
+            self.push(Expr("__build_class__"))
+        elif n == "LOAD_ASSERTION_ERROR":
+            self.push(Expr("AssertionError"))
+        elif n == "LOAD_METHOD" or (n == "LOAD_ATTR" and v >= (3, 12) and a & 1):
+            obj = self.pop()
+            self.push(Expr(f"{obj}.{av}")); self.push(SELF)
+        elif n == "LOAD_ATTR":
+            self.push(Expr(f"{self.pop()}.{av}"))
+        elif n == "LOAD_SUPER_ATTR":
+            self.popn(3)
+            self.push(Expr(f"super().{av}"))
+            if a & 1:
+                self.push(SELF)
+        elif n in ("STORE_NAME", "STORE_FAST", "STORE_GLOBAL", "STORE_DEREF"):
+            self.store(av, self.pop())
+        elif n == "STORE_FAST_STORE_FAST":
+            self.store(av[0], self.pop()); self.store(av[1], self.pop())
+        elif n == "STORE_FAST_LOAD_FAST":
+            self.store(av[0], self.pop()); self.push(Expr(av[1]))
+        elif n == "STORE_ATTR":
+            obj, val = self.pop(), self.pop()
+            self.out(f"{obj}.{av} = {val}")
+        elif n == "STORE_SUBSCR":
+            key, cont, val = self.pop(), self.pop(), self.pop()
+            self.out(f"{cont}[{key}] = {val}")
+        elif n == "STORE_SLICE":
+            end, start, cont, val = self.pop(), self.pop(), self.pop(), self.pop()
+            self.out(f"{cont}[{start}:{end}] = {val}")
+        elif n in ("DELETE_NAME", "DELETE_FAST", "DELETE_GLOBAL", "DELETE_DEREF"):
+            self.out(f"del {av}")
+        elif n == "DELETE_ATTR":
+            self.out(f"del {self.pop()}.{av}")
+        elif n == "DELETE_SUBSCR":
+            key, cont = self.pop(), self.pop()
+            self.out(f"del {cont}[{key}]")
+        elif n == "BINARY_OP" or (n.startswith(("BINARY_", "INPLACE_")) and n.split("_", 1)[1] in OLD_BINARY):
+            r, l = self.pop(), self.pop()
+            op = av if n == "BINARY_OP" else OLD_BINARY[n.split("_", 1)[1]] + ("=" if n.startswith("INPLACE_") else "")
+            if op.endswith("=") and op != "==":
+                self.push(InPlace(f"({l} {op[:-1]} {r})", l, op, r))
+            else:
+                self.push(Expr(f"({l} {op} {r})"))
+        elif n == "BINARY_SUBSCR":
+            key, cont = self.pop(), self.pop()
+            self.push(Expr(f"{cont}[{key}]"))
+        elif n == "BINARY_SLICE":
+            end, start, cont = self.pop(), self.pop(), self.pop()
+            self.push(Expr(f"{cont}[{start}:{end}]"))
+        elif n == "BUILD_SLICE":
+            parts = self.popn(a)
+            self.push(Expr(":".join("" if p == "None" else p for p in parts)))
+        elif n in UNARY:
+            self.push(Expr(f"{UNARY[n]}{self.pop()}"))
+        elif n in ("COMPARE_OP", "IS_OP", "CONTAINS_OP"):
+            r, l = self.pop(), self.pop()
+            self.push(Expr(f"({l} {av} {r})"))
+        elif n in ("BUILD_TUPLE", "BUILD_LIST", "BUILD_SET"):
+            items = self.popn(a)
+            if n == "BUILD_TUPLE":
+                self.push(Expr(f"({items[0]},)" if len(items) == 1 else f"({', '.join(items)})"))
+            elif n == "BUILD_LIST":
+                self.push(Expr(f"[{', '.join(items)}]"))
+            else:
+                self.push(Expr(f"{{{', '.join(items)}}}" if items else "set()"))
+        elif n == "BUILD_MAP":
+            items = self.popn(2 * a)
+            self.push(Expr("{" + ", ".join(f"{k}: {x}" for k, x in zip(items[::2], items[1::2])) + "}"))
+        elif n == "BUILD_CONST_KEY_MAP":
+            keys = self.pop()
+            vals = self.popn(a)
+            ks = [k.strip() for k in keys.strip("()").split(",") if k.strip()]
+            self.push(Expr("{" + ", ".join(f"{k}: {x}" for k, x in zip(ks, vals)) + "}"))
+        elif n == "BUILD_STRING":
+            self.push(Expr("f'" + "".join(p[2:-1] if p.startswith("f'") else
+                                          (p[1:-1] if p[:1] in "'\"" else p) for p in self.popn(a)) + "'"))
+        elif n == "FORMAT_VALUE":
+            spec = self.pop() if a & 4 else None
+            val = self.pop()
+            conv = {1: "!s", 2: "!r", 3: "!a"}.get(a & 3, "")
+            self.push(Expr(f"f'{{{val}{conv}{':' + spec.strip(chr(39)) if spec else ''}}}'"))
+        elif n in ("FORMAT_SIMPLE", "FORMAT_WITH_SPEC"):
+            spec = self.pop() if n == "FORMAT_WITH_SPEC" else None
+            self.push(Expr(f"f'{{{self.pop()}{':' + spec.strip(chr(39)) if spec else ''}}}'"))
+        elif n == "CONVERT_VALUE":
+            self.push(Expr(f"{self.pop()}!{'?sra'[a]}"))
+        elif n in ("LIST_EXTEND", "SET_UPDATE", "DICT_UPDATE", "DICT_MERGE"):
+            val = self.pop()
+            if len(self.stack) >= a:
+                tgt = self.stack[-a]
+                self.stack[-a] = Expr(f"[*{tgt}, *{val}]" if n == "LIST_EXTEND" else
+                                      f"{{*{tgt}, *{val}}}" if n == "SET_UPDATE" else f"{{**{tgt}, **{val}}}")
+        elif n in ("LIST_APPEND", "SET_ADD"):
+            self.out(f"$comprehension.{'append' if n == 'LIST_APPEND' else 'add'}({self.pop()})")
+        elif n == "MAP_ADD":
+            val, key = self.pop(), self.pop()
+            self.out(f"$comprehension[{key}] = {val}")
+        elif n in ("BUILD_LIST_UNPACK", "BUILD_TUPLE_UNPACK", "BUILD_TUPLE_UNPACK_WITH_CALL", "BUILD_SET_UNPACK"):
+            items = ", ".join(f"*{x}" for x in self.popn(a))
+            self.push(Expr(f"[{items}]" if n == "BUILD_LIST_UNPACK" else
+                           f"{{{items}}}" if n == "BUILD_SET_UNPACK" else f"({items},)"))
+        elif n in ("BUILD_MAP_UNPACK", "BUILD_MAP_UNPACK_WITH_CALL"):
+            self.push(Expr("{" + ", ".join(f"**{x}" for x in self.popn(a)) + "}"))
+        elif n == "LIST_TO_TUPLE":
+            self.push(Expr(f"tuple({self.pop()})"))
+        elif n == "KW_NAMES":
+            self.kwnames = [k.strip().strip("'") for k in _const_repr(av).strip("()").split(",") if k.strip()]
+        elif n in ("CALL", "CALL_FUNCTION", "CALL_METHOD", "CALL_KW", "CALL_FUNCTION_KW"):
+            kwnames = self.kwnames
+            self.kwnames = None
+            if n in ("CALL_KW", "CALL_FUNCTION_KW"):
+                kt = self.pop()
+                kwnames = [k.strip().strip("'") for k in kt.strip("()").split(",") if k.strip()]
+            args = self.popn(a)
+            if n in ("CALL_FUNCTION", "CALL_FUNCTION_KW"):
+                f = self.pop()
+            else:
+                # 3.11/3.12 and CALL_METHOD: [NULL | method, callable | self, args...]
+                # 3.13:                      [callable, NULL | self, args...]
+                top, below = self.pop(), self.pop()
+                if v >= (3, 13):
+                    f, bound = below, top
+                elif below is NULL:
+                    f, bound = top, NULL
+                else:
+                    f, bound = below, top
+                if bound is not NULL and bound is not SELF:
+                    args = [bound] + args
+            if f is NULL or f is SELF:
+                f = Expr("$callable")
+            self.push(self.call(f, args, kwnames))
+        elif n == "CALL_FUNCTION_EX":
+            kwargs = self.pop() if a & 1 else None
+            args = self.pop()
+            f = self.pop()
+            if f is NULL:
+                f = self.pop()
+            elif self.stack and self.stack[-1] is NULL:
+                self.pop()
+            self.nested_after(f)
+            parts = [f"*{args}"] + ([f"**{kwargs}"] if kwargs else [])
+            self.push(Expr(f"{f}({', '.join(parts)})"))
+        elif n == "CALL_INTRINSIC_1":
+            val = self.pop()
+            if a == 3:      # INTRINSIC_STOPITERATION_ERROR
+                self.push(val)
+            elif a == 5:    # INTRINSIC_UNARY_POSITIVE
+                self.push(Expr(f"+{val}"))
+            elif a == 6:    # INTRINSIC_LIST_TO_TUPLE
+                self.push(Expr(f"tuple({val})"))
+            elif a == 2:    # INTRINSIC_IMPORT_STAR
+                self.out(f"from {val} import *")
+            else:
+                self.push(Expr(f"$intrinsic{a}({val})"))
+        elif n == "CALL_INTRINSIC_2":
+            r, l = self.pop(), self.pop()
+            self.push(Expr(f"$intrinsic2_{a}({l}, {r})"))
+        elif n == "MAKE_FUNCTION":
+            if v < (3, 11):
+                self.pop()                      # qualified name
+            code = self.pop()
+            defaults = None
+            if v < (3, 13):
+                if a & 8: self.pop()
+                if a & 4: self.pop()
+                if a & 2: self.pop()
+                if a & 1: defaults = self.pop()
+            c = code.code if isinstance(code, Func) else None
+            self.push(Func(f"<function {c.qualname if c else code}>", c, defaults) if c else Expr(code))
+        elif n == "SET_FUNCTION_ATTRIBUTE":
+            fn, val = self.pop(), self.pop()
+            if a == 1 and isinstance(fn, Func):
+                fn = Func(fn, fn.code, val)
+            self.push(fn)
+        elif n == "IMPORT_NAME":
+            fromlist, level = self.pop(), self.pop()
+            dots = "." * int(level) if str(level).isdigit() else ""
+            self.push(Import(f"__import__({dots + av!r})", dots + av,
+                             ", ".join(x.strip().strip("'") for x in fromlist.strip("()").split(",") if x.strip())
+                             if fromlist not in ("None", "()") else fromlist))
+        elif n == "IMPORT_FROM":
+            mod = self.stack[-1] if self.stack else Expr("$module")
+            self.push(Expr(f"from {getattr(mod, 'module', mod)} import {av}"))
+        elif n == "IMPORT_STAR":
+            mod = self.pop()
+            self.out(f"from {getattr(mod, 'module', mod)} import *")
+        elif n == "POP_TOP":
+            val = self.pop()
+            if isinstance(val, Import):
+                return
+            if isinstance(val, Expr) and not val.startswith(("from ", "$")):
+                self.nested_after(val)
+                self.out(str(val))
+        elif n in ("RETURN_VALUE",):
+            val = self.pop()
+            self.nested_after(val)
+            self.out(f"return {val}")
+        elif n in ("YIELD_VALUE",):
+            self.push(Expr(f"(yield {self.pop()})"))
+        elif n in ("GET_AWAITABLE",):
+            self.push(Expr(f"await {self.pop()}"))
+        elif n == "SEND" and send_loop:
+            # the whole await / yield from loop (see _send_loops); 3.12+ keeps the receiver
+            # under the result for END_SEND, 3.11 pops it
+            self.pop()
+            recv = self.pop()
+            res = recv if recv.startswith("await ") else Expr(f"(yield from {recv})")
+            if v >= (3, 12):
+                self.push(recv)
+            self.push(res)
+        elif n in ("SEND", "YIELD_FROM"):
+            if n == "YIELD_FROM":
+                self.pop()
+            self.push(Expr(f"{self.pop()}"))
+            if ins.target is not None:
+                self.push(Expr("$sent"))
+        elif n == "END_SEND":
+            val = self.pop()
+            self.pop()
+            self.push(val)
+        elif n in ("GET_ITER", "GET_AITER"):
+            self.push(Expr(f"iter({self.pop()})"))
+        elif n == "FOR_ITER":
+            it = self.stack[-1] if self.stack else Expr("$iter")
+            self.out(f"for_iter {it}: else goto {labels.get(ins.target, ins.target)}")
+            self.push(Expr(f"next({it})"))
+        elif n in ("POP_JUMP_IF_FALSE", "POP_JUMP_IF_TRUE", "POP_JUMP_FORWARD_IF_FALSE",
+                   "POP_JUMP_FORWARD_IF_TRUE", "POP_JUMP_BACKWARD_IF_FALSE", "POP_JUMP_BACKWARD_IF_TRUE",
+                   "POP_JUMP_IF_NONE", "POP_JUMP_IF_NOT_NONE", "POP_JUMP_FORWARD_IF_NONE",
+                   "POP_JUMP_FORWARD_IF_NOT_NONE", "POP_JUMP_BACKWARD_IF_NONE", "POP_JUMP_BACKWARD_IF_NOT_NONE"):
+            cond = self.pop()
+            tgt = labels.get(ins.target, ins.target)
+            if n.endswith("_NOT_NONE"):
+                self.out(f"if {cond} is not None: goto {tgt}")
+            elif n.endswith("_NONE"):
+                self.out(f"if {cond} is None: goto {tgt}")
+            elif n.endswith("_TRUE"):
+                self.out(f"if {cond}: goto {tgt}")
+            else:
+                self.out(f"if not {cond}: goto {tgt}")
+        elif n in ("JUMP_IF_FALSE_OR_POP", "JUMP_IF_TRUE_OR_POP", "JUMP_IF_NOT_EXC_MATCH"):
+            cond = self.stack[-1] if self.stack else Expr("$stack")
+            tgt = labels.get(ins.target, ins.target)
+            if n == "JUMP_IF_NOT_EXC_MATCH":
+                exc_t = self.pop(); self.pop()
+                self.out(f"if not except_matches({exc_t}): goto {tgt}")
+            else:
+                self.out(f"if {'not ' if n.endswith('FALSE_OR_POP') else ''}{cond}: goto {tgt}  # keeps value")
+                self.pop()
+        elif n in UNCONDITIONAL:
+            self.out(f"goto {labels.get(ins.target, ins.target)}")
+        elif n == "RAISE_VARARGS":
+            args = self.popn(a)
+            self.out("raise" if not args else f"raise {args[0]}" + (f" from {args[1]}" if len(args) > 1 else ""))
+        elif n == "RERAISE":
+            self.out("raise  # re-raise")
+        elif n == "PUSH_EXC_INFO":
+            self.push(Expr("$exception"))
+        elif n == "CHECK_EXC_MATCH":
+            typ = self.pop()
+            self.push(Expr(f"except_matches({typ})"))
+        elif n == "CHECK_EG_MATCH":
+            typ = self.pop()
+            self.push(Expr(f"except_star_matches({typ})"))
+        elif n in ("POP_EXCEPT", "WITH_EXCEPT_START", "CLEANUP_THROW", "END_ASYNC_FOR"):
+            self.out(f"# {n.lower()}")
+        elif n in ("BEFORE_WITH", "SETUP_WITH", "BEFORE_ASYNC_WITH", "SETUP_ASYNC_WITH"):
+            ctx = self.pop()
+            self.out(f"with {ctx}:  # enter")
+            self.push(Expr("$exit")); self.push(Expr(f"{ctx}.__enter__()"))
+        elif n in ("SETUP_FINALLY", "SETUP_CLEANUP"):
+            self.out(f"try:  # handler {labels.get(ins.target, ins.target)}")
+        elif n == "UNPACK_SEQUENCE":
+            seq = self.pop()
+            for k in reversed(range(a)):
+                self.push(Expr(f"{seq}[{k}]"))
+        elif n == "UNPACK_EX":
+            seq = self.pop()
+            before, after = a & 0xFF, a >> 8
+            for k in reversed(range(before + 1 + after)):
+                self.push(Expr(f"{seq}[{k}]" if k != before else f"{seq}[{before}:]"))
+        elif n in ("POP_TOP",):
+            self.pop()
+        elif n in ("DUP_TOP", "COPY"):
+            k = 1 if n == "DUP_TOP" else a
+            self.push(self.stack[-k] if len(self.stack) >= k else Expr("$stack"))
+        elif n == "DUP_TOP_TWO":
+            self.stack.extend(self.stack[-2:])
+        elif n in ("ROT_TWO", "ROT_THREE", "ROT_FOUR", "SWAP"):
+            k = {"ROT_TWO": 2, "ROT_THREE": 3, "ROT_FOUR": 4}.get(n, a)
+            if len(self.stack) >= k:
+                if n == "SWAP":
+                    self.stack[-1], self.stack[-k] = self.stack[-k], self.stack[-1]
+                else:
+                    self.stack[-k:] = [self.stack[-1]] + self.stack[-k:-1]
+        elif n in ("SETUP_ANNOTATIONS", "GEN_START", "POP_FINALLY", "END_FINALLY", "WITH_CLEANUP_START",
+                   "WITH_CLEANUP_FINISH", "PRINT_EXPR"):
+            self.out(f"# {n.lower()}")
+        else:
+            self.out(f"# {n} {ins.argrepr}".rstrip())
+
+def _signature(co, defaults):
+    names = list(co.varnames)
+    npos = co.argcount
+    params = names[:npos]
+    if co.posonlyargcount:
+        params.insert(co.posonlyargcount, "/")
+    k = npos
+    if co.flags & CO_VARARGS:
+        params.append("*" + names[npos + co.kwonlyargcount])
+    elif co.kwonlyargcount:
+        params.append("*")
+    params += names[k:k + co.kwonlyargcount]
+    if co.flags & CO_VARKEYWORDS:
+        params.append("**" + names[npos + co.kwonlyargcount + (1 if co.flags & CO_VARARGS else 0)])
+    sig = ", ".join(params)
+    return sig + (f"  # defaults={defaults}" if defaults else "")
+
+def _send_loops(blocks):
+    """Find 3.11+ await / yield from loops; return ({SEND block start: exit start}, hidden block starts).
+
+    `await x` compiles to  SEND exit; YIELD_VALUE; RESUME; JUMP_BACKWARD_NO_INTERRUPT -> SEND
+    plus a CLEANUP_THROW handler jumping to exit. The loop body and the handler are hidden and
+    the SEND block hands its stack to the exit block, so the whole thing reads as one expression.
+    """
+    loops, hidden = {}, set()
+    for start, b in blocks.items():
+        if b.instrs[0].opname != "SEND":
+            continue
+        succ = dict((k, t) for k, t in b.succ if k in ("branch", "fallthrough"))
+        body = blocks.get(succ.get("fallthrough"))
+        if "branch" not in succ or body is None:
+            continue
+        ops = [i.opname for i in body.instrs if i.opname not in SILENT]
+        if ops != ["YIELD_VALUE", "JUMP_BACKWARD_NO_INTERRUPT"] or body.instrs[-1].target != start:
+            continue
+        loops[start] = succ["branch"]
+        hidden.add(body.start)
+        for kind, t in body.succ:
+            h = blocks.get(t)
+            if kind == "exception" and h is not None and \
+                    all(i.opname in SILENT or i.opname == "CLEANUP_THROW" or i.target == succ["branch"]
+                        for i in h.instrs):
+                hidden.add(t)
+    return loops, hidden
+
+def _render(co, indent="", defaults=None, name=None, body_only=False):
+    co = as_code(co)
+    instrs = instructions(co)
+    blocks = build_cfg(co, instrs)
+    labels = {start: f"L{start}" for start in blocks}
+    lines = []
+    inner = indent if body_only or co.name == "<module>" else indent + "    "
+    if not body_only:
+        if co.name == "<module>":
+            lines.append(f"{indent}# module {co.filename} (Python {co.version}, {len(instrs)} instructions)")
+        else:
+            kw = "async def" if co.flags & (CO_COROUTINE | CO_ASYNC_GENERATOR) else "def"
+            lines.append(f"{indent}{kw} {name or co.name}({_signature(co, defaults)}):"
+                         f"  # line {co.firstlineno}, {co.qualname}")
+
+    def emit_nested(c, ind, dflt, nm, body_only=False):
+        return _render(c, ind, dflt, nm, body_only)
+
+    r = _BlockRenderer(co, inner, emit_nested)
+    sends, hidden = _send_loops(blocks)
+    entered = {}                     # block start -> edge kinds that reach it (other than fallthrough)
+    for b in blocks.values():
+        if b.start in hidden:
+            continue
+        for kind, t in b.succ:
+            if kind != "fallthrough" and not (kind == "branch" and b.start in sends):
+                entered.setdefault(t, set()).add(kind)
+    falls = carried = False
+    for start, b in blocks.items():
+        if start in hidden:
+            continue
+        handler = "exception" in entered.get(start, ())
+        # the symbolic stack survives a plain fallthrough (or the exit of an await loop);
+        # other entries start from scratch
+        if handler:
+            r.stack = [Expr("$exception")]
+        elif not falls and not carried:
+            r.stack = []
+        if start in entered:
+            first_line = next((i.line for i in b.instrs if i.line), None)
+            note = ([f"line {first_line}"] if first_line else []) + (["exception handler"] if handler else [])
+            lines.append(f"{inner}{labels[start]}:" + (f"  # {', '.join(note)}" if note else ""))
+        r.lines = []
+        for ins in b.instrs:
+            r.run(ins, labels, start in sends)
+        lines.extend(r.lines)
+        falls = any(kind == "fallthrough" for kind, _ in b.succ) and start not in sends
+        carried = sends.get(start) is not None and \
+            next((s for s in blocks if s > start and s not in hidden), None) == sends[start]
+    if len(lines) == (0 if body_only else 1):
+        lines.append(inner + "pass")
+    exc = exception_table(co) if co.exceptiontable is not None else []
+    for e in exc:
+        if e.target in hidden:
+            continue
+        lines.append(f"{inner}# try L{e.start}..L{e.end} -> L{e.target} (depth {e.depth}{', lasti' if e.lasti else ''})")
+    return lines
+
+def pseudo_source(co):
+    """Return structured pseudo-source for co and its nested functions/classes."""
+    return "\n".join(_render(co)) + "\n"
+
+def disassemble(co, cfg=False):
+    """Return a dis-style listing of co and every nested code object (optionally with CFG edges)."""
+    co = as_code(co)
+    out = []
+    stack = [co]
+    while stack:
+        c = stack.pop()
+        instrs = instructions(c)
+        out.append(f"Disassembly of {c.qualname} (Python {c.version}, {c.filename}:{c.firstlineno}):")
+        targets = {i.target for i in instrs if i.target is not None}
+        for ins in instrs:
+            line = f"{ins.line:>5}" if ins.line is not None else "     "
+            mark = ">>" if ins.offset in targets else "  "
+            arg = "" if ins.arg is None else f"{ins.arg:>5}"
+            out.append(f"{line} {mark} {ins.offset:>6} {ins.opname:<28}{arg} {('(' + ins.argrepr + ')') if ins.argrepr else ''}".rstrip())
+        for e in exception_table(c) if c.exceptiontable is not None else []:
+            out.append(f"  ExceptionTable: {e.start} to {e.end} -> {e.target} [{e.depth}]{' lasti' if e.lasti else ''}")
+        if cfg:
+            out.append("  CFG:")
+            for start, b in build_cfg(c, instrs).items():
+                edges = ", ".join(f"{k}->L{t}" for k, t in b.succ) or "exit"
+                out.append(f"    L{start} [{b.instrs[0].offset}..{b.instrs[-1].offset}] {edges}")
+        out.append("")
+        stack.extend(k for k in reversed(c.consts) if isinstance(k, Code))
+    return "\n".join(out)
+
+# --- regression checks -------------------------------------------------------
+
+# (dump next to this script, version, snippets that must appear, snippets that must not)
+SELFTEST = [
+    ("chimera_payload3.pyc", "3.12",
+     ["async def activate_catalyst():", "    await asyncio.sleep(0.01)\n", "(c ^ (i + 42))",
+      "asyncio.run(activate_catalyst())"],
+     ["goto L224", "$sent", "cleanup_throw"]),
+]
+
+def selftest():
+    """Render the SELFTEST dumps; return a list of failure messages (empty if all pass)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    failures = []
+    for name, version, want, unwanted in SELFTEST:
+        _, co = load_code(os.path.join(here, name), version)
+        text = pseudo_source(co)
+        failures += [f"{name}: missing {w!r}" for w in want if w not in text]
+        failures += [f"{name}: unexpected {u!r}" for u in unwanted if u in text]
+    return failures
+
+# --- caching -------------------------------------------------------------------
+
+def code_hash(co):
+    """Stable hash of a code object's content (recursing into nested code)."""
+    co = as_code(co)
+    h = hashlib.sha256()
+    for part in (co.version, co.name, co.qualname, co.filename, co.firstlineno, co.argcount,
+                 co.posonlyargcount, co.kwonlyargcount, co.flags, co.names, co.varnames,
+                 co.freevars, co.cellvars, co.localsplusnames):
+        h.update(repr(part).encode("utf-8", "backslashreplace") + b"\0")
+    for blob in (co.code, co.linetable, co.exceptiontable):
+        h.update(bytes(blob or b"") + b"\0")
+    for c in co.consts:
+        if isinstance(c, Code):
+            h.update(b"C" + code_hash(c).encode())
+        else:
+            h.update(repr(bytes(c) if isinstance(c, memoryview) else c).encode("utf-8", "backslashreplace"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def render_cached(co, mode="source", cache_dir=None, cfg=False):
+    """Render co (mode "source" or "asm"); reuse cache_dir/<hash>.txt when present."""
+    co = as_code(co)
+    key = None
+    if cache_dir:
+        key = hashlib.sha256(f"{ENGINE_VERSION}:{mode}:{cfg}:{code_hash(co)}".encode()).hexdigest()
+        path = os.path.join(cache_dir, key[:2], key + ".txt")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read(), True
+        except OSError:
+            pass
+    text = pseudo_source(co) if mode == "source" else disassemble(co, cfg)
+    if key:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    return text, False
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Disassemble / pseudo-decompile pyc files of any CPython 3.8-3.13")
+    p.add_argument("files", nargs="*", help="pyc files, bare marshal dumps or glob patterns")
+    p.add_argument("--asm", action="store_true", help="instruction listing instead of pseudo-source")
+    p.add_argument("--cfg", action="store_true", help="with --asm: also print basic blocks and edges")
+    p.add_argument("--cache", default=None, help="cache directory for rendered output (keyed by code hash)")
+    p.add_argument("--version", default=None, help="CPython version (3.X) of bare marshal dumps (required for them)")
+    p.add_argument("-o", "--out", default=None, help="output file (one input) or directory (several)")
+    p.add_argument("--selftest", action="store_true", help="check the rendering of known payloads and exit")
+    args = p.parse_args()
+    if args.selftest:
+        failures = selftest()
+        for f in failures:
+            print(f"[!] {f}", file=sys.stderr)
+        print(f"[+] selftest: {len(SELFTEST)} dump(s), {len(failures)} failure(s)", file=sys.stderr)
+        sys.exit(1 if failures else 0)
+    if not args.files:
+        p.error("no input files (or pass --selftest)")
+    paths = [m for pat in args.files for m in (sorted(glob.glob(pat)) or [pat])]
+    mode = "asm" if args.asm else "source"
+    hits = failed = 0
+    for path in paths:
+        try:
+            hdr, co = load_code(path, args.version)
+        except MissingVersion as e:
+            # without a version the opcode table is unknown; guessing gives a wrong listing
+            print(f"[!] {path}: {e}; pass --version 3.X", file=sys.stderr)
+            failed += 1
+            continue
+        except Exception as e:
+            print(f"[!] {path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        text, cached = render_cached(co, mode, args.cache, args.cfg)
+        hits += cached
+        header = f"# {mode} of {path} (header {hdr.layout}, offset {hdr.offset})\n"
+        if args.out and len(paths) > 1:
+            os.makedirs(args.out, exist_ok=True)
+            target = os.path.join(args.out, os.path.basename(path) + (".asm" if args.asm else ".txt"))
+        else:
+            target = args.out
+        if target:
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(header + text)
+            print(f"[+] {path} -> {target}{' (cached)' if cached else ''}", file=sys.stderr)
+        else:
+            sys.stdout.write(header + text)
+    if args.cache:
+        print(f"[+] {hits}/{len(paths)} served from cache {args.cache}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
@@ -3,7 +3,8 @@
 deep_scan_marshal.py
 Continuing from the previous auto_find_pyc run:
 Scan deeply inside each concatenated blob permutation to locate the correct
-marshal.loads() start offset (up to several KB).
+marshal.loads() start offset (up to several KB). Offsets are pre-filtered by
+marshal_scan.find_code_objects(), which checks the code-object header in place.
 """
 
 import marshal, types, itertools, zlib, base64, importlib.util, struct, time
@@ -21,6 +22,8 @@ import cowsay
 import pyjokes
 import art
 from arc4 import ARC4
+from marshal_scan import find_code_objects
+from pyc_header import build_header
 
 
 asyncio._ssock = None
@@ -49,15 +52,11 @@ combo = b"".join(b for _, b in order)
 max_offset = min(len(combo), 50000)  # scan first 50KB (adjust if needed)
 found = None
 
-for offset in range(max_offset):
-    try:
-        obj = marshal.loads(combo[offset:])
-        if isinstance(obj, types.CodeType):
-            print(f"✅ Found valid code object at offset {offset}")
-            found = (offset, obj)
-            break
-    except Exception:
-        continue
+# only offsets with a structurally valid code-object header are tried with marshal.loads
+hits = find_code_objects(combo, first_only=True, limit=max_offset)
+if hits:
+    found = hits[0]
+    print(f"✅ Found valid code object at offset {found[0]}")
 
 if not found:
     print("❌ No valid marshal code object found up to offset", max_offset)
@@ -67,14 +66,10 @@ else:
     combo_slice = combo[offset:]
 
     pyc_filename = Path(f"chimera_payload_fixed_off{offset}.pyc")
-    magic = importlib.util.MAGIC_NUMBER
-    timestamp = struct.pack("<I", int(time.time()))
-    padding = b"\x00\x00\x00\x00"
+    header = build_header()   # 16-byte PEP 552 header (flags=0, mtime, size)
 
     with open(pyc_filename, "wb") as f:
-        f.write(magic)
-        f.write(timestamp)
-        f.write(padding)
+        f.write(header)
         f.write(marshal.dumps(code_obj))
 
     print(f"✅ Wrote {pyc_filename} ({len(combo_slice)} bytes of code section)")
@@ -1,73 +1,86 @@
 #!/usr/bin/env python3
 # dump_pyc_consts.py
-# Usage: python3.13 dump_pyc_consts.py chimera_payload3.pyc output_dir
-# This script requires Python 3.13+ to correctly load modern .pyc marshal format.
+# Usage: python3 dump_pyc_consts.py chimera_payload_fixed_off0.pyc output_dir
+#        python3 dump_pyc_consts.py chimera_payload3.pyc output_dir --version 3.12   # bare dump
+# Any CPython 3.8 - 3.13 .pyc (or bare marshal dump) works under any interpreter:
+# a foreign version is decoded by marshal_reader.py instead of marshal.loads().
 # It safely extracts constants from the marshalled code object and writes any bytes
 # constants to separate files (both raw .bin and .hex), and strings to .txt files.
+# With --format archive every constant goes into one indexed consts.blob/consts.idx
+# pair instead (see const_archive.py); constants are streamed, never collected.
 # Run this in a sandbox or VM if the .pyc is untrusted.
 
-import sys, os, marshal, types, argparse, binascii
+import sys, os, argparse, binascii
+
+from const_archive import ArchiveWriter, iter_code_consts
+from marshal_reader import MissingVersion, load_code
 
 def walk_code_consts(co, found):
-    # Recursively walk code object's constants and collect non-code constants
-    for c in co.co_consts:
-        if isinstance(c, types.CodeType):
-            walk_code_consts(c, found)
-        else:
-            found.append(c)
+    # Collect non-code constants into found (kept for callers that want a list)
+    found.extend(iter_code_consts(co))
 
-def dump_pyc_consts(pyc_path, outdir):
-    with open(pyc_path, "rb") as f:
-        data = f.read()
-    if len(data) < 16:
-        print("Error: .pyc too small or corrupt")
-        return 1
-    header = data[:16]
-    payload = data[16:]
+def write_consts(code, outdir, fmt="files"):
+    """Stream the constants of code into outdir; returns (count, bytes_count).
+
+    fmt "files" writes const_<i>.bin/.hex for bytes and const_<i>.txt for str;
+    fmt "archive" packs every constant into consts.blob + consts.idx (const_archive.py).
+    constants_summary.txt is written in both modes.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    count = bytes_count = 0
+    archive = ArchiveWriter(outdir) if fmt == "archive" else None
+    try:
+        with open(os.path.join(outdir, "constants_summary.txt"), "w", encoding="utf-8") as s:
+            s.write("index,type,length\n")
+            for i, c in enumerate(iter_code_consts(code)):
+                count += 1
+                typ = "bytes" if isinstance(c, memoryview) else type(c).__name__
+                try:
+                    ln = len(c)
+                except Exception:
+                    ln = None
+                s.write(f"{i},{typ},{ln if ln is not None else ''}\n")
+                if isinstance(c, (bytes, bytearray, memoryview)):
+                    bytes_count += 1
+                if archive is not None:
+                    archive.add(c)
+                elif isinstance(c, (bytes, bytearray, memoryview)):
+                    raw_name = os.path.join(outdir, f"const_{i}.bin")
+                    hex_name = os.path.join(outdir, f"const_{i}.hex")
+                    with open(raw_name, "wb") as rw:
+                        rw.write(bytes(c))
+                    with open(hex_name, "w") as hx:
+                        hx.write(binascii.hexlify(bytes(c)).decode())
+                    print(f"Wrote bytes const #{i}: {raw_name} ({len(c)} bytes)")
+                elif isinstance(c, str):
+                    # save strings too for convenience
+                    txt_name = os.path.join(outdir, f"const_{i}.txt")
+                    try:
+                        with open(txt_name, "w", encoding="utf-8", errors="ignore") as t:
+                            t.write(c)
+                    except Exception:
+                        pass
+    finally:
+        if archive is not None:
+            archive.close()
+    return count, bytes_count
+
+def dump_pyc_consts(pyc_path, outdir, fmt="files", version=None):
     try:
-        code = marshal.loads(payload)
+        hdr, code = load_code(pyc_path, version)
+    except MissingVersion as e:
+        print(f"Error: {e}; pass --version 3.X")
+        return 1
+    except ValueError as e:
+        print("Error: .pyc too small, corrupt or for another Python:", e)
+        return 1
     except Exception as e:
         print("Error: failed to marshal.loads payload:", e)
         return 1
+    print(f"Header: {hdr.layout}, Python {hdr.version or '?'}, payload at offset {hdr.offset}")
 
-    consts = []
-    walk_code_consts(code, consts)
-
-    os.makedirs(outdir, exist_ok=True)
-    summary = []
-    bytes_count = 0
-    for i, c in enumerate(consts):
-        typ = type(c).__name__
-        ln = None
-        try:
-            ln = len(c)
-        except Exception:
-            ln = None
-        summary.append((i, typ, ln))
-        if isinstance(c, (bytes, bytearray)):
-            bytes_count += 1
-            raw_name = os.path.join(outdir, f"const_{i}.bin")
-            hex_name = os.path.join(outdir, f"const_{i}.hex")
-            with open(raw_name, "wb") as rw:
-                rw.write(bytes(c))
-            with open(hex_name, "w") as hx:
-                hx.write(binascii.hexlify(bytes(c)).decode())
-            print(f"Wrote bytes const #{i}: {raw_name} ({len(c)} bytes)")
-        elif isinstance(c, str):
-            # save strings too for convenience
-            txt_name = os.path.join(outdir, f"const_{i}.txt")
-            try:
-                with open(txt_name, "w", encoding="utf-8", errors="ignore") as t:
-                    t.write(c)
-            except Exception:
-                pass
-
-    # summary file
-    with open(os.path.join(outdir, "constants_summary.txt"), "w", encoding="utf-8") as s:
-        s.write("index,type,length\n")
-        for idx, typ, ln in summary:
-            s.write(f"{idx},{typ},{ln if ln is not None else ''}\n")
-    print(f"\nDone. Found {len(consts)} constants, of which {bytes_count} were bytes objects.")
+    count, bytes_count = write_consts(code, outdir, fmt)
+    print(f"\nDone. Found {count} constants, of which {bytes_count} were bytes objects.")
     print(f"Constants and dumps in: {outdir}")
     return 0
 
@@ -75,5 +88,8 @@ if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Dump constants from a .pyc compiled with a modern Python")
     p.add_argument("pyc", help="path to .pyc file")
     p.add_argument("outdir", help="directory to write extracted constants")
+    p.add_argument("--format", choices=("files", "archive"), default="files",
+                   help="one file per constant, or one packed consts.blob + consts.idx")
+    p.add_argument("--version", default=None, help="CPython version (3.X) of a bare marshal dump")
     args = p.parse_args()
-    sys.exit(dump_pyc_consts(args.pyc, args.outdir))
+    sys.exit(dump_pyc_consts(args.pyc, args.outdir, args.format, args.version))
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+exec_harness.py
+
+Batch execution of a payload function under mocks, spread over a process pool.
+
+testing68.py builds fresh mock globals, wraps activate_catalyst in a function
+and calls asyncio.run() once per candidate login, in-process and sequentially;
+asyncio.run() creates and tears down an event loop each time and the payload's
+own asyncio.sleep(0.01) adds 10 ms, so it manages a handful of runs per second.
+Here:
+
+  - the code object is unmarshalled once per worker (executor initializer, forked
+    before any work arrives) and the target function's code is looked up once;
+  - each run gets fresh globals from an environment spec (default chimera_env:
+    testing68's SafeOS / SafeGetpass / ARC4Mock / safe builtins, with asyncio.sleep
+    returning immediately) and coroutines are driven on one event loop that
+    the worker keeps for its lifetime;
+  - every run is bounded by a wall-clock timeout (SIGALRM, raised as a
+    BaseException so the payload's own "except Exception" cannot swallow it) and
+    by an address-space limit (RLIMIT_AS) set in each worker;
+  - candidates travel in chunks (wordlists as byte ranges, read by the worker)
+    and only records whose status is in --keep come back to the parent; the rest
+    are counted. The pool is a concurrent.futures.ProcessPoolExecutor, so a
+    worker killed by a signal (a payload segfaulting in C code) breaks it at
+    once and is reported as a crash with the signal; if no chunk completes for
+    --stall seconds (a worker stuck in C code), the workers are killed instead
+    of hanging.
+
+Statuses: ran_ok, system_exit, error, timeout, memory.
+
+The code object must be native to the running interpreter -- run the harness with
+the python3.X that wrote the dump (decompressed.bin is a 3.12 payload).
+
+Usage:
+  python3.12 exec_harness.py decompressed.bin --version 3.12 --candidates alistair teddy
+  python3.12 exec_harness.py decompressed.bin --version 3.12 --wordlist names.txt --workers 8 --out runs.jsonl
+  python3.12 exec_harness.py dump.bin --env my_env:build --function main --keep ran_ok
+"""
+import argparse, asyncio, importlib, itertools, json, os, resource, signal, sys, time, types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import active_children, cpu_count
+
+from marshal_reader import MissingVersion, load_code
+from testing68 import ARC4Mock, SAFE_BUILTINS, SafeGetpass, SafeOS, find_codeobj
+from wordlist_stream import byte_ranges, read_words
+
+DEFAULT_CANDIDATES = [
+    "alistair", "alistair.khem", "alistair_khem", "dr.alistair",
+    "alistair@flare-on.com", "alistair.khem@flare-on.com", "lead.researcher@flare-on.com",
+    "teddy", "teddy.zugana",
+]
+STATUSES = ("ran_ok", "system_exit", "error", "timeout", "memory")
+CO_COROUTINE = 0x80
+
+class RunTimeout(BaseException):
+    pass
+
+async def _skip_sleep(delay, result=None):
+    return result
+
+def chimera_env(candidate):
+    """Return (globals, collect) for one run; collect() -> dict of what the run recorded."""
+    printed = []
+    builtins = SAFE_BUILTINS.copy()
+    builtins["print"] = lambda *a, **kw: printed.append(" ".join(map(str, a)))
+    ARC4Mock.reset()
+    g = {
+        "__builtins__": builtins,
+        "os": SafeOS(candidate),
+        "getpass": SafeGetpass(candidate),
+        "ARC4": ARC4Mock,
+        "arc4": ARC4Mock,
+        "asyncio": types.SimpleNamespace(sleep=_skip_sleep),
+        "random": types.SimpleNamespace(choice=lambda seq: seq[0]),
+        "pyjokes": types.SimpleNamespace(get_joke=lambda *a, **k: "jk"),
+        "art": types.SimpleNamespace(tprint=lambda *a, **k: None),
+        "cowsay": types.SimpleNamespace(cow=lambda s: printed.append(s), char_names=["cow", "tux"],
+                                        get_output_string=lambda c, s: s),
+        "emoji": types.SimpleNamespace(emojize=lambda s, *a, **k: s),
+        "sys": types.SimpleNamespace(exit=lambda *a, **k: (_ for _ in ()).throw(SystemExit("exit called"))),
+    }
+    return g, lambda: {"printed": printed[:], "arc4_calls": list(ARC4Mock.instances)}
+
+def resolve_env(spec):
+    """"module:callable" -> callable(candidate) returning (globals, collect)."""
+    if spec == "chimera":
+        return chimera_env
+    mod, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(mod), attr or "build_env")
+
+# --- worker side ---------------------------------------------------------------
+
+_W = {}
+
+def _on_alarm(signum, frame):
+    raise RunTimeout()
+
+def _init_worker(path, version, function, env_spec, timeout, mem_mb, keep):
+    hdr, co = load_code(path, version)
+    target = find_codeobj(co, function)
+    if target is None:
+        raise RuntimeError(f"{path}: no code object named {function!r}")
+    if mem_mb:
+        limit = mem_mb << 20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGALRM, _on_alarm)
+    _W.update(code=target, env=resolve_env(env_spec), timeout=timeout,
+              keep=frozenset(keep), loop=asyncio.new_event_loop(), name=f"pid{os.getpid()}")
+
+def _run_one(candidate):
+    build, code = _W["env"], _W["code"]
+    collect = None
+    t0 = time.perf_counter()
+    signal.setitimer(signal.ITIMER_REAL, _W["timeout"])
+    try:
+        g, collect = build(candidate)
+        res = types.FunctionType(code, g)()
+        if code.co_flags & CO_COROUTINE:
+            _W["loop"].run_until_complete(res)
+        status, detail = "ran_ok", None
+    except SystemExit as e:
+        status, detail = "system_exit", f"SystemExit: {e}"
+    except RunTimeout:
+        status, detail = "timeout", f"exceeded {_W['timeout']}s"
+        _W["loop"].close()
+        _W["loop"] = asyncio.new_event_loop()
+    except MemoryError:
+        status, detail = "memory", "MemoryError"
+    except Exception as e:
+        status, detail = "error", f"Exception: {type(e).__name__}: {e}"
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    rec = {"candidate": candidate, "status": status, "seconds": round(time.perf_counter() - t0, 6)}
+    if detail:
+        rec["detail"] = detail
+    if collect is not None:
+        rec.update(collect())
+    return rec
+
+def run_chunk(task):
+    """task: ("words", [candidates]) or ("range", wordlist, start, end)."""
+    words = task[1] if task[0] == "words" else read_words(*task[1:])
+    counts = dict.fromkeys(STATUSES, 0)
+    kept = []
+    keep = _W["keep"]
+    for w in words:
+        rec = _run_one(w)
+        counts[rec["status"]] += 1
+        if rec["status"] in keep:
+            kept.append(rec)
+    return {"worker": _W["name"], "runs": len(words), "counts": counts, "kept": kept}
+
+# --- parent side ---------------------------------------------------------------
+
+def make_tasks(candidates, wordlist, chunk, chunk_bytes):
+    for i in range(0, len(candidates), chunk):
+        yield ("words", candidates[i:i + chunk])
+    if wordlist:
+        for start, end in byte_ranges(wordlist, chunk_bytes):
+            yield ("range", wordlist, start, end)
+
+def describe_exit(exitcode):
+    if exitcode is None:
+        return "still running"
+    if exitcode < 0:
+        try:
+            return f"killed by signal {-exitcode} ({signal.Signals(-exitcode).name})"
+        except ValueError:
+            return f"killed by signal {-exitcode}"
+    return f"exited with code {exitcode}"
+
+def dead_workers(procs):
+    """[(pid, exitcode)] of workers that died on their own (the executor SIGTERMs the rest)."""
+    for p in procs.values():
+        p.join(1.0)          # the pool notices the closed sentinel before the exit status is reapable
+    dead = [(pid, p.exitcode) for pid, p in procs.items() if p.exitcode is not None]
+    return [d for d in dead if d[1] != -signal.SIGTERM] or dead
+
+def run(args, out):
+    tasks = make_tasks(args.candidates or ([] if args.wordlist else DEFAULT_CANDIDATES),
+                       args.wordlist, args.chunk, args.chunk_bytes)
+    totals = dict.fromkeys(STATUSES, 0)
+    nruns = 0
+    started = time.perf_counter()
+    initargs = (args.payload, args.version, args.function, args.env, args.timeout, args.mem_mb, args.keep)
+    executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=initargs)
+    # pid -> Process of every worker, to report which one died and how. The executor starts
+    # workers inside submit(), so a snapshot of our children after each submit sees them all
+    # before they run anything; entries are never dropped, so exit codes stay readable.
+    procs = {}
+
+    def submit(task):
+        fut = executor.submit(run_chunk, task)
+        procs.update((p.pid, p) for p in active_children())
+        return fut
+
+    # a couple of chunks per worker in flight; the rest of the generator is consumed as they finish
+    pending = {submit(t) for t in itertools.islice(tasks, args.workers * 2)}
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=args.stall, return_when=FIRST_COMPLETED)
+            if not done:
+                for p in procs.values():
+                    if p.is_alive():
+                        p.kill()
+                print(f"[!] no chunk finished in {args.stall}s (worker hung); workers killed", file=sys.stderr)
+                return 2
+            for fut in done:
+                try:
+                    res = fut.result()
+                except BrokenProcessPool:
+                    for pid, code in dead_workers(procs):
+                        print(f"[!] worker pid {pid} {describe_exit(code)}; pool aborted", file=sys.stderr)
+                    print(f"[!] payload crashed a worker after {nruns} completed runs", file=sys.stderr)
+                    return 3
+                nruns += res["runs"]
+                for k, v in res["counts"].items():
+                    totals[k] += v
+                for rec in res["kept"]:
+                    out.write(json.dumps(rec) + "\n")
+                    if rec["status"] == "ran_ok":
+                        print(f"✅ {rec['candidate']!r} ran to completion", file=sys.stderr)
+                out.flush()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.add(submit(task))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    wall = time.perf_counter() - started
+    print(f"[+] {nruns} runs in {wall:.2f}s ({nruns / wall if wall else 0:.0f}/s) "
+          + " ".join(f"{k}={v}" for k, v in totals.items()), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Run a payload function over many candidates under mocks")
+    p.add_argument("payload", nargs="?", default="decompressed.bin", help="pyc or bare marshal dump")
+    p.add_argument("--version", default=None, help="CPython version (3.X) of a bare dump; must match this interpreter")
+    p.add_argument("--function", default="activate_catalyst", help="name of the code object to run")
+    p.add_argument("--env", default="chimera", help='mock environment: "chimera" or module:callable')
+    p.add_argument("--candidates", nargs="*", default=None, help="candidate logins (default: testing68's list)")
+    p.add_argument("--wordlist", default=None, help="file with one candidate per line")
+    p.add_argument("--workers", type=int, default=cpu_count())
+    p.add_argument("--chunk", type=int, default=256, help="candidates per task from --candidates")
+    p.add_argument("--chunk-bytes", type=int, default=1 << 14, help="wordlist bytes per task")
+    p.add_argument("--timeout", type=float, default=2.0, help="seconds per run")
+    p.add_argument("--mem-mb", type=int, default=1024, help="address-space limit per worker (0 = none)")
+    p.add_argument("--stall", type=float, default=120.0, help="abort if no chunk finishes for this long")
+    p.add_argument("--keep", nargs="*", default=["ran_ok", "error", "timeout", "memory"], choices=STATUSES,
+                   help="statuses whose full records are written")
+    p.add_argument("--out", default="-", help="JSON lines output (default stdout)")
+    args = p.parse_args()
+
+    running = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    if args.version and args.version != running:
+        sys.exit(f"payload is CPython {args.version}; run this with python{args.version} (running {running})")
+    try:
+        hdr, co = load_code(args.payload, args.version)
+    except MissingVersion as e:
+        sys.exit(f"{e}; pass --version (it must be {running} to run here)")
+    if not isinstance(co, types.CodeType):
+        sys.exit(f"{args.payload} is a CPython {co.version} dump; run this with python{co.version}")
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        code = run(args, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    sys.exit(code)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+hash_match.py
+
+Identify which hash (and which input) produced a set of target digests.
+
+testing64.py hashed each candidate with SHA1, SHA256[:20] and RIPEMD160 and
+compared against a single 20-byte target. Here:
+
+  - any number of targets (hex on the command line or one per line in a file)
+    are indexed by length into sets, so a lookup is O(1) whatever the target count;
+  - every enabled algorithm is computed once per candidate, and each digest is
+    checked against every target length it can cover: the full digest and its
+    prefix (and with --suffix, its suffix) truncated to that length -- so
+    "SHA256 truncated to 20 bytes" costs one sha256() and one set lookup;
+  - SHAKE digests are produced at the longest target length (shorter SHAKE
+    outputs are prefixes of longer ones);
+  - the wordlist is streamed as byte ranges (wordlist_stream.byte_ranges) to a
+    Pool; workers read their slice once and run all algorithms over it, so the
+    list is read a single time regardless of how many algorithms are enabled.
+    Only hits travel back to the parent.
+
+Usage:
+  python3 hash_match.py --target 1b40491d416f654000075a465b424c0d4e0a0c53 --wordlist rockyou.txt
+  python3 hash_match.py --targets-file sigs.txt --wordlist names.txt --algos sha1,sha256,ripemd160 --suffix
+  python3 hash_match.py --target <hex> --words alistair "Dr. Alistair Khem"
+"""
+import argparse, functools, hashlib, os, sys, time
+from multiprocessing import Pool, cpu_count
+
+from wordlist_stream import byte_ranges, read_words
+
+def available_algorithms():
+    """hashlib algorithms usable in this build (ripemd160 / md4 depend on OpenSSL)."""
+    names = []
+    for name in sorted(hashlib.algorithms_available):
+        try:
+            hashlib.new(name, b"")
+        except (ValueError, TypeError):
+            continue
+        names.append(name.lower())
+    return sorted(set(names))
+
+def _constructor(name):
+    ctor = getattr(hashlib, name, None)
+    return ctor if ctor is not None else functools.partial(hashlib.new, name)
+
+class Matcher:
+    """All enabled digests of a candidate against all targets."""
+
+    def __init__(self, targets, algorithms, suffix=False):
+        self.by_len = {}
+        for t in targets:
+            self.by_len.setdefault(len(t), set()).add(t)
+        self.lengths = sorted(self.by_len)
+        self.suffix = suffix
+        shake_len = max(self.lengths)
+        self.algorithms = [(name, _constructor(name), shake_len if name.startswith("shake_") else None)
+                           for name in algorithms]
+
+    def match(self, data):
+        """Yield (algorithm label, target) for every target data hashes to."""
+        for name, ctor, shake_len in self.algorithms:
+            d = ctor(data).digest(shake_len) if shake_len else ctor(data).digest()
+            dl = len(d)
+            for n in self.lengths:
+                if n > dl:
+                    break
+                hit = self.by_len[n]
+                if d[:n] in hit:
+                    yield (name if n == dl else f"{name}[:{n}]"), d[:n]
+                if self.suffix and n < dl and d[dl - n:] in hit:
+                    yield f"{name}[-{n}:]", d[dl - n:]
+
+    def match_words(self, words):
+        """Return [(word, label, target hex)] for an iterable of str candidates."""
+        hits = []
+        for w in words:
+            for label, t in self.match(w.encode("utf-8", "surrogatepass")):
+                hits.append((w, label, t.hex()))
+        return hits
+
+# --- pool --------------------------------------------------------------------------
+
+_MATCHER = None
+
+def _init_worker(targets, algorithms, suffix):
+    global _MATCHER
+    _MATCHER = Matcher(targets, algorithms, suffix)
+
+def match_range(task):
+    path, start, end = task
+    words = read_words(path, start, end)
+    return len(words), _MATCHER.match_words(words)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Find which hash of which candidate yields the target digest(s)")
+    p.add_argument("--target", action="append", default=[], help="target digest in hex (repeatable)")
+    p.add_argument("--targets-file", help="file with one hex digest per line")
+    p.add_argument("--wordlist", help="candidate file, one per line (streamed)")
+    p.add_argument("--words", nargs="*", default=[], help="candidates on the command line")
+    p.add_argument("--algos", default="all", help="comma-separated hashlib names, or 'all' (see --list)")
+    p.add_argument("--suffix", action="store_true", help="also match digest suffixes, not only prefixes")
+    p.add_argument("--list", action="store_true", help="list available algorithms and exit")
+    p.add_argument("--workers", type=int, default=cpu_count())
+    p.add_argument("--chunk-bytes", type=int, default=1 << 16, help="wordlist bytes per task")
+    p.add_argument("--out", default=None, help="append hits here (tab-separated) as they are found")
+    args = p.parse_args()
+
+    avail = available_algorithms()
+    if args.list:
+        print("\n".join(avail))
+        sys.exit(0)
+    targets = [bytes.fromhex(t) for t in args.target]
+    if args.targets_file:
+        with open(args.targets_file, "r", encoding="utf-8") as f:
+            targets += [bytes.fromhex(line.strip()) for line in f if line.strip()]
+    if not targets:
+        sys.exit("no targets given (--target / --targets-file)")
+    algorithms = avail if args.algos == "all" else [a.strip().lower() for a in args.algos.split(",")]
+    missing = [a for a in algorithms if a not in avail]
+    if missing:
+        sys.exit(f"algorithm(s) not available in this build: {', '.join(missing)}")
+    print(f"[+] {len(set(targets))} target(s), {len(algorithms)} algorithm(s): {', '.join(algorithms)}")
+
+    out = open(args.out, "a", encoding="utf-8") if args.out else None
+    start = time.time()
+    ncand = nhits = 0
+
+    def report(hits):
+        global nhits
+        for word, label, thex in hits:
+            nhits += 1
+            print(f"✅ {label} match: {word!r} -> {thex}")
+            if out:
+                out.write(f"{word}\t{label}\t{thex}\n")
+                out.flush()
+
+    if args.words:
+        m = Matcher(targets, algorithms, args.suffix)
+        report(m.match_words(args.words))
+        ncand += len(args.words)
+    if args.wordlist:
+        if not os.path.exists(args.wordlist):
+            sys.exit(f"wordlist not found: {args.wordlist}")
+        tasks = ((args.wordlist, s, e) for s, e in byte_ranges(args.wordlist, args.chunk_bytes))
+        with Pool(args.workers, initializer=_init_worker, initargs=(targets, algorithms, args.suffix)) as pool:
+            for n, hits in pool.imap_unordered(match_range, tasks):
+                ncand += n
+                report(hits)
+    if out:
+        out.close()
+    elapsed = time.time() - start
+    print(f"[+] {ncand} candidates x {len(algorithms)} algorithms in {elapsed:.1f}s "
+          f"({ncand * len(algorithms) / elapsed if elapsed else 0:.0f} digests/s), {nhits} hit(s)")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+kdf_cache.py
+
+On-disk cache of derived keys (PBKDF2-HMAC) shared across runs of the offline
+attack scripts. The 10000-iteration PBKDF2 calls dominate wall time, and the
+result only depends on (candidate, kdf, iterations, salt) -- not on the
+ciphertext or the plaintext predicate -- so replays of the same wordlist can
+read them back instead of re-deriving.
+
+Layout (log-structured, one directory):
+  <pid>-<ns>.dat   append-only derived key bytes
+  <pid>-<ns>.idx   fixed 32-byte entries: sha1(lookup key)[20] | offset u64 | length u32
+  <pid>-<ns>.sidx  the same entries sorted by hash, written once the segment is sealed
+
+Each process appends to its own segment pair, so pool workers never contend
+for a file; a segment is rolled once it reaches segment_bytes and is then
+sealed: its .idx is sorted into .sidx. Lookups mmap every .sidx and binary
+search it, so the index lives in the shared page cache instead of a per-process
+dict (which cost ~100+ bytes per entry in every worker). A segment that is still
+being appended to has no .sidx and is not served until it is sealed; a segment
+whose writer died unsealed is sealed by the next process that opens the cache.
+Index entries are written after their data, and entries pointing past the end of
+the .dat are dropped when sealing, so a crash mid-append only loses the last record.
+
+Eviction is by segment: when the directory exceeds max_bytes the oldest
+segments (by mtime) are deleted until it fits again. A process only appends to
+its newest segment, so the newest segment of every pid that is still alive is
+never evicted; its older, rolled segments are fair game.
+
+Usage:
+  cache = KDFCache("kdf_cache", max_bytes=2 << 30)
+  dk = cache.pbkdf2("sha1", candidate, SIG, 10000)
+  cache.flush()
+"""
+import glob, hashlib, mmap, os, struct, time
+
+INDEX_ENTRY = struct.Struct("<20sQI")
+
+def lookup_key(candidate, kdf, iterations, salt):
+    h = hashlib.sha1()
+    h.update(kdf.encode())
+    h.update(struct.pack("<II", iterations, len(salt)))
+    h.update(salt)
+    h.update(candidate)
+    return h.digest()
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def open_segments(segs):
+    """Segments a live process may still be appending to: the newest one per live pid."""
+    newest = {}
+    for seg in segs:
+        pid, _, ns = seg.partition("-")
+        try:
+            key = (int(pid), int(ns))
+        except ValueError:
+            continue
+        if key > newest.get(key[0], (0, -1)):
+            newest[key[0]] = key
+    return {f"{pid}-{ns}" for pid, ns in newest.values() if pid_alive(pid)}
+
+def seal_segment(base):
+    """Write base.sidx: the complete entries of base.idx, sorted by hash (atomically replaced)."""
+    dat_size = os.path.getsize(base + ".dat")
+    with open(base + ".idx", "rb") as f:
+        raw = f.read()
+    size = INDEX_ENTRY.size
+    entries = [raw[i:i + size] for i in range(0, len(raw) - size + 1, size)]
+    entries = sorted(e for e in entries if sum(INDEX_ENTRY.unpack(e)[1:]) <= dat_size)
+    tmp = f"{base}.sidx.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(entries))
+    os.replace(tmp, base + ".sidx")
+
+def search_index(buf, h):
+    """Binary search a sorted .sidx buffer; return (offset, length) of hash h or None."""
+    size = INDEX_ENTRY.size
+    lo, hi = 0, len(buf) // size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if buf[mid * size:mid * size + 20] < h:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(buf) // size and buf[lo * size:lo * size + 20] == h:
+        return INDEX_ENTRY.unpack_from(buf, lo * size)[1:]
+    return None
+
+class KDFCache:
+    def __init__(self, directory, max_bytes=1 << 30, segment_bytes=64 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._indexes = {}           # sealed segment -> mmap of its .sidx
+        self._readers = {}           # segment -> open file
+        self._segment = None         # our own segment name (without extension)
+        self._dat = self._idx = None
+        self._dat_size = 0
+        self.hits = self.misses = 0
+        self.evict()
+        self._load()
+
+    # --- reading ---
+    def _load(self):
+        """Map the .sidx of every sealed segment not mapped yet; seal segments left by dead writers."""
+        idx = glob.glob(os.path.join(self.directory, "*.idx"))
+        segs = {os.path.splitext(os.path.basename(p))[0] for p in idx}
+        in_use = open_segments(segs) | {self._segment}
+        for seg in segs - in_use:
+            base = os.path.join(self.directory, seg)
+            if not os.path.exists(base + ".sidx"):
+                try:
+                    seal_segment(base)
+                except OSError:
+                    continue
+        for path in glob.glob(os.path.join(self.directory, "*.sidx")):
+            seg = os.path.splitext(os.path.basename(path))[0]
+            if seg in self._indexes:
+                continue
+            try:
+                with open(path, "rb") as f:
+                    self._indexes[seg] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                continue             # evicted meanwhile, or empty
+
+    def get(self, candidate, kdf, iterations, salt):
+        h = lookup_key(candidate, kdf, iterations, salt)
+        for seg, buf in self._indexes.items():
+            entry = search_index(buf, h)
+            if entry is not None:
+                break
+        else:
+            return None
+        off, ln = entry
+        try:
+            f = self._readers.get(seg)
+            if f is None:
+                f = self._readers[seg] = open(os.path.join(self.directory, seg + ".dat"), "rb")
+            data = os.pread(f.fileno(), ln, off)
+        except OSError:
+            # segment evicted by another process since we loaded the index
+            return None
+        return data if len(data) == ln else None
+
+    # --- writing ---
+    def _roll(self):
+        self._seal()
+        self._load()                 # pick up segments other processes sealed meanwhile
+        self._segment = f"{os.getpid()}-{time.time_ns()}"
+        base = os.path.join(self.directory, self._segment)
+        self._dat = open(base + ".dat", "ab")
+        self._idx = open(base + ".idx", "ab")
+        self._dat_size = 0
+
+    def put(self, candidate, kdf, iterations, salt, derived):
+        if self._dat is None or self._dat_size >= self.segment_bytes:
+            if self._dat is not None:
+                self.evict()
+            self._roll()
+        h = lookup_key(candidate, kdf, iterations, salt)
+        off = self._dat_size
+        self._dat.write(derived)
+        self._idx.write(INDEX_ENTRY.pack(h, off, len(derived)))
+        self._dat_size += len(derived)
+
+    def pbkdf2(self, kdf, candidate, salt, iterations):
+        """hashlib.pbkdf2_hmac(kdf, candidate, salt, iterations), served from the cache if present."""
+        dk = self.get(candidate, kdf, iterations, salt)
+        if dk is not None:
+            self.hits += 1
+            return dk
+        self.misses += 1
+        dk = hashlib.pbkdf2_hmac(kdf, candidate, salt, iterations)
+        self.put(candidate, kdf, iterations, salt, dk)
+        return dk
+
+    def flush(self):
+        # data before index, so an index entry never points at unwritten bytes
+        if self._dat is not None:
+            self._dat.flush()
+            self._idx.flush()
+
+    def _seal(self):
+        """Close our current segment and write its sorted index."""
+        if self._dat is None:
+            return
+        self.flush()
+        for f in (self._dat, self._idx):
+            f.close()
+        self._dat = self._idx = None
+        seal_segment(os.path.join(self.directory, self._segment))
+        self._segment = None
+
+    def close(self):
+        self._seal()
+        for f in list(self._readers.values()) + list(self._indexes.values()):
+            f.close()
+        self._readers.clear()
+        self._indexes.clear()
+
+    # --- eviction ---
+    def evict(self):
+        """Delete the oldest segments until the cache directory is under max_bytes."""
+        segs = {}
+        for path in glob.glob(os.path.join(self.directory, "*.dat")) + glob.glob(os.path.join(self.directory, "*.idx")) + \
+                glob.glob(os.path.join(self.directory, "*.sidx")):
+            seg = os.path.splitext(os.path.basename(path))[0]
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            size, mtime = segs.get(seg, (0, 0.0))
+            segs[seg] = (size + st.st_size, max(mtime, st.st_mtime))
+        total = sum(size for size, _ in segs.values())
+        in_use = open_segments(segs)
+        for seg, (size, _) in sorted(segs.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            if seg == self._segment or seg in in_use:
+                continue
+            for ext in (".dat", ".idx", ".sidx"):
+                try:
+                    os.remove(os.path.join(self.directory, seg + ext))
+                except OSError:
+                    pass
+            total -= size
+            for f in (self._readers.pop(seg, None), self._indexes.pop(seg, None)):
+                if f is not None:
+                    f.close()
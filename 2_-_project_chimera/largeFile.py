@@ -7,22 +7,40 @@ Usage:
 
 Description:
   - Loads the encrypted blob and signature constants embedded here (from provided files).
-  - Iterates the provided wordlist and generates many candidate keys & derived keys:
+  - Iterates the provided wordlist and generates many candidate keys & derived keys
+    (word mutations come from mutation_rules.py and are de-duplicated across the whole
+    wordlist with a shared Bloom filter; the duplicate rate is printed at the end):
       * raw candidate, hex(candidate), base64(candidate)
       * HMAC-SHA1(SIG, candidate) and HMAC-SHA1(candidate, SIG)
       * SHA1(candidate + SIG), SHA1(SIG + candidate)
       * PBKDF2-HMAC-SHA1(candidate, salt=SIG) with iterations [100,1000,10000]
       * PBKDF2-HMAC-SHA256(candidate, salt=SIG) with iterations [100,1000,10000]
       * Optionally, try candidate@flare-on.com variants (if --domain flag set)
-  - Uses multiprocessing to distribute attempts across workers.
+  - Uses multiprocessing to distribute attempts across workers. The ciphertext and the
+    signature are copied once into multiprocessing.shared_memory; the wordlist is not copied
+    anywhere: every worker maps the file read-only (wordlist_stream.map_wordlist), so all of
+    them share the page cache and /dev/shm never has to hold a multi-GB list. Tasks are plain
+    (start, end) byte ranges (wordlist_stream.byte_ranges) and every worker splits its own
+    slice of the mapping. A finished range is acknowledged with those two integers, only
+    a hit carries data back, and attempt / filter / dedup counters are added to a per-worker
+    row of a shared int64 block that the parent sums when it reports.
+  - Finished ranges, options and per-worker attempt counters are checkpointed to
+    --checkpoint (default attack_state.json); --resume skips work already done.
+  - --kdf-cache DIR stores every PBKDF2 result on disk (kdf_cache.py), so replaying a
+    wordlist with another predicate or ciphertext reads keys back instead of re-deriving.
   - For each derived key, runs RC4 decrypt against the encrypted blob, then tries zlib.decompress.
+    Keys are rejected early on the first 1-2 plaintext bytes (zlib header / printable) via
+    plaintext_filter.FilterPipeline; per-stage hit rates are printed at the end.
   - On a successful decompress (or readable ASCII), prints and stores the result to an output file and exits.
+  - --payload PATH runs signature_solver.py on the payload first: if its signature check is an
+    invertible per-byte transform, the solved input(s) go through the same key derivations and
+    the word-list search only runs when none of them decrypts the blob.
   - Works offline; designed to be run on your machine where you provide the wordlist (rockyou or other). ...
 
 (Full script continues — pasted in full)
 """
-import argparse, binascii, base64, hashlib, hmac, zlib, os, sys, multiprocessing, time
-from multiprocessing import Pool, Manager
+import argparse, binascii, base64, hashlib, hmac, os, sys, multiprocessing, struct, time
+from multiprocessing import Pool, Value, shared_memory
 
 # --- Constants extracted from testing2.py ---
 SIG_HEX = "6d1b40491d416f6540075a465b424c0d4e0a0c53"
@@ -31,68 +49,26 @@ ENC_HEX = "7232622d0d9ef21f70183582cffc9014f14fad235df3e2c04cd0c1650ceaecae1162a
 SIG = binascii.unhexlify(SIG_HEX)
 ENC = binascii.unhexlify(ENC_HEX)
 
-# --- RC4 implementation ---
-def rc4(key: bytes, data: bytes) -> bytes:
-    S = list(range(256))
-    j = 0
-    if not isinstance(key, (bytes, bytearray)):
-        key = key if key is not None else b''
-        key = str(key).encode('utf-8', errors='ignore')
-    key_bytes = key
-    for i in range(256):
-        j = (j + S[i] + key_bytes[i % len(key_bytes)]) & 0xff
-        S[i], S[j] = S[j], S[i]
-    i = j = 0
-    out = bytearray()
-    for b in data:
-        i = (i + 1) & 0xff
-        j = (j + S[i]) & 0xff
-        S[i], S[j] = S[j], S[i]
-        out.append(b ^ S[(S[i] + S[j]) & 0xff])
-    return bytes(out)
+# --- RC4 + early-exit plaintext checks (see rc4_batch.py, plaintext_filter.py) ---
+from plaintext_filter import FilterPipeline
+from wordlist_stream import byte_ranges, split_words, estimate_lines, map_wordlist
+from checkpoint import Checkpoint
+from kdf_cache import KDFCache
+from mutation_rules import CandidateEngine, BloomFilter, DEFAULT_RULES, DOMAIN_RULES, dedup_report
+from signature_solver import solved_inputs
+from marshal_reader import MissingVersion
+
+# Early-exit predicate pipeline: only as many keystream bytes as the cheapest
+# check needs are generated; survivors get the full zlib/printable check.
+PIPELINE = FilterPipeline(ENC)
 
 def try_decrypt_with_key(key_bytes: bytes):
-    dec = rc4(key_bytes, ENC)
-    # try zlib decompress
-    try:
-        plain = zlib.decompress(dec)
-        try:
-            text = plain.decode('utf-8')
-        except Exception:
-            text = repr(plain)
-        return ("zlib_ok", text)
-    except Exception:
-        # also check for printable ASCII
-        if len(dec) > 0 and all(32 <= b < 127 or b in (9,10,13) for b in dec):
-            return ("printable", dec.decode('latin1'))
-        return (None, None)
+    return PIPELINE.run(key_bytes)
 
 # --- Key derivation routines ---
-def derive_candidates_from_word(word: str, domain_variants=True):
-    """Yield raw candidate byte-forms for a given input word (strings)."""
-    ws = set()
-    w = word.strip()
-    if not w:
-        return []
-    ws.add(w)
-    ws.add(w.lower()); ws.add(w.upper()); ws.add(w.title())
-    if domain_variants and "@" not in w:
-        ws.add(w + "@flare-on.com")
-        ws.add(w + "@flareon.com")
-    # leet simple
-    lw = w.replace("a","@").replace("o","0").replace("i","1").replace("e","3").replace("s","5")
-    ws.add(lw)
-    # numeric suffixes common
-    for n in ("1","12","123","2025","42","007"):
-        ws.add(f"{w}{n}"); ws.add(f"{w}_{n}"); ws.add(f"{w}-{n}")
-    # add SHA1/MD5 hex forms
-    try:
-        ws.add(hashlib.sha1(w.encode('utf-8')).hexdigest())
-        ws.add(hashlib.md5(w.encode('utf-8')).hexdigest())
-    except Exception:
-        pass
-    # return as bytes
-    return [s.encode('utf-8') for s in ws]
+# Candidate strings come from mutation_rules.CandidateEngine (hashcat-style rules,
+# DEFAULT_RULES + DOMAIN_RULES reproduce the old per-word variants) with a Bloom
+# filter shared by all workers, so a mutated string is derived only once per run.
 
 def generate_derived_keys(candidate_bytes):
     """Given a candidate in bytes, generate a list of derived key bytes to try."""
@@ -121,11 +97,13 @@ def generate_derived_keys(candidate_bytes):
     res.append(hashlib.sha1(SIG + cb).digest())
     res.append(hashlib.sha1(cb + SIG).hexdigest().encode())
     res.append(hashlib.sha1(SIG + cb).hexdigest().encode())
-    # PBKDF2 variants (small iterations by default, adjustable)
+    # PBKDF2 variants (small iterations by default, adjustable); served from the
+    # on-disk derived-key cache when --kdf-cache is set
+    pbkdf2 = KDF_CACHE.pbkdf2 if KDF_CACHE is not None else hashlib.pbkdf2_hmac
     for iters in (100, 1000, 10000):
         try:
-            res.append(hashlib.pbkdf2_hmac('sha1', cb, SIG, iters))
-            res.append(hashlib.pbkdf2_hmac('sha256', cb, SIG, iters))
+            res.append(pbkdf2('sha1', cb, SIG, iters))
+            res.append(pbkdf2('sha256', cb, SIG, iters))
         except Exception:
             pass
     # dedupe preserving order
@@ -139,101 +117,250 @@ def generate_derived_keys(candidate_bytes):
         seen.add(rr); out.append(rr)
     return out
 
+# --- Shared memory: constants and per-worker counters ---
+CONST_HEADER = struct.Struct("<II")      # len(SIG), len(ENC), then SIG + ENC
+STAT_FIELDS = ["attempts", "generated", "unique"] + \
+              [f"{name}.{k}" for name in FilterPipeline(ENC).stats for k in ("tested", "passed")]
+
+def share_constants(sig, enc):
+    shm = shared_memory.SharedMemory(create=True, size=CONST_HEADER.size + len(sig) + len(enc))
+    CONST_HEADER.pack_into(shm.buf, 0, len(sig), len(enc))
+    shm.buf[CONST_HEADER.size:CONST_HEADER.size + len(sig) + len(enc)] = sig + enc
+    return shm
+
+def sum_stats(stats_shm, slots):
+    """Per-field totals over every worker row of the counter block."""
+    rows = stats_shm.buf.cast("q")
+    nf = len(STAT_FIELDS)
+    return {f: sum(rows[s * nf + k] for s in range(slots)) for k, f in enumerate(STAT_FIELDS)}
+
+# Per-process derived-key cache, opened by init_worker() when --kdf-cache is given
+KDF_CACHE = None
+# Per-process candidate engine attached to the shared dedup filter
+ENGINE = None
+# Per-process read-only mapping of the wordlist and views of the shared blocks, set by init_worker()
+WORDLIST = None
+STATS = None
+STAT_BASE = 0
+_SHM = []
+
+def init_worker(const_name, wordlist_path, stats_name, slot_counter,
+                kdf_cache_dir, kdf_cache_max_bytes, bloom_name, bloom_bits, bloom_hashes, domain_variants):
+    global KDF_CACHE, ENGINE, SIG, ENC, PIPELINE, WORDLIST, STATS, STAT_BASE
+    const, stats = (shared_memory.SharedMemory(name=n) for n in (const_name, stats_name))
+    _SHM.extend((const, stats))
+    nsig, nenc = CONST_HEADER.unpack_from(const.buf, 0)
+    SIG = bytes(const.buf[CONST_HEADER.size:CONST_HEADER.size + nsig])
+    ENC = bytes(const.buf[CONST_HEADER.size + nsig:CONST_HEADER.size + nsig + nenc])
+    PIPELINE = FilterPipeline(ENC)
+    WORDLIST = map_wordlist(wordlist_path)
+    STATS = stats.buf.cast("q")
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    STAT_BASE = slot * len(STAT_FIELDS)
+    if STAT_BASE + len(STAT_FIELDS) > len(STATS):
+        raise RuntimeError("no free counter slot (more worker restarts than expected)")
+    if kdf_cache_dir:
+        KDF_CACHE = KDFCache(kdf_cache_dir, max_bytes=kdf_cache_max_bytes)
+    rules = DEFAULT_RULES + (DOMAIN_RULES if domain_variants else [])
+    if bloom_name is None:
+        ENGINE = CandidateEngine(rules, dedup=False)
+    else:
+        ENGINE = CandidateEngine(rules, bloom=BloomFilter.attach(bloom_name, bloom_bits, bloom_hashes))
+
+def publish_stats(attempts):
+    """Store this worker's running totals in its row of the shared block (one writer per row)."""
+    values = [STATS[STAT_BASE] + attempts, ENGINE.generated, ENGINE.unique] + \
+             [v for tested, passed in PIPELINE.stats.values() for v in (tested, passed)]
+    for k, v in enumerate(values):
+        STATS[STAT_BASE + k] = v
+
 # Worker function for multiprocessing
-def worker_job(args):
-    """Process a chunk of words; returns a success tuple or None."""
-    words_chunk, worker_id, opts = args
+def worker_job(task):
+    """Process one byte range of the shared wordlist; returns a success tuple or (start, end)."""
+    start, end = task
+    words_chunk = split_words(WORDLIST[start:end])
     attempts = 0
     for w in words_chunk:
-        candidates = derive_candidates_from_word(w, domain_variants=opts['domain_variants'])
+        candidates = ENGINE.candidates(w)
         for cand in candidates:
             derived = generate_derived_keys(cand)
             for dk in derived:
                 attempts += 1
                 status, out = try_decrypt_with_key(dk)
                 if status:
-                    return ('found', w, cand, dk, status, out, attempts, worker_id)
-    return ('none', attempts, worker_id)
-
-def chunked_iterable(iterable, n):
-    """Yield successive n-sized chunks from iterable."""
-    chunk = []
-    for item in iterable:
-        chunk.append(item)
-        if len(chunk) >= n:
-            yield chunk
-            chunk = []
-    if chunk:
-        yield chunk
+                    publish_stats(attempts)
+                    return ('found', w, cand, dk, status, out, multiprocessing.current_process().name)
+    if KDF_CACHE is not None:
+        KDF_CACHE.flush()
+    publish_stats(attempts)
+    return (start, end)
+
+def write_result(path, word, cand, dk, status, out):
+    with open(path, 'w', encoding='utf-8') as fout:
+        fout.write("SUCCESS\n")
+        fout.write(f"word={word!r}\n")
+        fout.write(f"candidate_bytes={cand!r}\n")
+        fout.write(f"derived_key={dk!r}\n")
+        fout.write(f"status={status}\n")
+        fout.write("output:\n")
+        fout.write(out)
+
+def try_solved_inputs(payload, version, out_path):
+    """Try keys derived from inputs that invert the payload's signature check; True on success."""
+    try:
+        inputs = solved_inputs(payload, version)
+    except MissingVersion as e:
+        # guessing the version would turn a wrong opcode table into "not invertible"
+        print(f"[!] {e}; pass --payload-version 3.X"); sys.exit(2)
+    if not inputs:
+        decoded = f"CPython {version}" if version else "the version in its pyc header"
+        print(f"[+] {payload}: signature check is not an invertible per-byte transform when decoded as "
+              f"{decoded}; word-list search needed")
+        return False
+    print(f"[+] {payload}: signature check inverted, trying {len(inputs)} solved input(s) before the word list")
+    for inp in inputs:
+        for dk in generate_derived_keys(inp):
+            status, out = try_decrypt_with_key(dk)
+            if status:
+                print(f"[!] SUCCESS with solved input {inp!r}")
+                print("Derived key repr (truncated):", dk[:64])
+                print("Status:", status)
+                print("Output (first 1000 chars):\n", out[:1000])
+                write_result(out_path, inp.decode('latin-1'), inp, dk, status, out)
+                print(f"[+] Result written to {out_path}")
+                return True
+    print("[-] solved input(s) did not decrypt the blob; falling back to the word list")
+    return False
+
+def dedup_capacity(args):
+    """--dedup-capacity, or (estimated wordlist lines) x (rules); None if that does not fit in --dedup-max-mb.
+
+    The filter is never sized below the estimate: an over-full Bloom filter answers "seen"
+    for candidates it has never been given, which would skip them without testing.
+    """
+    capacity = args.dedup_capacity
+    if capacity is None:
+        nrules = len(DEFAULT_RULES) + (len(DOMAIN_RULES) if args.domain_variants else 0)
+        capacity = max(1, estimate_lines(args.wordlist) * nrules)
+    limit = BloomFilter.capacity_for(args.dedup_max_mb << 20, args.dedup_fp_rate)
+    if capacity > limit:
+        print(f"[!] ~{capacity} candidates need more than the {args.dedup_max_mb} MB dedup filter "
+              f"(room for {limit}); dedup disabled, every candidate is tested "
+              f"(raise --dedup-max-mb or lower --dedup-capacity to keep it)")
+        return None
+    return capacity
 
 def main():
     parser = argparse.ArgumentParser(description="Large offline RC4+zlib attack against embedded blob")
-    parser.add_argument("--wordlist", required=True, help="Path to wordlist file (one word per line)")
+    parser.add_argument("--wordlist", default=None, help="Path to wordlist file (one word per line)")
+    parser.add_argument("--payload", default=None, help="pyc / marshal dump whose signature check is solved before the word list")
+    parser.add_argument("--payload-version", default=None, help="CPython version (3.X) of a bare --payload dump (required for one)")
     parser.add_argument("--workers", type=int, default=max(1, multiprocessing.cpu_count()-1), help="Number of worker processes")
-    parser.add_argument("--chunk-size", type=int, default=200, help="Number of words per chunk assigned to worker")
+    parser.add_argument("--chunk-bytes", type=int, default=4096, help="Bytes of wordlist per task (split on line boundaries)")
     parser.add_argument("--domain-variants", action="store_true", help="Try candidate@flare-on.com variants")
     parser.add_argument("--out", default="attack_result.txt", help="File to write success result to")
     parser.add_argument("--max-attempts", type=int, default=0, help="Optional cap on total RC4 attempts (0 = unlimited)")
     parser.add_argument("--mode", choices=['fast','full'], default='full', help="fast = fewer derivations, full = full derivation set")
+    parser.add_argument("--checkpoint", default="attack_state.json", help="State file recording finished wordlist ranges")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="Seconds between checkpoint writes")
+    parser.add_argument("--kdf-cache", default=None, help="Directory of the on-disk PBKDF2 derived-key cache (reused across runs)")
+    parser.add_argument("--kdf-cache-max-mb", type=int, default=1024, help="Size bound of the derived-key cache; oldest segments are evicted")
+    parser.add_argument("--dedup-capacity", type=int, default=None, help="Expected number of distinct candidates (sizes the dedup Bloom filter; default: wordlist lines x rules)")
+    parser.add_argument("--dedup-max-mb", type=int, default=64, help="Size bound of the dedup Bloom filter; if the estimate needs more, dedup is disabled (duplicates are tested, nothing is skipped)")
+    parser.add_argument("--dedup-fp-rate", type=float, default=1e-3, help="Bloom filter false-positive rate (a false positive skips one candidate)")
+    parser.add_argument("--resume", action="store_true", help="Skip ranges already finished in --checkpoint")
     args = parser.parse_args()
 
-    # load wordlist
+    if args.payload and try_solved_inputs(args.payload, args.payload_version, args.out):
+        return
+    if not args.wordlist:
+        parser.error("--wordlist is required unless --payload solves the signature check")
+    # the wordlist is never loaded here: tasks are byte ranges, workers read their own slice
     if not os.path.exists(args.wordlist):
         print("Wordlist not found:", args.wordlist); sys.exit(2)
-    with open(args.wordlist, 'r', encoding='utf-8', errors='ignore') as f:
-        words = [line.strip() for line in f if line.strip()]
-
-    total_words = len(words)
-    print(f"[+] Loaded {total_words} words from {args.wordlist}")
+    size = os.path.getsize(args.wordlist)
+    print(f"[+] Streaming {args.wordlist} ({size} bytes)")
     workers = args.workers
 
-    manager = Manager()
-    pool = Pool(processes=workers)
-    # prepare tasks: split words into chunks
-    chunk_size = args.chunk_size
-    tasks = []
-    for chunk in chunked_iterable(words, chunk_size):
-        tasks.append((chunk, 0, {'domain_variants': args.domain_variants, 'mode': args.mode}))
+    # one Bloom filter in shared memory so every worker dedups against the same set
+    capacity = dedup_capacity(args)
+    bloom = BloomFilter.create(capacity, args.dedup_fp_rate, shared=True) if capacity is not None else None
+    bloom_spec = (bloom.shm.name, bloom.nbits, bloom.nhashes) if bloom is not None else (None, 0, 0)
+    # constants are copied once; workers map them (and the wordlist file) instead of unpickling per task
+    const_shm = share_constants(SIG, ENC)
+    # one counter row per worker process, with headroom for the pool replacing dead workers
+    slots = workers * 2
+    stats_shm = shared_memory.SharedMemory(create=True, size=slots * len(STAT_FIELDS) * 8)
+    stats_shm.buf[:] = bytes(stats_shm.size)
+    pool = Pool(processes=workers, initializer=init_worker,
+                initargs=(const_shm.name, args.wordlist, stats_shm.name, Value("i", 0),
+                          args.kdf_cache, args.kdf_cache_max_mb << 20,
+                          *bloom_spec, args.domain_variants))
+    opts = {'domain_variants': args.domain_variants, 'mode': args.mode}
+    chunk_bytes = args.chunk_bytes
+    # ranges are deterministic for a given chunk size, so it is part of the checkpoint identity
+    cp_opts = dict(opts, chunk_bytes=chunk_bytes)
+    if args.resume and os.path.exists(args.checkpoint):
+        try:
+            cp = Checkpoint.load(args.checkpoint, args.wordlist, cp_opts, args.checkpoint_interval)
+        except ValueError as e:
+            print("Cannot resume:", e); sys.exit(2)
+        print(f"[+] Resuming from {args.checkpoint}: {cp.bytes_done()}/{size} bytes done, "
+              f"{cp.total_attempts()} attempts so far")
+    else:
+        cp = Checkpoint(args.checkpoint, args.wordlist, cp_opts, args.checkpoint_interval)
+    tasks = ((s, e) for s, e in byte_ranges(args.wordlist, chunk_bytes) if not cp.is_done(s, e))
+    run_key = f"run-{os.getpid()}"
 
-    print(f"[+] Dispatching {len(tasks)} tasks to {workers} workers (chunk size {chunk_size})")
+    print(f"[+] Dispatching ~{max(1, size // chunk_bytes)} tasks to {workers} workers (chunk {chunk_bytes} bytes)")
     start = time.time()
     results = pool.imap_unordered(worker_job, tasks)
-    total_attempts = 0
     try:
         for res in results:
-            if res is None: continue
             if res[0] == 'found':
-                # res = ('found', w, cand, dk, status, out, attempts, worker_id)
-                _, word, cand, dk, status, out, attempts, wid = res
-                elapsed = time.time() - start
-                print(f"[!] SUCCESS by worker {wid} on word {word!r} (attempts this worker: {attempts})")
+                # res = ('found', w, cand, dk, status, out, worker_id)
+                _, word, cand, dk, status, out, wid = res
+                print(f"[!] SUCCESS by worker {wid} on word {word!r}")
                 print("Derived key repr (truncated):", dk[:64])
                 print("Status:", status)
                 print("Output (first 1000 chars):\n", out[:1000])
                 # write to output file
-                with open(args.out, 'w', encoding='utf-8') as fout:
-                    fout.write("SUCCESS\n")
-                    fout.write(f"word={word!r}\n")
-                    fout.write(f"candidate_bytes={cand!r}\n")
-                    fout.write(f"derived_key={dk!r}\n")
-                    fout.write(f"status={status}\n")
-                    fout.write("output:\n")
-                    fout.write(out)
+                write_result(args.out, word, cand, dk, status, out)
                 pool.terminate()
                 print(f"[+] Result written to {args.out}")
                 return
-            else:
-                # ('none', attempts, worker_id)
-                total_attempts += res[1] if isinstance(res[1], int) else 0
+            # (start, end): the range is finished, its counters are already in stats_shm
+            cp.mark_done(*res)
+            cp.attempts[run_key] = sum_stats(stats_shm, slots)["attempts"]
+            cp.maybe_save()
     except KeyboardInterrupt:
         print("Interrupted by user; terminating workers...")
         pool.terminate()
     finally:
         pool.close()
         pool.join()
+        totals = sum_stats(stats_shm, slots)
+        stage_stats = FilterPipeline(ENC)
+        stage_stats.merge_stats({name: [totals[f"{name}.tested"], totals[f"{name}.passed"]]
+                                 for name in stage_stats.stats})
+        total_attempts = totals["attempts"]
+        cp.attempts[run_key] = total_attempts
+        if bloom is not None:
+            bloom.close(unlink=True)
+        for shm in (const_shm, stats_shm):
+            shm.close()
+            shm.unlink()
+        cp.save()
+        print(f"[+] Checkpoint written to {args.checkpoint} ({cp.bytes_done()}/{size} bytes done)")
+        if cp.bytes_done() < size:
+            print("    rerun with --resume to continue")
+        print(stage_stats.report())
+        print(dedup_report({"generated": totals["generated"], "unique": totals["unique"]}))
 
     elapsed = time.time() - start
-    print(f"Finished. Total attempts (approx): {total_attempts}. Time elapsed: {elapsed:.1f}s")
+    print(f"Finished. Total attempts (approx): {total_attempts} this run, {cp.total_attempts()} overall. Time elapsed: {elapsed:.1f}s")
     print("No successful decryptions found. You can rerun with different wordlist or options.")
 
 if __name__ == "__main__":
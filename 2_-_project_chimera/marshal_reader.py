@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+marshal_reader.py
+
+Pure-Python marshal reader for code objects written by CPython 3.8 - 3.13.
+
+marshal.loads() only understands the running interpreter's code-object layout,
+so every dump had to be re-processed under a matching python3.X. loads() here
+decodes any of those versions from one process into a neutral Code record:
+
+  - bytes objects (co_code, linetable, exception table, bytes constants) are
+    memoryview slices of the input buffer -- nothing is copied;
+  - strings, ints, floats and containers become the usual Python objects;
+  - nested code objects become Code records as well; localsplusnames keeps the
+    3.11+ fast-locals order that LOAD_FAST / LOAD_DEREF opargs index into.
+
+Code-object field order (see Python/marshal.c, r_object TYPE_CODE):
+  3.8 - 3.10: argcount posonlyargcount kwonlyargcount nlocals stacksize flags (i32)
+              code consts names varnames freevars cellvars filename name
+              firstlineno (i32) lnotab/linetable
+  3.11 - 3.13: argcount posonlyargcount kwonlyargcount stacksize flags (i32)
+              code consts names localsplusnames localspluskinds filename name
+              qualname firstlineno (i32) linetable exceptiontable
+
+The marshal stream itself does not carry a version; pass the one from the pyc
+header (pyc_header.parse_header). detect_layout() can only pick between the two
+layouts from the code header shape, which is not enough to choose an opcode
+table, so load_code() refuses a bare dump without an explicit version.
+
+Usage:
+  hdr, code = load_code("chimera_payload3.pyc")      # native if the version matches, else neutral
+  hdr, code = load_code("decompressed.bin", "3.12")  # bare dumps need the version
+  co = loads(memoryview(data)[16:], version="3.12")
+  python3 marshal_reader.py *.pyc [--consts] [--version 3.X]
+"""
+import struct, sys, types
+from collections import namedtuple
+
+from marshal_scan import FLAG_REF, _header_ok
+
+Code = namedtuple("Code", "version argcount posonlyargcount kwonlyargcount nlocals stacksize flags "
+                          "code consts names varnames freevars cellvars filename name qualname "
+                          "firstlineno linetable exceptiontable localsplusnames")
+
+# localspluskinds bits (Include/internal/pycore_code.h)
+CO_FAST_LOCAL = 0x20
+CO_FAST_CELL = 0x40
+CO_FAST_FREE = 0x80
+
+class MissingVersion(ValueError):
+    """A bare marshal dump was given without the CPython version it was written by."""
+
+_NULL = object()        # TYPE_NULL, terminates dicts
+
+SUPPORTED = ("3.8", "3.9", "3.10", "3.11", "3.12", "3.13")
+LAYOUT_FAMILIES = {"3.8": "CPython 3.8-3.10", "3.11": "CPython 3.11-3.13"}
+
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+def detect_layout(buf, pos=0):
+    """Return "3.11" or "3.8" for the code-object header at buf[pos], or None."""
+    mv = memoryview(buf)
+    if _header_ok(mv, pos, 5):
+        return "3.11"
+    if _header_ok(mv, pos, 6):
+        return "3.8"
+    return None
+
+class _Reader:
+    def __init__(self, mv, version):
+        self.mv = mv
+        self.pos = 0
+        self.refs = []
+        self.new_layout = tuple(int(x) for x in version.split(".")) >= (3, 11)
+        self.version = version
+
+    def need(self, n):
+        if self.pos + n > len(self.mv):
+            raise EOFError(f"marshal data too short at {self.pos} (need {n} bytes)")
+
+    def byte(self):
+        self.need(1)
+        b = self.mv[self.pos]
+        self.pos += 1
+        return b
+
+    def i32(self):
+        self.need(4)
+        (v,) = _I32.unpack_from(self.mv, self.pos)
+        self.pos += 4
+        return v
+
+    def raw(self, n):
+        if n < 0:
+            raise ValueError(f"negative size {n} at {self.pos}")
+        self.need(n)
+        v = self.mv[self.pos:self.pos + n]
+        self.pos += n
+        return v
+
+    def ref(self, flag, obj):
+        if flag:
+            self.refs.append(obj)
+        return obj
+
+    def reserve(self, flag):
+        if not flag:
+            return None
+        self.refs.append(None)
+        return len(self.refs) - 1
+
+    def fill(self, idx, obj):
+        if idx is not None:
+            self.refs[idx] = obj
+        return obj
+
+    def obj(self):
+        code = self.byte()
+        flag = code & FLAG_REF
+        t = chr(code & ~FLAG_REF)
+        if t == "0": return _NULL
+        if t == "N": return None
+        if t == "F": return False
+        if t == "T": return True
+        if t == ".": return Ellipsis
+        if t == "S": return StopIteration
+        if t == "i": return self.ref(flag, self.i32())
+        if t == "I":
+            self.need(8)
+            (v,) = _I64.unpack_from(self.mv, self.pos)
+            self.pos += 8
+            return self.ref(flag, v)
+        if t == "l":
+            n = self.i32()
+            digits = struct.unpack_from(f"<{abs(n)}H", self.raw(2 * abs(n)))
+            v = 0
+            for d in reversed(digits):
+                v = (v << 15) | d
+            return self.ref(flag, -v if n < 0 else v)
+        if t == "g":
+            (v,) = _F64.unpack_from(self.raw(8))
+            return self.ref(flag, v)
+        if t == "f":
+            return self.ref(flag, float(str(self.raw(self.byte()), "ascii")))
+        if t == "y":
+            re_, im = struct.unpack_from("<dd", self.raw(16))
+            return self.ref(flag, complex(re_, im))
+        if t == "x":
+            re_ = float(str(self.raw(self.byte()), "ascii"))
+            im = float(str(self.raw(self.byte()), "ascii"))
+            return self.ref(flag, complex(re_, im))
+        if t == "s":
+            return self.ref(flag, self.raw(self.i32()))
+        if t in "tu":
+            return self.ref(flag, str(self.raw(self.i32()), "utf-8", "surrogatepass"))
+        if t in "aA":
+            return self.ref(flag, str(self.raw(self.i32()), "latin-1"))
+        if t in "zZ":
+            return self.ref(flag, str(self.raw(self.byte()), "latin-1"))
+        if t in ")(":
+            n = self.byte() if t == ")" else self.i32()
+            idx = self.reserve(flag)
+            return self.fill(idx, tuple(self.obj() for _ in range(n)))
+        if t == "[":
+            n = self.i32()
+            lst = self.ref(flag, [])
+            lst.extend(self.obj() for _ in range(n))
+            return lst
+        if t == "{":
+            d = self.ref(flag, {})
+            while True:
+                k = self.obj()
+                if k is _NULL:
+                    return d
+                d[k] = self.obj()
+        if t in "<>":
+            n = self.i32()
+            if t == "<":
+                s = self.ref(flag, set())
+                s.update(self.obj() for _ in range(n))
+                return s
+            idx = self.reserve(flag) if n else None
+            v = frozenset(self.obj() for _ in range(n))
+            return self.fill(idx, v) if n else self.ref(flag, v)
+        if t == "r":
+            n = self.i32()
+            if not 0 <= n < len(self.refs) or self.refs[n] is None:
+                raise ValueError(f"bad back-reference {n} at {self.pos - 4}")
+            return self.refs[n]
+        if t == "c":
+            idx = self.reserve(flag)
+            return self.fill(idx, self.code())
+        raise ValueError(f"unknown marshal type {code:#04x} at {self.pos - 1}")
+
+    def code(self):
+        if self.new_layout:
+            argcount, posonly, kwonly, stacksize, flags = (self.i32() for _ in range(5))
+            co_code, consts, names = self.obj(), self.obj(), self.obj()
+            lp_names, lp_kinds = self.obj(), self.obj()
+            filename, name, qualname = self.obj(), self.obj(), self.obj()
+            firstlineno = self.i32()
+            linetable, exctable = self.obj(), self.obj()
+            kinds = bytes(lp_kinds)
+            varnames = tuple(n for n, k in zip(lp_names, kinds) if k & CO_FAST_LOCAL)
+            cellvars = tuple(n for n, k in zip(lp_names, kinds) if k & CO_FAST_CELL)
+            freevars = tuple(n for n, k in zip(lp_names, kinds) if k & CO_FAST_FREE)
+            nlocals = len(varnames)
+        else:
+            argcount, posonly, kwonly, nlocals, stacksize, flags = (self.i32() for _ in range(6))
+            co_code, consts, names, varnames = self.obj(), self.obj(), self.obj(), self.obj()
+            freevars, cellvars = self.obj(), self.obj()
+            filename, name = self.obj(), self.obj()
+            qualname = name
+            firstlineno = self.i32()
+            linetable, exctable = self.obj(), None
+            lp_names = None
+        return Code(self.version, argcount, posonly, kwonly, nlocals, stacksize, flags,
+                    co_code, consts, names, varnames, freevars, cellvars, filename, name,
+                    qualname, firstlineno, linetable, exctable, lp_names)
+
+def loads(buf, version=None):
+    """Decode one marshalled object from buf (bytes, mmap or memoryview) without copying bytes.
+
+    version is a "3.X" string (3.8 - 3.13); None guesses the layout from the first
+    code header, which only tells 3.8-3.10 apart from 3.11-3.13.
+    """
+    mv = memoryview(buf)
+    if version is None:
+        version = detect_layout(mv, 0)
+        if version is None:
+            raise ValueError("cannot detect code-object layout; pass version=")
+    if version not in SUPPORTED:
+        raise ValueError(f"unsupported marshal version {version} (supported: {', '.join(SUPPORTED)})")
+    return _Reader(mv, version).obj()
+
+def from_native(co):
+    """Return the neutral Code record for a code object of the running interpreter."""
+    import marshal
+    return loads(marshal.dumps(co), f"{sys.version_info[0]}.{sys.version_info[1]}")
+
+def bare_layouts(buf):
+    """Return the layouts ("3.8" for 3.8-3.10, "3.11" for 3.11-3.13) that decode all of buf."""
+    ok = []
+    for layout in ("3.8", "3.11"):
+        try:
+            loads(buf, layout)
+        except (EOFError, ValueError, TypeError, IndexError, struct.error):
+            continue
+        ok.append(layout)
+    return ok
+
+def load_code(path, version=None):
+    """Return (PycHeader, code) for a pyc or bare marshal dump of any supported version.
+
+    code is a native code object when the pyc matches the running interpreter and a
+    neutral Code record otherwise. version ("3.X") is used for bare dumps, which
+    carry no magic; the pyc header wins when there is one.
+
+    A bare dump without version raises MissingVersion (a ValueError): the marshal stream only tells the
+    3.8-3.10 layout from the 3.11-3.13 one, and the versions inside a layout decode
+    to the same record with different opcode tables (marshal.loads() under 3.11
+    happily loads a 3.12 dump and returns a wrong co_code).
+    """
+    from pyc_header import load_pyc, map_pyc, parse_header
+    with open(path, "rb") as f:
+        hdr = parse_header(f.read(17))
+    if hdr.version is None:
+        if version is None:
+            fits = bare_layouts(map_pyc(path)[1])
+            guess = " or ".join(LAYOUT_FAMILIES[l] for l in fits) or "no supported layout"
+            raise MissingVersion(f"{path} is a bare marshal dump with no version (decodes as {guess})")
+        if version not in SUPPORTED:
+            raise ValueError(f"unsupported marshal version {version} (supported: {', '.join(SUPPORTED)})")
+        hdr = hdr._replace(version=version)
+    running = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    if hdr.version == running:
+        return hdr, load_pyc(path, force=True)[1]
+    return hdr, loads(map_pyc(path)[1], hdr.version)
+
+def iter_code(co):
+    """Yield co and every nested code object (native or Code), depth first."""
+    stack = [co]
+    while stack:
+        c = stack.pop()
+        yield c
+        consts = c.co_consts if isinstance(c, types.CodeType) else c.consts
+        stack.extend(k for k in reversed(consts) if isinstance(k, (types.CodeType, Code)))
+
+if __name__ == "__main__":
+    import argparse, glob, time
+    p = argparse.ArgumentParser(description="Decode pyc / marshal dumps of any CPython 3.8-3.13 version")
+    p.add_argument("files", nargs="+", help="pyc files or glob patterns")
+    p.add_argument("--consts", action="store_true", help="list the constants of every code object")
+    p.add_argument("--version", default=None, help="CPython version (3.X) of bare marshal dumps")
+    args = p.parse_args()
+    paths = [m for pat in args.files for m in (sorted(glob.glob(pat)) or [pat])]
+    start = time.time()
+    for path in paths:
+        try:
+            hdr, co = load_code(path, args.version)
+        except MissingVersion as e:
+            print(f"{path}: error: {e}; pass --version 3.X")
+            continue
+        except Exception as e:
+            print(f"{path}: error: {e}")
+            continue
+        codes = list(iter_code(co))
+        kind = "native" if isinstance(co, types.CodeType) else f"neutral {co.version}"
+        print(f"{path}: {hdr.layout}, {kind}, {len(codes)} code object(s)")
+        if args.consts:
+            for c in codes:
+                if isinstance(c, types.CodeType):
+                    name, consts = c.co_qualname if hasattr(c, "co_qualname") else c.co_name, c.co_consts
+                else:
+                    name, consts = c.qualname, c.consts
+                shown = [bytes(k) if isinstance(k, memoryview) else k for k in consts
+                         if not isinstance(k, (types.CodeType, Code))]
+                print(f"  {name}: {shown!r}"[:200])
+    print(f"[+] {len(paths)} file(s) in {(time.time() - start) * 1000:.1f} ms")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+marshal_scan.py
+
+Fast locator for marshalled code objects inside an arbitrary blob.
+
+deep_scan_marshal.py used to call marshal.loads(combo[offset:]) for every offset,
+which copies the tail of the buffer and raises for almost every position --
+quadratic in blob size. Here we:
+
+  1. jump between TYPE_CODE tag bytes with bytes.find() ('c' = 0x63, or 0xe3 when
+     FLAG_REF 0x80 is set), which runs at memchr speed;
+  2. validate the fixed code-object header in place with struct.unpack_from over
+     a memoryview (no slicing, no copies): sane argcounts / stacksize / flags and a
+     following bytes object ('s' / 0xf3) whose length fits in the buffer and is even;
+  3. only then call marshal.loads() on a zero-copy memoryview slice.
+
+marshal_extent() walks a whole marshalled object structurally (no objects are
+built) and tells "needs more bytes" (Truncated) apart from "not marshal data"
+(ValueError); blob_assembler.py uses it to order chunks without permutations.
+
+Header layouts (all little-endian int32):
+  3.11+   : argcount, posonlyargcount, kwonlyargcount, stacksize, flags, then co_code
+  3.8-3.10: argcount, posonlyargcount, kwonlyargcount, nlocals, stacksize, flags, then co_code
+
+Usage:
+  python3 marshal_scan.py decompressed.bin [--all] [--limit N]
+"""
+import argparse, marshal, struct, time, types
+
+TYPE_CODE = 0x63
+FLAG_REF = 0x80
+TYPE_STRING = 0x73        # 's' -> bytes object (co_code)
+CODE_TAGS = (bytes([TYPE_CODE]), bytes([TYPE_CODE | FLAG_REF]))
+
+_I32 = struct.Struct("<i")
+MAX_ARGS = 255
+MAX_STACK = 1 << 16
+MAX_FLAGS = 1 << 27
+
+def _header_ok(mv, pos, nints, check_len=True):
+    """Check the nints-int header at mv[pos+1:] followed by a plausible co_code bytes object.
+
+    With check_len=False the co_code length is not required to fit in the buffer
+    (used when walking a stream that may still be truncated)."""
+    end = len(mv)
+    body = pos + 1
+    if body + 4 * nints + 5 > end:
+        return False
+    vals = struct.unpack_from(f"<{nints}i", mv, body)
+    argcount, posonly, kwonly = vals[0], vals[1], vals[2]
+    stacksize, flags = vals[-2], vals[-1]
+    if not (0 <= argcount <= MAX_ARGS and 0 <= posonly <= argcount and 0 <= kwonly <= MAX_ARGS):
+        return False
+    if not (0 <= stacksize <= MAX_STACK and 0 <= flags < MAX_FLAGS):
+        return False
+    if nints == 6 and not (0 <= vals[3] <= 1 << 16):     # nlocals
+        return False
+    tag_pos = body + 4 * nints
+    if mv[tag_pos] & ~FLAG_REF != TYPE_STRING:
+        return False
+    (n,) = _I32.unpack_from(mv, tag_pos + 1)
+    return 0 < n and n % 2 == 0 and (not check_len or n <= end - tag_pos - 5)
+
+class Truncated(Exception):
+    """The marshal stream was well-formed up to the end of the buffer but needs more bytes."""
+
+# code-object layouts: number of leading int32 fields, then the object/int fields in order
+CODE_LAYOUTS = {
+    "3.11": (5, ("o", "o", "o", "o", "o", "o", "o", "o", "i", "o", "o")),
+    "3.8":  (6, ("o", "o", "o", "o", "o", "o", "o", "o", "i", "o")),
+}
+
+def marshal_extent(data, pos=0, layout="3.11"):
+    """Walk one marshalled object starting at data[pos] without building it.
+
+    Returns the offset just past the object. Raises Truncated if the object runs
+    past the end of the buffer and ValueError if the bytes cannot be marshal data
+    (unknown tag, negative size, bad back-reference, invalid UTF-8, ...).
+    """
+    mv = memoryview(data)
+    end = len(mv)
+    nints, fields = CODE_LAYOUTS[layout]
+    nrefs = 0
+
+    def need(p, n):
+        if p + n > end:
+            raise Truncated(p + n)
+
+    def size_at(p):
+        need(p, 4)
+        (n,) = _I32.unpack_from(mv, p)
+        if n < 0:
+            raise ValueError(f"negative size {n} at {p}")
+        return n
+
+    def walk(p, depth=0):
+        nonlocal nrefs
+        if depth > 200:
+            raise ValueError("nesting too deep")
+        need(p, 1)
+        code = mv[p]
+        tag = code & ~FLAG_REF
+        if code & FLAG_REF:
+            nrefs += 1
+        p += 1
+        if tag in b"0NFTS.":
+            return p
+        if tag == ord("i"):
+            need(p, 4); return p + 4
+        if tag == ord("g"):
+            need(p, 8); return p + 8
+        if tag == ord("y"):
+            need(p, 16); return p + 16
+        if tag == ord("l"):
+            need(p, 4)
+            (n,) = _I32.unpack_from(mv, p)
+            need(p + 4, 2 * abs(n)); return p + 4 + 2 * abs(n)
+        if tag in b"fx":
+            parts = 1 if tag == ord("f") else 2
+            for _ in range(parts):
+                need(p, 1); p += 1 + mv[p]; need(p, 0)
+            return p
+        if tag in b"stuaA":
+            n = size_at(p)
+            need(p + 4, n)
+            if tag == ord("u"):
+                try:
+                    str(mv[p + 4:p + 4 + n], "utf-8", "surrogatepass")
+                except UnicodeDecodeError:
+                    raise ValueError(f"invalid utf-8 string at {p}") from None
+            return p + 4 + n
+        if tag in b"zZ":
+            need(p, 1)
+            n = mv[p]
+            need(p + 1, n); return p + 1 + n
+        if tag == ord(")"):
+            need(p, 1)
+            n, p = mv[p], p + 1
+            for _ in range(n):
+                p = walk(p, depth + 1)
+            return p
+        if tag in b"([<>":
+            n = size_at(p); p += 4
+            for _ in range(n):
+                p = walk(p, depth + 1)
+            return p
+        if tag == ord("{"):
+            while True:
+                need(p, 1)
+                if mv[p] == ord("0"):
+                    return p + 1
+                p = walk(walk(p, depth + 1), depth + 1)
+        if tag == ord("r"):
+            n = size_at(p)
+            if n >= nrefs:
+                raise ValueError(f"back-reference {n} to unknown object at {p}")
+            return p + 4
+        if tag == TYPE_CODE:
+            need(p, 4 * nints)
+            if p + 4 * nints + 5 <= end and not _header_ok(mv, p - 1, nints, check_len=False):
+                raise ValueError(f"implausible code header at {p - 1}")
+            p += 4 * nints
+            for kind in fields:
+                if kind == "i":
+                    need(p, 4); p += 4
+                else:
+                    p = walk(p, depth + 1)
+            return p
+        raise ValueError(f"unknown marshal tag {code:#04x} at {p - 1}")
+
+    return walk(pos)
+
+def candidate_offsets(data, start=0, stop=None):
+    """Yield offsets in [start, stop) whose bytes look like the start of a marshalled code object.
+
+    `data` may be bytes, bytearray or an mmap; the header may extend past `stop`.
+    """
+    with memoryview(data) as mv:
+        raw = data if hasattr(data, "find") else bytes(mv)
+        stop = len(mv) if stop is None else min(stop, len(mv))
+        for tag in CODE_TAGS:
+            pos = raw.find(tag, start, stop)
+            while pos >= 0:
+                if _header_ok(mv, pos, 5) or _header_ok(mv, pos, 6):
+                    yield pos
+                pos = raw.find(tag, pos + 1, stop)
+
+def find_code_objects(data, first_only=True, limit=None, start=0):
+    """Return [(offset, code_object)] for offsets in [start, limit) that marshal.loads() accepts as a code object."""
+    found = []
+    with memoryview(data) as mv:
+        for off in sorted(candidate_offsets(data, start, limit)):
+            try:
+                obj = marshal.loads(mv[off:])
+            except Exception:
+                continue
+            if isinstance(obj, types.CodeType):
+                found.append((off, obj))
+                if first_only:
+                    break
+    return found
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Locate marshalled code objects in a blob")
+    p.add_argument("blob", help="file to scan")
+    p.add_argument("--all", action="store_true", help="report every loadable code object, not just the first")
+    p.add_argument("--limit", type=int, default=None, help="only consider offsets below this")
+    args = p.parse_args()
+    with open(args.blob, "rb") as f:
+        data = f.read()
+    start = time.time()
+    cands = list(candidate_offsets(data))
+    hits = find_code_objects(data, first_only=not args.all, limit=args.limit)
+    elapsed = time.time() - start
+    print(f"[+] {len(data)} bytes, {len(cands)} plausible header(s), scanned in {elapsed * 1000:.1f} ms")
+    for off, co in hits:
+        print(f"  offset {off}: {co!r}")
+    if not hits:
+        print("  no loadable code object found")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+mutation_rules.py
+
+Rule-driven candidate generation with global de-duplication.
+
+derive_candidates_from_word() (largeFile.py) and generate_variants() (testing65.py)
+only dedup inside one word, but across a wordlist the same strings come back over
+and over ("Password" -> lower -> "password", which is also its own line), and every
+repeat pays the full derivation + RC4 cost. CandidateEngine applies a list of
+hashcat-style rules to every word and drops anything already emitted, using a
+Bloom filter so memory stays fixed regardless of wordlist size.
+
+Rule syntax (subset of hashcat, ops applied left to right, spaces ignored):
+  :      no-op                      l   lowercase          u   uppercase
+  c      capitalize (rest lower)    E   title case         t   toggle case
+  r      reverse                    d   duplicate          $X  append char X
+  ^X     prepend char X             sXY replace X with Y   @X  purge char X
+  !X     reject word if it contains X
+  Local extensions (not in hashcat):
+  H      sha1 hexdigest             M   md5 hexdigest
+Rules whose output equals "" are skipped.
+
+The Bloom filter can live in multiprocessing.shared_memory so all pool workers
+dedup against one set. Concurrent bit writes can race and lose a bit, which only
+means an occasional duplicate gets through -- never a dropped unique candidate
+beyond the configured false-positive rate.
+"""
+import hashlib, math
+from multiprocessing import shared_memory
+
+# Rules equivalent to the old derive_candidates_from_word()
+DEFAULT_RULES = [
+    ":", "l", "u", "E",
+    "sa@ so0 si1 se3 ss5",
+] + [
+    sep + "".join("$" + ch for ch in n)
+    for n in ("1", "12", "123", "2025", "42", "007")
+    for sep in ("", "$_", "$-")
+] + ["H", "M"]
+
+DOMAIN_RULES = [
+    "!@" + "".join("$" + ch for ch in "@flare-on.com"),
+    "!@" + "".join("$" + ch for ch in "@flareon.com"),
+]
+
+def parse_rule(rule):
+    """Split a rule string into (op, args) tuples; raises ValueError on bad syntax."""
+    ops = []
+    i = 0
+    s = rule.replace(" ", "")
+    nargs = {":": 0, "l": 0, "u": 0, "c": 0, "E": 0, "t": 0, "r": 0, "d": 0,
+             "H": 0, "M": 0, "$": 1, "^": 1, "@": 1, "!": 1, "s": 2}
+    while i < len(s):
+        op = s[i]
+        if op not in nargs:
+            raise ValueError(f"unknown rule op {op!r} in {rule!r}")
+        n = nargs[op]
+        if i + 1 + n > len(s):
+            raise ValueError(f"rule op {op!r} needs {n} argument(s) in {rule!r}")
+        ops.append((op, s[i + 1:i + 1 + n]))
+        i += 1 + n
+    return ops
+
+def apply_rule(ops, w):
+    for op, a in ops:
+        if op == ":":   pass
+        elif op == "l": w = w.lower()
+        elif op == "u": w = w.upper()
+        elif op == "c": w = w.capitalize()
+        elif op == "E": w = w.title()
+        elif op == "t": w = w.swapcase()
+        elif op == "r": w = w[::-1]
+        elif op == "d": w = w + w
+        elif op == "$": w = w + a
+        elif op == "^": w = a + w
+        elif op == "s": w = w.replace(a[0], a[1])
+        elif op == "@": w = w.replace(a, "")
+        elif op == "!":
+            if a in w:
+                return ""
+        elif op == "H": w = hashlib.sha1(w.encode("utf-8")).hexdigest()
+        elif op == "M": w = hashlib.md5(w.encode("utf-8")).hexdigest()
+    return w
+
+class BloomFilter:
+    """Fixed-size Bloom filter over bytes, optionally backed by shared memory."""
+
+    def __init__(self, nbits, nhashes, buf=None, shm=None):
+        self.nbits = nbits
+        self.nhashes = nhashes
+        self.bits = buf if buf is not None else bytearray((nbits + 7) // 8)
+        self.shm = shm
+
+    @staticmethod
+    def size_for(capacity, fp_rate):
+        nbits = max(64, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        nhashes = max(1, round(nbits / capacity * math.log(2)))
+        return nbits, nhashes
+
+    @staticmethod
+    def capacity_for(nbytes, fp_rate):
+        """Largest capacity whose filter fits in nbytes at fp_rate."""
+        return max(1, int(nbytes * 8 * (math.log(2) ** 2) / -math.log(fp_rate)))
+
+    @classmethod
+    def create(cls, capacity, fp_rate=1e-3, shared=False):
+        nbits, nhashes = cls.size_for(capacity, fp_rate)
+        if not shared:
+            return cls(nbits, nhashes)
+        # a new block is zero-filled by the OS, i.e. already an empty filter
+        shm = shared_memory.SharedMemory(create=True, size=(nbits + 7) // 8)
+        return cls(nbits, nhashes, shm.buf, shm)
+
+    @classmethod
+    def attach(cls, name, nbits, nhashes):
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(nbits, nhashes, shm.buf, shm)
+
+    def _positions(self, item):
+        d = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        m = self.nbits
+        return [(h1 + i * h2) % m for i in range(self.nhashes)]
+
+    def add(self, item):
+        """Insert item; returns True if it was (probably) already present."""
+        bits = self.bits
+        present = True
+        for p in self._positions(item):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def close(self, unlink=False):
+        if self.shm is not None:
+            self.bits = None
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+            self.shm = None
+
+class CandidateEngine:
+    def __init__(self, rules=DEFAULT_RULES, bloom=None, capacity=10_000_000, fp_rate=1e-3, dedup=True):
+        self.rules = [parse_rule(r) for r in rules]
+        # dedup=False passes every rule output through (no filter at all)
+        self.bloom = None
+        if dedup:
+            self.bloom = bloom if bloom is not None else BloomFilter.create(capacity, fp_rate)
+        self.generated = 0
+        self.unique = 0
+
+    def candidates(self, word):
+        """Return the not-yet-seen rule outputs for one word, as bytes."""
+        w = word.strip()
+        out = []
+        if not w:
+            return out
+        for ops in self.rules:
+            c = apply_rule(ops, w)
+            if not c:
+                continue
+            cb = c.encode("utf-8")
+            self.generated += 1
+            if self.bloom is None or not self.bloom.add(cb):
+                self.unique += 1
+                out.append(cb)
+        return out
+
+    def run(self, words):
+        """Yield (word, candidate_bytes) over a whole word iterable with global dedup."""
+        for w in words:
+            for cb in self.candidates(w):
+                yield w, cb
+
+    def stats(self):
+        return {"generated": self.generated, "unique": self.unique}
+
+def dedup_report(stats):
+    gen, uniq = stats.get("generated", 0), stats.get("unique", 0)
+    rate = 100.0 * (gen - uniq) / gen if gen else 0.0
+    return f"candidates generated={gen} unique={uniq} duplicates removed={gen - uniq} ({rate:.2f}%)"
+
+if __name__ == "__main__":
+    import argparse, sys
+    p = argparse.ArgumentParser(description="Apply mutation rules to a wordlist with global dedup")
+    p.add_argument("wordlist")
+    p.add_argument("--rules", help="rule file (one rule per line); default: built-in rules")
+    p.add_argument("--domain-variants", action="store_true")
+    p.add_argument("--capacity", type=int, default=10_000_000)
+    args = p.parse_args()
+    rules = list(DEFAULT_RULES)
+    if args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            rules = [ln.rstrip("\n") for ln in f if ln.strip() and not ln.startswith("#")]
+    if args.domain_variants:
+        rules += DOMAIN_RULES
+    eng = CandidateEngine(rules, capacity=args.capacity)
+    out = sys.stdout.buffer
+    with open(args.wordlist, "r", encoding="utf-8", errors="ignore") as f:
+        for _, cb in eng.run(f):
+            out.write(cb + b"\n")
+    print(dedup_report(eng.stats()), file=sys.stderr)
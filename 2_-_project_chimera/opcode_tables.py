@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+opcode_tables.py
+
+Per-version CPython opcode tables (3.8 - 3.13) for decompile.py, so bytecode of
+any of those versions can be disassembled from one interpreter. The data below
+is generated from each interpreter's own `opcode` module; regenerate an entry with
+
+  python3.X opcode_tables.py
+
+and paste the printed dict into TABLES. Marshalled code only ever contains the
+base (non-specialized) opcodes, so specializations are not listed.
+
+Per version:
+  opnames       space separated names indexed by opcode ("-" = unused)
+  caches        number of inline CACHE code units after the instruction (3.11+)
+  extended_arg  EXTENDED_ARG opcode
+  hasarg, jrel, jabs, const, name, local, free, compare   opcode name sets
+  cmp_op        COMPARE_OP operator names
+"""
+from collections import namedtuple
+
+TABLES = {
+    "3.8": dict(
+        opnames=(
+            '- POP_TOP ROT_TWO ROT_THREE DUP_TOP DUP_TOP_TWO ROT_FOUR - - NOP UNARY_POSITIVE UNARY_NEGATIVE '
+            'UNARY_NOT - - UNARY_INVERT BINARY_MATRIX_MULTIPLY INPLACE_MATRIX_MULTIPLY - BINARY_POWER '
+            'BINARY_MULTIPLY - BINARY_MODULO BINARY_ADD BINARY_SUBTRACT BINARY_SUBSCR BINARY_FLOOR_DIVIDE '
+            'BINARY_TRUE_DIVIDE INPLACE_FLOOR_DIVIDE INPLACE_TRUE_DIVIDE - - - - - - - - - - - - - - - - - - '
+            '- - GET_AITER GET_ANEXT BEFORE_ASYNC_WITH BEGIN_FINALLY END_ASYNC_FOR INPLACE_ADD '
+            'INPLACE_SUBTRACT INPLACE_MULTIPLY - INPLACE_MODULO STORE_SUBSCR DELETE_SUBSCR BINARY_LSHIFT '
+            'BINARY_RSHIFT BINARY_AND BINARY_XOR BINARY_OR INPLACE_POWER GET_ITER GET_YIELD_FROM_ITER '
+            'PRINT_EXPR LOAD_BUILD_CLASS YIELD_FROM GET_AWAITABLE - INPLACE_LSHIFT INPLACE_RSHIFT INPLACE_AND '
+            'INPLACE_XOR INPLACE_OR - WITH_CLEANUP_START WITH_CLEANUP_FINISH RETURN_VALUE IMPORT_STAR '
+            'SETUP_ANNOTATIONS YIELD_VALUE POP_BLOCK END_FINALLY POP_EXCEPT STORE_NAME DELETE_NAME '
+            'UNPACK_SEQUENCE FOR_ITER UNPACK_EX STORE_ATTR DELETE_ATTR STORE_GLOBAL DELETE_GLOBAL - '
+            'LOAD_CONST LOAD_NAME BUILD_TUPLE BUILD_LIST BUILD_SET BUILD_MAP LOAD_ATTR COMPARE_OP IMPORT_NAME '
+            'IMPORT_FROM JUMP_FORWARD JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP JUMP_ABSOLUTE '
+            'POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE LOAD_GLOBAL - - - - - SETUP_FINALLY - LOAD_FAST STORE_FAST '
+            'DELETE_FAST - - - RAISE_VARARGS CALL_FUNCTION MAKE_FUNCTION BUILD_SLICE - LOAD_CLOSURE '
+            'LOAD_DEREF STORE_DEREF DELETE_DEREF - - CALL_FUNCTION_KW CALL_FUNCTION_EX SETUP_WITH '
+            'EXTENDED_ARG LIST_APPEND SET_ADD MAP_ADD LOAD_CLASSDEREF BUILD_LIST_UNPACK BUILD_MAP_UNPACK '
+            'BUILD_MAP_UNPACK_WITH_CALL BUILD_TUPLE_UNPACK BUILD_SET_UNPACK SETUP_ASYNC_WITH FORMAT_VALUE '
+            'BUILD_CONST_KEY_MAP BUILD_STRING BUILD_TUPLE_UNPACK_WITH_CALL - LOAD_METHOD CALL_METHOD '
+            'CALL_FINALLY POP_FINALLY '
+        ),
+        caches={},
+        extended_arg=144,
+        hasarg=(
+            'BUILD_CONST_KEY_MAP BUILD_LIST BUILD_LIST_UNPACK BUILD_MAP BUILD_MAP_UNPACK '
+            'BUILD_MAP_UNPACK_WITH_CALL BUILD_SET BUILD_SET_UNPACK BUILD_SLICE BUILD_STRING BUILD_TUPLE '
+            'BUILD_TUPLE_UNPACK BUILD_TUPLE_UNPACK_WITH_CALL CALL_FINALLY CALL_FUNCTION CALL_FUNCTION_EX '
+            'CALL_FUNCTION_KW CALL_METHOD COMPARE_OP DELETE_ATTR DELETE_DEREF DELETE_FAST DELETE_GLOBAL '
+            'DELETE_NAME EXTENDED_ARG FORMAT_VALUE FOR_ITER IMPORT_FROM IMPORT_NAME JUMP_ABSOLUTE '
+            'JUMP_FORWARD JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP LIST_APPEND LOAD_ATTR LOAD_CLASSDEREF '
+            'LOAD_CLOSURE LOAD_CONST LOAD_DEREF LOAD_FAST LOAD_GLOBAL LOAD_METHOD LOAD_NAME MAKE_FUNCTION '
+            'MAP_ADD POP_FINALLY POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE RAISE_VARARGS SETUP_ASYNC_WITH '
+            'SETUP_FINALLY SETUP_WITH SET_ADD STORE_ATTR STORE_DEREF STORE_FAST STORE_GLOBAL STORE_NAME '
+            'UNPACK_EX UNPACK_SEQUENCE '
+        ),
+        jrel='CALL_FINALLY FOR_ITER JUMP_FORWARD SETUP_ASYNC_WITH SETUP_FINALLY SETUP_WITH',
+        jabs='JUMP_ABSOLUTE JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE',
+        const='LOAD_CONST',
+        name=(
+            'DELETE_ATTR DELETE_GLOBAL DELETE_NAME IMPORT_FROM IMPORT_NAME LOAD_ATTR LOAD_GLOBAL LOAD_METHOD '
+            'LOAD_NAME STORE_ATTR STORE_GLOBAL STORE_NAME '
+        ),
+        local='DELETE_FAST LOAD_FAST STORE_FAST',
+        free='DELETE_DEREF LOAD_CLASSDEREF LOAD_CLOSURE LOAD_DEREF STORE_DEREF',
+        compare='COMPARE_OP',
+        cmp_op=('<', '<=', '==', '!=', '>', '>=', 'in', 'not in', 'is', 'is not', 'exception match', 'BAD'),
+    ),
+    "3.9": dict(
+        opnames=(
+            '- POP_TOP ROT_TWO ROT_THREE DUP_TOP DUP_TOP_TWO ROT_FOUR - - NOP UNARY_POSITIVE UNARY_NEGATIVE '
+            'UNARY_NOT - - UNARY_INVERT BINARY_MATRIX_MULTIPLY INPLACE_MATRIX_MULTIPLY - BINARY_POWER '
+            'BINARY_MULTIPLY - BINARY_MODULO BINARY_ADD BINARY_SUBTRACT BINARY_SUBSCR BINARY_FLOOR_DIVIDE '
+            'BINARY_TRUE_DIVIDE INPLACE_FLOOR_DIVIDE INPLACE_TRUE_DIVIDE - - - - - - - - - - - - - - - - - - '
+            'RERAISE WITH_EXCEPT_START GET_AITER GET_ANEXT BEFORE_ASYNC_WITH - END_ASYNC_FOR INPLACE_ADD '
+            'INPLACE_SUBTRACT INPLACE_MULTIPLY - INPLACE_MODULO STORE_SUBSCR DELETE_SUBSCR BINARY_LSHIFT '
+            'BINARY_RSHIFT BINARY_AND BINARY_XOR BINARY_OR INPLACE_POWER GET_ITER GET_YIELD_FROM_ITER '
+            'PRINT_EXPR LOAD_BUILD_CLASS YIELD_FROM GET_AWAITABLE LOAD_ASSERTION_ERROR INPLACE_LSHIFT '
+            'INPLACE_RSHIFT INPLACE_AND INPLACE_XOR INPLACE_OR - - LIST_TO_TUPLE RETURN_VALUE IMPORT_STAR '
+            'SETUP_ANNOTATIONS YIELD_VALUE POP_BLOCK - POP_EXCEPT STORE_NAME DELETE_NAME UNPACK_SEQUENCE '
+            'FOR_ITER UNPACK_EX STORE_ATTR DELETE_ATTR STORE_GLOBAL DELETE_GLOBAL - LOAD_CONST LOAD_NAME '
+            'BUILD_TUPLE BUILD_LIST BUILD_SET BUILD_MAP LOAD_ATTR COMPARE_OP IMPORT_NAME IMPORT_FROM '
+            'JUMP_FORWARD JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP JUMP_ABSOLUTE POP_JUMP_IF_FALSE '
+            'POP_JUMP_IF_TRUE LOAD_GLOBAL IS_OP CONTAINS_OP - - JUMP_IF_NOT_EXC_MATCH SETUP_FINALLY - '
+            'LOAD_FAST STORE_FAST DELETE_FAST - - - RAISE_VARARGS CALL_FUNCTION MAKE_FUNCTION BUILD_SLICE - '
+            'LOAD_CLOSURE LOAD_DEREF STORE_DEREF DELETE_DEREF - - CALL_FUNCTION_KW CALL_FUNCTION_EX '
+            'SETUP_WITH EXTENDED_ARG LIST_APPEND SET_ADD MAP_ADD LOAD_CLASSDEREF - - - - - SETUP_ASYNC_WITH '
+            'FORMAT_VALUE BUILD_CONST_KEY_MAP BUILD_STRING - - LOAD_METHOD CALL_METHOD LIST_EXTEND SET_UPDATE '
+            'DICT_MERGE DICT_UPDATE '
+        ),
+        caches={},
+        extended_arg=144,
+        hasarg=(
+            'BUILD_CONST_KEY_MAP BUILD_LIST BUILD_MAP BUILD_SET BUILD_SLICE BUILD_STRING BUILD_TUPLE '
+            'CALL_FUNCTION CALL_FUNCTION_EX CALL_FUNCTION_KW CALL_METHOD COMPARE_OP CONTAINS_OP DELETE_ATTR '
+            'DELETE_DEREF DELETE_FAST DELETE_GLOBAL DELETE_NAME DICT_MERGE DICT_UPDATE EXTENDED_ARG '
+            'FORMAT_VALUE FOR_ITER IMPORT_FROM IMPORT_NAME IS_OP JUMP_ABSOLUTE JUMP_FORWARD '
+            'JUMP_IF_FALSE_OR_POP JUMP_IF_NOT_EXC_MATCH JUMP_IF_TRUE_OR_POP LIST_APPEND LIST_EXTEND LOAD_ATTR '
+            'LOAD_CLASSDEREF LOAD_CLOSURE LOAD_CONST LOAD_DEREF LOAD_FAST LOAD_GLOBAL LOAD_METHOD LOAD_NAME '
+            'MAKE_FUNCTION MAP_ADD POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE RAISE_VARARGS SETUP_ASYNC_WITH '
+            'SETUP_FINALLY SETUP_WITH SET_ADD SET_UPDATE STORE_ATTR STORE_DEREF STORE_FAST STORE_GLOBAL '
+            'STORE_NAME UNPACK_EX UNPACK_SEQUENCE '
+        ),
+        jrel='FOR_ITER JUMP_FORWARD SETUP_ASYNC_WITH SETUP_FINALLY SETUP_WITH',
+        jabs=(
+            'JUMP_ABSOLUTE JUMP_IF_FALSE_OR_POP JUMP_IF_NOT_EXC_MATCH JUMP_IF_TRUE_OR_POP POP_JUMP_IF_FALSE '
+            'POP_JUMP_IF_TRUE '
+        ),
+        const='LOAD_CONST',
+        name=(
+            'DELETE_ATTR DELETE_GLOBAL DELETE_NAME IMPORT_FROM IMPORT_NAME LOAD_ATTR LOAD_GLOBAL LOAD_METHOD '
+            'LOAD_NAME STORE_ATTR STORE_GLOBAL STORE_NAME '
+        ),
+        local='DELETE_FAST LOAD_FAST STORE_FAST',
+        free='DELETE_DEREF LOAD_CLASSDEREF LOAD_CLOSURE LOAD_DEREF STORE_DEREF',
+        compare='COMPARE_OP',
+        cmp_op=('<', '<=', '==', '!=', '>', '>='),
+    ),
+    "3.10": dict(
+        opnames=(
+            '- POP_TOP ROT_TWO ROT_THREE DUP_TOP DUP_TOP_TWO ROT_FOUR - - NOP UNARY_POSITIVE UNARY_NEGATIVE '
+            'UNARY_NOT - - UNARY_INVERT BINARY_MATRIX_MULTIPLY INPLACE_MATRIX_MULTIPLY - BINARY_POWER '
+            'BINARY_MULTIPLY - BINARY_MODULO BINARY_ADD BINARY_SUBTRACT BINARY_SUBSCR BINARY_FLOOR_DIVIDE '
+            'BINARY_TRUE_DIVIDE INPLACE_FLOOR_DIVIDE INPLACE_TRUE_DIVIDE GET_LEN MATCH_MAPPING MATCH_SEQUENCE '
+            'MATCH_KEYS COPY_DICT_WITHOUT_KEYS - - - - - - - - - - - - - - WITH_EXCEPT_START GET_AITER '
+            'GET_ANEXT BEFORE_ASYNC_WITH - END_ASYNC_FOR INPLACE_ADD INPLACE_SUBTRACT INPLACE_MULTIPLY - '
+            'INPLACE_MODULO STORE_SUBSCR DELETE_SUBSCR BINARY_LSHIFT BINARY_RSHIFT BINARY_AND BINARY_XOR '
+            'BINARY_OR INPLACE_POWER GET_ITER GET_YIELD_FROM_ITER PRINT_EXPR LOAD_BUILD_CLASS YIELD_FROM '
+            'GET_AWAITABLE LOAD_ASSERTION_ERROR INPLACE_LSHIFT INPLACE_RSHIFT INPLACE_AND INPLACE_XOR '
+            'INPLACE_OR - - LIST_TO_TUPLE RETURN_VALUE IMPORT_STAR SETUP_ANNOTATIONS YIELD_VALUE POP_BLOCK - '
+            'POP_EXCEPT STORE_NAME DELETE_NAME UNPACK_SEQUENCE FOR_ITER UNPACK_EX STORE_ATTR DELETE_ATTR '
+            'STORE_GLOBAL DELETE_GLOBAL ROT_N LOAD_CONST LOAD_NAME BUILD_TUPLE BUILD_LIST BUILD_SET BUILD_MAP '
+            'LOAD_ATTR COMPARE_OP IMPORT_NAME IMPORT_FROM JUMP_FORWARD JUMP_IF_FALSE_OR_POP '
+            'JUMP_IF_TRUE_OR_POP JUMP_ABSOLUTE POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE LOAD_GLOBAL IS_OP '
+            'CONTAINS_OP RERAISE - JUMP_IF_NOT_EXC_MATCH SETUP_FINALLY - LOAD_FAST STORE_FAST DELETE_FAST - - '
+            'GEN_START RAISE_VARARGS CALL_FUNCTION MAKE_FUNCTION BUILD_SLICE - LOAD_CLOSURE LOAD_DEREF '
+            'STORE_DEREF DELETE_DEREF - - CALL_FUNCTION_KW CALL_FUNCTION_EX SETUP_WITH EXTENDED_ARG '
+            'LIST_APPEND SET_ADD MAP_ADD LOAD_CLASSDEREF - - - MATCH_CLASS - SETUP_ASYNC_WITH FORMAT_VALUE '
+            'BUILD_CONST_KEY_MAP BUILD_STRING - - LOAD_METHOD CALL_METHOD LIST_EXTEND SET_UPDATE DICT_MERGE '
+            'DICT_UPDATE '
+        ),
+        caches={},
+        extended_arg=144,
+        hasarg=(
+            'BUILD_CONST_KEY_MAP BUILD_LIST BUILD_MAP BUILD_SET BUILD_SLICE BUILD_STRING BUILD_TUPLE '
+            'CALL_FUNCTION CALL_FUNCTION_EX CALL_FUNCTION_KW CALL_METHOD COMPARE_OP CONTAINS_OP DELETE_ATTR '
+            'DELETE_DEREF DELETE_FAST DELETE_GLOBAL DELETE_NAME DICT_MERGE DICT_UPDATE EXTENDED_ARG '
+            'FORMAT_VALUE FOR_ITER GEN_START IMPORT_FROM IMPORT_NAME IS_OP JUMP_ABSOLUTE JUMP_FORWARD '
+            'JUMP_IF_FALSE_OR_POP JUMP_IF_NOT_EXC_MATCH JUMP_IF_TRUE_OR_POP LIST_APPEND LIST_EXTEND LOAD_ATTR '
+            'LOAD_CLASSDEREF LOAD_CLOSURE LOAD_CONST LOAD_DEREF LOAD_FAST LOAD_GLOBAL LOAD_METHOD LOAD_NAME '
+            'MAKE_FUNCTION MAP_ADD MATCH_CLASS POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE RAISE_VARARGS RERAISE ROT_N '
+            'SETUP_ASYNC_WITH SETUP_FINALLY SETUP_WITH SET_ADD SET_UPDATE STORE_ATTR STORE_DEREF STORE_FAST '
+            'STORE_GLOBAL STORE_NAME UNPACK_EX UNPACK_SEQUENCE '
+        ),
+        jrel='FOR_ITER JUMP_FORWARD SETUP_ASYNC_WITH SETUP_FINALLY SETUP_WITH',
+        jabs=(
+            'JUMP_ABSOLUTE JUMP_IF_FALSE_OR_POP JUMP_IF_NOT_EXC_MATCH JUMP_IF_TRUE_OR_POP POP_JUMP_IF_FALSE '
+            'POP_JUMP_IF_TRUE '
+        ),
+        const='LOAD_CONST',
+        name=(
+            'DELETE_ATTR DELETE_GLOBAL DELETE_NAME IMPORT_FROM IMPORT_NAME LOAD_ATTR LOAD_GLOBAL LOAD_METHOD '
+            'LOAD_NAME STORE_ATTR STORE_GLOBAL STORE_NAME '
+        ),
+        local='DELETE_FAST LOAD_FAST STORE_FAST',
+        free='DELETE_DEREF LOAD_CLASSDEREF LOAD_CLOSURE LOAD_DEREF STORE_DEREF',
+        compare='COMPARE_OP',
+        cmp_op=('<', '<=', '==', '!=', '>', '>='),
+    ),
+    "3.11": dict(
+        opnames=(
+            'CACHE POP_TOP PUSH_NULL - - - - - - NOP UNARY_POSITIVE UNARY_NEGATIVE UNARY_NOT - - UNARY_INVERT '
+            '- - - - - - - - - BINARY_SUBSCR - - - - GET_LEN MATCH_MAPPING MATCH_SEQUENCE MATCH_KEYS - '
+            'PUSH_EXC_INFO CHECK_EXC_MATCH CHECK_EG_MATCH - - - - - - - - - - - WITH_EXCEPT_START GET_AITER '
+            'GET_ANEXT BEFORE_ASYNC_WITH BEFORE_WITH END_ASYNC_FOR - - - - - STORE_SUBSCR DELETE_SUBSCR - - - '
+            '- - - GET_ITER GET_YIELD_FROM_ITER PRINT_EXPR LOAD_BUILD_CLASS - - LOAD_ASSERTION_ERROR '
+            'RETURN_GENERATOR - - - - - - LIST_TO_TUPLE RETURN_VALUE IMPORT_STAR SETUP_ANNOTATIONS '
+            'YIELD_VALUE ASYNC_GEN_WRAP PREP_RERAISE_STAR POP_EXCEPT STORE_NAME DELETE_NAME UNPACK_SEQUENCE '
+            'FOR_ITER UNPACK_EX STORE_ATTR DELETE_ATTR STORE_GLOBAL DELETE_GLOBAL SWAP LOAD_CONST LOAD_NAME '
+            'BUILD_TUPLE BUILD_LIST BUILD_SET BUILD_MAP LOAD_ATTR COMPARE_OP IMPORT_NAME IMPORT_FROM '
+            'JUMP_FORWARD JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP - POP_JUMP_FORWARD_IF_FALSE '
+            'POP_JUMP_FORWARD_IF_TRUE LOAD_GLOBAL IS_OP CONTAINS_OP RERAISE COPY - BINARY_OP SEND LOAD_FAST '
+            'STORE_FAST DELETE_FAST - POP_JUMP_FORWARD_IF_NOT_NONE POP_JUMP_FORWARD_IF_NONE RAISE_VARARGS '
+            'GET_AWAITABLE MAKE_FUNCTION BUILD_SLICE JUMP_BACKWARD_NO_INTERRUPT MAKE_CELL LOAD_CLOSURE '
+            'LOAD_DEREF STORE_DEREF DELETE_DEREF JUMP_BACKWARD - CALL_FUNCTION_EX - EXTENDED_ARG LIST_APPEND '
+            'SET_ADD MAP_ADD LOAD_CLASSDEREF COPY_FREE_VARS - RESUME MATCH_CLASS - - FORMAT_VALUE '
+            'BUILD_CONST_KEY_MAP BUILD_STRING - - LOAD_METHOD - LIST_EXTEND SET_UPDATE DICT_MERGE DICT_UPDATE '
+            'PRECALL - - - - CALL KW_NAMES POP_JUMP_BACKWARD_IF_NOT_NONE POP_JUMP_BACKWARD_IF_NONE '
+            'POP_JUMP_BACKWARD_IF_FALSE POP_JUMP_BACKWARD_IF_TRUE '
+        ),
+        caches={'BINARY_SUBSCR': 4, 'STORE_SUBSCR': 1, 'UNPACK_SEQUENCE': 1, 'STORE_ATTR': 4, 'LOAD_ATTR': 4, 'COMPARE_OP': 2, 'LOAD_GLOBAL': 5, 'BINARY_OP': 1, 'LOAD_METHOD': 10, 'PRECALL': 1, 'CALL': 4},
+        extended_arg=144,
+        hasarg=(
+            'BINARY_OP BUILD_CONST_KEY_MAP BUILD_LIST BUILD_MAP BUILD_SET BUILD_SLICE BUILD_STRING '
+            'BUILD_TUPLE CALL CALL_FUNCTION_EX COMPARE_OP CONTAINS_OP COPY COPY_FREE_VARS DELETE_ATTR '
+            'DELETE_DEREF DELETE_FAST DELETE_GLOBAL DELETE_NAME DICT_MERGE DICT_UPDATE EXTENDED_ARG '
+            'FORMAT_VALUE FOR_ITER GET_AWAITABLE IMPORT_FROM IMPORT_NAME IS_OP JUMP_BACKWARD '
+            'JUMP_BACKWARD_NO_INTERRUPT JUMP_FORWARD JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP KW_NAMES '
+            'LIST_APPEND LIST_EXTEND LOAD_ATTR LOAD_CLASSDEREF LOAD_CLOSURE LOAD_CONST LOAD_DEREF LOAD_FAST '
+            'LOAD_GLOBAL LOAD_METHOD LOAD_NAME MAKE_CELL MAKE_FUNCTION MAP_ADD MATCH_CLASS '
+            'POP_JUMP_BACKWARD_IF_FALSE POP_JUMP_BACKWARD_IF_NONE POP_JUMP_BACKWARD_IF_NOT_NONE '
+            'POP_JUMP_BACKWARD_IF_TRUE POP_JUMP_FORWARD_IF_FALSE POP_JUMP_FORWARD_IF_NONE '
+            'POP_JUMP_FORWARD_IF_NOT_NONE POP_JUMP_FORWARD_IF_TRUE PRECALL RAISE_VARARGS RERAISE RESUME SEND '
+            'SET_ADD SET_UPDATE STORE_ATTR STORE_DEREF STORE_FAST STORE_GLOBAL STORE_NAME SWAP UNPACK_EX '
+            'UNPACK_SEQUENCE '
+        ),
+        jrel=(
+            'FOR_ITER JUMP_BACKWARD JUMP_BACKWARD_NO_INTERRUPT JUMP_FORWARD JUMP_IF_FALSE_OR_POP '
+            'JUMP_IF_TRUE_OR_POP POP_JUMP_BACKWARD_IF_FALSE POP_JUMP_BACKWARD_IF_NONE '
+            'POP_JUMP_BACKWARD_IF_NOT_NONE POP_JUMP_BACKWARD_IF_TRUE POP_JUMP_FORWARD_IF_FALSE '
+            'POP_JUMP_FORWARD_IF_NONE POP_JUMP_FORWARD_IF_NOT_NONE POP_JUMP_FORWARD_IF_TRUE SEND '
+        ),
+        jabs='',
+        const='KW_NAMES LOAD_CONST',
+        name=(
+            'DELETE_ATTR DELETE_GLOBAL DELETE_NAME IMPORT_FROM IMPORT_NAME LOAD_ATTR LOAD_GLOBAL LOAD_METHOD '
+            'LOAD_NAME STORE_ATTR STORE_GLOBAL STORE_NAME '
+        ),
+        local='DELETE_FAST LOAD_FAST STORE_FAST',
+        free='DELETE_DEREF LOAD_CLASSDEREF LOAD_CLOSURE LOAD_DEREF MAKE_CELL STORE_DEREF',
+        compare='COMPARE_OP',
+        cmp_op=('<', '<=', '==', '!=', '>', '>='),
+    ),
+    "3.12": dict(
+        opnames=(
+            'CACHE POP_TOP PUSH_NULL INTERPRETER_EXIT END_FOR END_SEND - - - NOP - UNARY_NEGATIVE UNARY_NOT - '
+            '- UNARY_INVERT - RESERVED - - - - - - - BINARY_SUBSCR BINARY_SLICE STORE_SLICE - - GET_LEN '
+            'MATCH_MAPPING MATCH_SEQUENCE MATCH_KEYS - PUSH_EXC_INFO CHECK_EXC_MATCH CHECK_EG_MATCH - - - - - '
+            '- - - - - - WITH_EXCEPT_START GET_AITER GET_ANEXT BEFORE_ASYNC_WITH BEFORE_WITH END_ASYNC_FOR '
+            'CLEANUP_THROW - - - - STORE_SUBSCR DELETE_SUBSCR - - - - - - GET_ITER GET_YIELD_FROM_ITER - '
+            'LOAD_BUILD_CLASS - - LOAD_ASSERTION_ERROR RETURN_GENERATOR - - - - - - - RETURN_VALUE - '
+            'SETUP_ANNOTATIONS - LOAD_LOCALS - POP_EXCEPT STORE_NAME DELETE_NAME UNPACK_SEQUENCE FOR_ITER '
+            'UNPACK_EX STORE_ATTR DELETE_ATTR STORE_GLOBAL DELETE_GLOBAL SWAP LOAD_CONST LOAD_NAME '
+            'BUILD_TUPLE BUILD_LIST BUILD_SET BUILD_MAP LOAD_ATTR COMPARE_OP IMPORT_NAME IMPORT_FROM '
+            'JUMP_FORWARD - - - POP_JUMP_IF_FALSE POP_JUMP_IF_TRUE LOAD_GLOBAL IS_OP CONTAINS_OP RERAISE COPY '
+            'RETURN_CONST BINARY_OP SEND LOAD_FAST STORE_FAST DELETE_FAST LOAD_FAST_CHECK '
+            'POP_JUMP_IF_NOT_NONE POP_JUMP_IF_NONE RAISE_VARARGS GET_AWAITABLE MAKE_FUNCTION BUILD_SLICE '
+            'JUMP_BACKWARD_NO_INTERRUPT MAKE_CELL LOAD_CLOSURE LOAD_DEREF STORE_DEREF DELETE_DEREF '
+            'JUMP_BACKWARD LOAD_SUPER_ATTR CALL_FUNCTION_EX LOAD_FAST_AND_CLEAR EXTENDED_ARG LIST_APPEND '
+            'SET_ADD MAP_ADD - COPY_FREE_VARS YIELD_VALUE RESUME MATCH_CLASS - - FORMAT_VALUE '
+            'BUILD_CONST_KEY_MAP BUILD_STRING - - - - LIST_EXTEND SET_UPDATE DICT_MERGE DICT_UPDATE - - - - - '
+            'CALL KW_NAMES CALL_INTRINSIC_1 CALL_INTRINSIC_2 LOAD_FROM_DICT_OR_GLOBALS '
+            'LOAD_FROM_DICT_OR_DEREF - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - '
+            '- - - - - - - - - - - - - - - - - - - - - - - - INSTRUMENTED_LOAD_SUPER_ATTR '
+            'INSTRUMENTED_POP_JUMP_IF_NONE INSTRUMENTED_POP_JUMP_IF_NOT_NONE INSTRUMENTED_RESUME '
+            'INSTRUMENTED_CALL INSTRUMENTED_RETURN_VALUE INSTRUMENTED_YIELD_VALUE '
+            'INSTRUMENTED_CALL_FUNCTION_EX INSTRUMENTED_JUMP_FORWARD INSTRUMENTED_JUMP_BACKWARD '
+            'INSTRUMENTED_RETURN_CONST INSTRUMENTED_FOR_ITER INSTRUMENTED_POP_JUMP_IF_FALSE '
+            'INSTRUMENTED_POP_JUMP_IF_TRUE INSTRUMENTED_END_FOR INSTRUMENTED_END_SEND '
+            'INSTRUMENTED_INSTRUCTION INSTRUMENTED_LINE '
+        ),
+        caches={'BINARY_SUBSCR': 1, 'STORE_SUBSCR': 1, 'UNPACK_SEQUENCE': 1, 'FOR_ITER': 1, 'STORE_ATTR': 4, 'LOAD_ATTR': 9, 'COMPARE_OP': 1, 'LOAD_GLOBAL': 4, 'BINARY_OP': 1, 'SEND': 1, 'LOAD_SUPER_ATTR': 1, 'CALL': 3},
+        extended_arg=144,
+        hasarg=(
+            'BINARY_OP BUILD_CONST_KEY_MAP BUILD_LIST BUILD_MAP BUILD_SET BUILD_SLICE BUILD_STRING '
+            'BUILD_TUPLE CALL CALL_FUNCTION_EX CALL_INTRINSIC_1 CALL_INTRINSIC_2 COMPARE_OP CONTAINS_OP COPY '
+            'COPY_FREE_VARS DELETE_ATTR DELETE_DEREF DELETE_FAST DELETE_GLOBAL DELETE_NAME DICT_MERGE '
+            'DICT_UPDATE EXTENDED_ARG FORMAT_VALUE FOR_ITER GET_AWAITABLE IMPORT_FROM IMPORT_NAME '
+            'INSTRUMENTED_CALL INSTRUMENTED_CALL_FUNCTION_EX INSTRUMENTED_END_FOR INSTRUMENTED_END_SEND '
+            'INSTRUMENTED_FOR_ITER INSTRUMENTED_INSTRUCTION INSTRUMENTED_JUMP_BACKWARD '
+            'INSTRUMENTED_JUMP_FORWARD INSTRUMENTED_LINE INSTRUMENTED_LOAD_SUPER_ATTR '
+            'INSTRUMENTED_POP_JUMP_IF_FALSE INSTRUMENTED_POP_JUMP_IF_NONE INSTRUMENTED_POP_JUMP_IF_NOT_NONE '
+            'INSTRUMENTED_POP_JUMP_IF_TRUE INSTRUMENTED_RESUME INSTRUMENTED_RETURN_CONST '
+            'INSTRUMENTED_RETURN_VALUE INSTRUMENTED_YIELD_VALUE IS_OP JUMP_BACKWARD '
+            'JUMP_BACKWARD_NO_INTERRUPT JUMP_FORWARD KW_NAMES LIST_APPEND LIST_EXTEND LOAD_ATTR LOAD_CLOSURE '
+            'LOAD_CONST LOAD_DEREF LOAD_FAST LOAD_FAST_AND_CLEAR LOAD_FAST_CHECK LOAD_FROM_DICT_OR_DEREF '
+            'LOAD_FROM_DICT_OR_GLOBALS LOAD_GLOBAL LOAD_NAME LOAD_SUPER_ATTR MAKE_CELL MAKE_FUNCTION MAP_ADD '
+            'MATCH_CLASS POP_JUMP_IF_FALSE POP_JUMP_IF_NONE POP_JUMP_IF_NOT_NONE POP_JUMP_IF_TRUE '
+            'RAISE_VARARGS RERAISE RESUME RETURN_CONST SEND SET_ADD SET_UPDATE STORE_ATTR STORE_DEREF '
+            'STORE_FAST STORE_GLOBAL STORE_NAME SWAP UNPACK_EX UNPACK_SEQUENCE YIELD_VALUE '
+        ),
+        jrel=(
+            'FOR_ITER JUMP_BACKWARD JUMP_BACKWARD_NO_INTERRUPT JUMP_FORWARD POP_JUMP_IF_FALSE '
+            'POP_JUMP_IF_NONE POP_JUMP_IF_NOT_NONE POP_JUMP_IF_TRUE SEND '
+        ),
+        jabs='',
+        const='KW_NAMES LOAD_CONST RETURN_CONST',
+        name=(
+            'DELETE_ATTR DELETE_GLOBAL DELETE_NAME IMPORT_FROM IMPORT_NAME LOAD_ATTR '
+            'LOAD_FROM_DICT_OR_GLOBALS LOAD_GLOBAL LOAD_NAME LOAD_SUPER_ATTR STORE_ATTR STORE_GLOBAL '
+            'STORE_NAME '
+        ),
+        local='DELETE_FAST LOAD_FAST LOAD_FAST_AND_CLEAR LOAD_FAST_CHECK STORE_FAST',
+        free='DELETE_DEREF LOAD_CLOSURE LOAD_DEREF LOAD_FROM_DICT_OR_DEREF MAKE_CELL STORE_DEREF',
+        compare='COMPARE_OP',
+        cmp_op=('<', '<=', '==', '!=', '>', '>='),
+    ),
+    "3.13": dict(
+        opnames=(
+            'CACHE BEFORE_ASYNC_WITH BEFORE_WITH - BINARY_SLICE BINARY_SUBSCR CHECK_EG_MATCH CHECK_EXC_MATCH '
+            'CLEANUP_THROW DELETE_SUBSCR END_ASYNC_FOR END_FOR END_SEND EXIT_INIT_CHECK FORMAT_SIMPLE '
+            'FORMAT_WITH_SPEC GET_AITER RESERVED GET_ANEXT GET_ITER GET_LEN GET_YIELD_FROM_ITER '
+            'INTERPRETER_EXIT LOAD_ASSERTION_ERROR LOAD_BUILD_CLASS LOAD_LOCALS MAKE_FUNCTION MATCH_KEYS '
+            'MATCH_MAPPING MATCH_SEQUENCE NOP POP_EXCEPT POP_TOP PUSH_EXC_INFO PUSH_NULL RETURN_GENERATOR '
+            'RETURN_VALUE SETUP_ANNOTATIONS STORE_SLICE STORE_SUBSCR TO_BOOL UNARY_INVERT UNARY_NEGATIVE '
+            'UNARY_NOT WITH_EXCEPT_START BINARY_OP BUILD_CONST_KEY_MAP BUILD_LIST BUILD_MAP BUILD_SET '
+            'BUILD_SLICE BUILD_STRING BUILD_TUPLE CALL CALL_FUNCTION_EX CALL_INTRINSIC_1 CALL_INTRINSIC_2 '
+            'CALL_KW COMPARE_OP CONTAINS_OP CONVERT_VALUE COPY COPY_FREE_VARS DELETE_ATTR DELETE_DEREF '
+            'DELETE_FAST DELETE_GLOBAL DELETE_NAME DICT_MERGE DICT_UPDATE ENTER_EXECUTOR EXTENDED_ARG '
+            'FOR_ITER GET_AWAITABLE IMPORT_FROM IMPORT_NAME IS_OP JUMP_BACKWARD JUMP_BACKWARD_NO_INTERRUPT '
+            'JUMP_FORWARD LIST_APPEND LIST_EXTEND LOAD_ATTR LOAD_CONST LOAD_DEREF LOAD_FAST '
+            'LOAD_FAST_AND_CLEAR LOAD_FAST_CHECK LOAD_FAST_LOAD_FAST LOAD_FROM_DICT_OR_DEREF '
+            'LOAD_FROM_DICT_OR_GLOBALS LOAD_GLOBAL LOAD_NAME LOAD_SUPER_ATTR MAKE_CELL MAP_ADD MATCH_CLASS '
+            'POP_JUMP_IF_FALSE POP_JUMP_IF_NONE POP_JUMP_IF_NOT_NONE POP_JUMP_IF_TRUE RAISE_VARARGS RERAISE '
+            'RETURN_CONST SEND SET_ADD SET_FUNCTION_ATTRIBUTE SET_UPDATE STORE_ATTR STORE_DEREF STORE_FAST '
+            'STORE_FAST_LOAD_FAST STORE_FAST_STORE_FAST STORE_GLOBAL STORE_NAME SWAP UNPACK_EX '
+            'UNPACK_SEQUENCE YIELD_VALUE - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - RESUME - '
+            '- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - '
+            '- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - INSTRUMENTED_RESUME '
+            'INSTRUMENTED_END_FOR INSTRUMENTED_END_SEND INSTRUMENTED_RETURN_VALUE INSTRUMENTED_RETURN_CONST '
+            'INSTRUMENTED_YIELD_VALUE INSTRUMENTED_LOAD_SUPER_ATTR INSTRUMENTED_FOR_ITER INSTRUMENTED_CALL '
+            'INSTRUMENTED_CALL_KW INSTRUMENTED_CALL_FUNCTION_EX INSTRUMENTED_INSTRUCTION '
+            'INSTRUMENTED_JUMP_FORWARD INSTRUMENTED_JUMP_BACKWARD INSTRUMENTED_POP_JUMP_IF_TRUE '
+            'INSTRUMENTED_POP_JUMP_IF_FALSE INSTRUMENTED_POP_JUMP_IF_NONE INSTRUMENTED_POP_JUMP_IF_NOT_NONE '
+            'INSTRUMENTED_LINE '
+        ),
+        caches={'LOAD_GLOBAL': 4, 'BINARY_OP': 1, 'UNPACK_SEQUENCE': 1, 'COMPARE_OP': 1, 'CONTAINS_OP': 1, 'BINARY_SUBSCR': 1, 'FOR_ITER': 1, 'LOAD_SUPER_ATTR': 1, 'LOAD_ATTR': 9, 'STORE_ATTR': 4, 'CALL': 3, 'STORE_SUBSCR': 1, 'SEND': 1, 'JUMP_BACKWARD': 1, 'TO_BOOL': 3, 'POP_JUMP_IF_TRUE': 1, 'POP_JUMP_IF_FALSE': 1, 'POP_JUMP_IF_NONE': 1, 'POP_JUMP_IF_NOT_NONE': 1},
+        extended_arg=71,
+        hasarg=(
+            'BINARY_OP BUILD_CONST_KEY_MAP BUILD_LIST BUILD_MAP BUILD_SET BUILD_SLICE BUILD_STRING '
+            'BUILD_TUPLE CALL CALL_FUNCTION_EX CALL_INTRINSIC_1 CALL_INTRINSIC_2 CALL_KW COMPARE_OP '
+            'CONTAINS_OP CONVERT_VALUE COPY COPY_FREE_VARS DELETE_ATTR DELETE_DEREF DELETE_FAST DELETE_GLOBAL '
+            'DELETE_NAME DICT_MERGE DICT_UPDATE ENTER_EXECUTOR EXTENDED_ARG FOR_ITER GET_AWAITABLE '
+            'IMPORT_FROM IMPORT_NAME INSTRUMENTED_CALL INSTRUMENTED_CALL_KW INSTRUMENTED_FOR_ITER '
+            'INSTRUMENTED_JUMP_BACKWARD INSTRUMENTED_JUMP_FORWARD INSTRUMENTED_LOAD_SUPER_ATTR '
+            'INSTRUMENTED_POP_JUMP_IF_FALSE INSTRUMENTED_POP_JUMP_IF_NONE INSTRUMENTED_POP_JUMP_IF_NOT_NONE '
+            'INSTRUMENTED_POP_JUMP_IF_TRUE INSTRUMENTED_RESUME INSTRUMENTED_RETURN_CONST '
+            'INSTRUMENTED_YIELD_VALUE IS_OP JUMP_BACKWARD JUMP_BACKWARD_NO_INTERRUPT JUMP_FORWARD LIST_APPEND '
+            'LIST_EXTEND LOAD_ATTR LOAD_CONST LOAD_DEREF LOAD_FAST LOAD_FAST_AND_CLEAR LOAD_FAST_CHECK '
+            'LOAD_FAST_LOAD_FAST LOAD_FROM_DICT_OR_DEREF LOAD_FROM_DICT_OR_GLOBALS LOAD_GLOBAL LOAD_NAME '
+            'LOAD_SUPER_ATTR MAKE_CELL MAP_ADD MATCH_CLASS POP_JUMP_IF_FALSE POP_JUMP_IF_NONE '
+            'POP_JUMP_IF_NOT_NONE POP_JUMP_IF_TRUE RAISE_VARARGS RERAISE RESUME RETURN_CONST SEND SET_ADD '
+            'SET_FUNCTION_ATTRIBUTE SET_UPDATE STORE_ATTR STORE_DEREF STORE_FAST STORE_FAST_LOAD_FAST '
+            'STORE_FAST_STORE_FAST STORE_GLOBAL STORE_NAME SWAP UNPACK_EX UNPACK_SEQUENCE YIELD_VALUE '
+        ),
+        jrel=(
+            'FOR_ITER JUMP_BACKWARD JUMP_BACKWARD_NO_INTERRUPT JUMP_FORWARD POP_JUMP_IF_FALSE '
+            'POP_JUMP_IF_NONE POP_JUMP_IF_NOT_NONE POP_JUMP_IF_TRUE SEND '
+        ),
+        jabs='',
+        const='INSTRUMENTED_RETURN_CONST LOAD_CONST RETURN_CONST',
+        name=(
+            'DELETE_ATTR DELETE_GLOBAL DELETE_NAME IMPORT_FROM IMPORT_NAME LOAD_ATTR '
+            'LOAD_FROM_DICT_OR_GLOBALS LOAD_GLOBAL LOAD_NAME LOAD_SUPER_ATTR STORE_ATTR STORE_GLOBAL '
+            'STORE_NAME '
+        ),
+        local=(
+            'DELETE_FAST LOAD_FAST LOAD_FAST_AND_CLEAR LOAD_FAST_CHECK LOAD_FAST_LOAD_FAST STORE_FAST '
+            'STORE_FAST_LOAD_FAST STORE_FAST_STORE_FAST '
+        ),
+        free='DELETE_DEREF LOAD_DEREF LOAD_FROM_DICT_OR_DEREF MAKE_CELL STORE_DEREF',
+        compare='COMPARE_OP',
+        cmp_op=('<', '<=', '==', '!=', '>', '>='),
+    ),
+}
+
+OpTable = namedtuple("OpTable", "version opnames opmap caches extended_arg hasarg jrel jabs "
+                                "const name local free compare cmp_op")
+
+_cache = {}
+
+def get_table(version):
+    """Return the OpTable for "3.X"; raises ValueError for versions not in TABLES."""
+    t = _cache.get(version)
+    if t is not None:
+        return t
+    raw = TABLES.get(version)
+    if raw is None:
+        raise ValueError(f"no opcode table for Python {version} (have: {', '.join(TABLES)})")
+    opnames = {i: n for i, n in enumerate(raw["opnames"].split()) if n != "-"}
+    sets = {k: frozenset(raw[k].split()) for k in ("hasarg", "jrel", "jabs", "const", "name", "local", "free", "compare")}
+    t = _cache[version] = OpTable(version, opnames, {n: i for i, n in opnames.items()}, dict(raw["caches"]),
+                                  raw["extended_arg"], cmp_op=raw["cmp_op"], **sets)
+    return t
+
+if __name__ == "__main__":
+    import opcode, sys, textwrap
+    v = "%d.%d" % sys.version_info[:2]
+    names = {i: n for i, n in enumerate(opcode.opname[:256]) if not n.startswith("<")}
+    ic = getattr(opcode, "_inline_cache_entries", None)
+    if isinstance(ic, dict):
+        caches = {k: n for k, n in ic.items() if n and k in names.values()}
+    elif ic:
+        caches = {names[i]: n for i, n in enumerate(ic[:256]) if n and i in names}
+    else:
+        caches = {}
+    top = max(names) + 1
+    opstr = " ".join(names.get(i, "-") for i in range(top))
+    def nm(lst): return " ".join(sorted(names[i] for i in lst if i in names))
+    if sys.version_info >= (3, 13):
+        hasarg = nm(opcode.hasarg)
+    else:
+        hasarg = " ".join(sorted(n for i, n in names.items() if i >= opcode.HAVE_ARGUMENT))
+    def s(x, ind=8):
+        lines = textwrap.wrap(x, 96, break_on_hyphens=False)
+        if len(lines) <= 1:
+            return repr(x)
+        return "(\n" + "\n".join(" " * ind + repr(l + " ") for l in lines) + "\n" + " " * (ind - 4) + ")"
+    out = [f'    "{v}": dict(']
+    out.append(f"        opnames={s(opstr, 12)},")
+    out.append(f"        caches={caches!r},")
+    out.append(f"        extended_arg={opcode.EXTENDED_ARG},")
+    for key, lst in (("hasarg", None), ("jrel", opcode.hasjrel), ("jabs", opcode.hasjabs), ("const", opcode.hasconst),
+                     ("name", opcode.hasname), ("local", opcode.haslocal), ("free", opcode.hasfree),
+                     ("compare", opcode.hascompare)):
+        val = hasarg if lst is None else nm(lst)
+        out.append(f"        {key}={s(val, 12)},")
+    out.append(f"        cmp_op={tuple(opcode.cmp_op)!r},")
+    out.append("    ),")
+    print("\n".join(out))
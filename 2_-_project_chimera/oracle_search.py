@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+oracle_search.py
+
+Position-by-position input recovery against a progress oracle.
+
+ctest.py recovered a 37-byte input for lib.func one position at a time: for every
+position it built 256 tasks, a fresh Pool, and a create_string_buffer per
+candidate. This module keeps that idea and makes the pieces reusable:
+
+  - an oracle is any callable that scores the candidate held in a buffer: a ctypes
+    function (ctypes_oracle), a Python function (python_oracle) or an external
+    program (subprocess_oracle). It is built by a factory "module:callable",
+    factory(buf, size) -> oracle(), once per worker, so shared libraries are
+    loaded once per process;
+  - each worker owns one preallocated bytearray (size + NUL). A task copies the
+    current prefix in once and then only rewrites buf[pos] per candidate byte;
+    ctypes oracles get a c_char array aliasing that buffer, so a call allocates
+    nothing;
+  - one Pool lives for the whole search; a position is split into byte chunks,
+    submitted with apply_async and consumed as they finish. Every expansion
+    bumps a shared epoch counter when it ends, so chunks that are still queued or
+    running when the caller stops early (direction "change") return at their
+    next byte instead of holding up the next position;
+  - strategies:
+      greedy  keep the single best byte per position ("change" direction: the
+              first byte whose metric differs from the baseline, like ctest.py)
+      beam    keep the --beam best partial inputs per position (max / min)
+    with charset narrowing: each position is tried with the first --charsets
+    tier (e.g. printable) and widened to the next tier only if nothing made
+    progress;
+  - after every position the state (position, beam, metrics, evaluations) is
+    written atomically to --checkpoint; --resume continues from it.
+
+Usage:
+  python3 oracle_search.py ctest:make_oracle --size 37 --direction change
+  python3 oracle_search.py my_oracles:prefix_len --size 20 --strategy beam --beam 4 --target 20
+  python3 oracle_search.py ctest:make_oracle --size 37 --direction change --resume
+"""
+import argparse, importlib, json, os, queue, re, string, subprocess, sys, time
+from contextlib import closing
+from multiprocessing import Pool, RawValue, cpu_count
+
+CHARSETS = {
+    "alnum": (string.ascii_letters + string.digits).encode(),
+    "printable": bytes(range(0x20, 0x7F)),
+    "all": bytes(range(256)),
+}
+BUF = object()          # placeholder for the candidate buffer in ctypes_oracle args
+
+# --- oracle adapters -------------------------------------------------------------
+
+def ctypes_oracle(lib_path, func_name, buf, args, argtypes=None, restype=None, metric=None):
+    """Oracle calling lib.func_name(*args) with BUF replaced by a c_char array over buf."""
+    import ctypes
+    lib = ctypes.CDLL(lib_path)
+    func = getattr(lib, func_name)
+    if argtypes is not None:
+        func.argtypes = argtypes
+    if restype is not None:
+        func.restype = restype
+    view = (ctypes.c_char * len(buf)).from_buffer(buf)
+    call_args = tuple(view if a is BUF else a for a in args)
+    if metric is None:
+        return lambda: func(*call_args)
+    return lambda: metric(func(*call_args))
+
+def python_oracle(fn, buf, size):
+    """Oracle calling fn(candidate bytes)."""
+    return lambda: fn(bytes(buf[:size]))
+
+def subprocess_oracle(cmd, buf, size, metric_re=None, timeout=10.0):
+    """Oracle running cmd with the candidate on stdin.
+
+    The metric is int(group 1) of metric_re in stdout, or the exit code if
+    metric_re is None. Spawning dominates the cost; prefer a ctypes or Python
+    oracle where one exists.
+    """
+    pattern = re.compile(metric_re.encode()) if metric_re else None
+
+    def oracle():
+        r = subprocess.run(cmd, input=bytes(buf[:size]), capture_output=True, timeout=timeout)
+        if pattern is None:
+            return r.returncode
+        m = pattern.search(r.stdout)
+        return int(m.group(1)) if m else None
+    return oracle
+
+def resolve_factory(spec):
+    """"module:callable" -> factory(buf, size) returning oracle()."""
+    mod, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(mod), attr or "make_oracle")
+
+# --- worker side -------------------------------------------------------------------
+
+_W = {}
+
+def _init_worker(spec, size, epoch):
+    buf = bytearray(size + 1)               # trailing NUL for C string oracles
+    _W.update(buf=buf, size=size, oracle=resolve_factory(spec)(buf, size), pid=os.getpid(), epoch=epoch)
+
+def evaluate_chunk(task):
+    """task = (candidate bytes, position, byte values, stop_on_change baseline or None, epoch).
+
+    Returns (candidate, position, [(byte, metric)]); with a baseline, stops at the
+    first byte whose metric differs from it. Stops early, with partial results, once
+    the shared epoch has moved past the task's (its expansion was abandoned).
+    """
+    cand, pos, values, baseline, epoch = task
+    buf, oracle, size, current = _W["buf"], _W["oracle"], _W["size"], _W["epoch"]
+    buf[:size] = cand
+    out = []
+    for b in values:
+        if current.value != epoch:
+            break
+        buf[pos] = b
+        m = oracle()
+        out.append((b, m))
+        if baseline is not None and m != baseline[0]:
+            break
+    return cand, pos, out
+
+# --- search ------------------------------------------------------------------------
+
+def better(direction, m, base):
+    if m is None:
+        return False
+    if base is None:
+        return True
+    return m > base if direction == "max" else m < base if direction == "min" else m != base
+
+def _tiers(names):
+    seen, tiers = set(), []
+    for name in names:
+        vals = bytes(b for b in CHARSETS[name] if b not in seen)
+        seen.update(vals)
+        if vals:
+            tiers.append(vals)
+    return tiers
+
+class OracleSearch:
+    def __init__(self, spec, size, workers=None, direction="max", charsets=("printable", "all"),
+                 fill=0, checkpoint=None):
+        self.spec, self.size, self.direction = spec, size, direction
+        self.workers = workers or cpu_count()
+        self.tiers = _tiers(charsets)
+        self.charsets = list(charsets)
+        self.fill = fill
+        self.checkpoint = checkpoint
+        self.evaluations = 0
+        self.pool = None
+        self.epoch = RawValue("q", 0)      # bumped when an expansion ends; stale chunks bail out
+
+    def __enter__(self):
+        self.pool = Pool(self.workers, initializer=_init_worker, initargs=(self.spec, self.size, self.epoch))
+        return self
+
+    def __exit__(self, *exc):
+        self.pool.terminate()
+        self.pool.join()
+
+    def _chunks(self, values):
+        n = max(1, -(-len(values) // self.workers))
+        return [values[i:i + n] for i in range(0, len(values), n)]
+
+    def score(self, cand):
+        _, _, [(_, m)] = self.pool.apply(evaluate_chunk, ((cand, 0, bytes([cand[0]]), None, self.epoch.value),))
+        self.evaluations += 1
+        return m
+
+    def expand(self, states, pos, values, first_change=False):
+        """Yield (candidate, parent metric, byte, metric) for every state x byte in values.
+
+        Closing the generator early abandons the chunks still queued or running.
+        """
+        epoch = self.epoch.value
+        tasks = [(cand, pos, chunk, (metric,) if first_change else None, epoch)
+                 for cand, metric in states for chunk in self._chunks(values)]
+        parent = dict(states)
+        done = queue.SimpleQueue()
+        for t in tasks:
+            self.pool.apply_async(evaluate_chunk, (t,), callback=done.put, error_callback=done.put)
+        try:
+            for _ in tasks:
+                res = done.get()
+                if isinstance(res, BaseException):
+                    raise res
+                cand, p, results = res
+                self.evaluations += len(results)
+                for b, m in results:
+                    yield cand, parent[cand], b, m
+        finally:
+            self.epoch.value = epoch + 1
+
+    def step(self, states, pos, width):
+        """Return the next beam for position pos, widening the charset until something progresses."""
+        first_change = self.direction == "change"
+        children = []
+        for tier in self.tiers:
+            with closing(self.expand(states, pos, tier, first_change)) as results:
+                for cand, base, b, m in results:
+                    if better(self.direction, m, base):
+                        children.append((cand[:pos] + bytes([b]) + cand[pos + 1:], m))
+                        if first_change:
+                            break
+            if children:
+                break
+        if not children:
+            return states, False
+        if self.direction != "change":
+            children.sort(key=lambda s: s[1], reverse=self.direction == "max")
+        return children[:width], True
+
+    def save(self, state):
+        if not self.checkpoint:
+            return
+        tmp = self.checkpoint + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(state, evaluations=self.evaluations, updated=time.time()), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint)
+
+    def load(self, options):
+        with open(self.checkpoint, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("options") != options:
+            raise ValueError(f"checkpoint {self.checkpoint} options {state.get('options')} differ from {options}")
+        self.evaluations = state.get("evaluations", 0)
+        return state["pos"], [(bytes.fromhex(h), m) for h, m in state["beam"]], state.get("stalled", [])
+
+    def run(self, strategy="greedy", width=1, target=None, resume=False):
+        """Search positions 0..size-1; returns (best candidate, metric, stalled positions)."""
+        width = 1 if strategy == "greedy" else width
+        options = {"spec": self.spec, "size": self.size, "strategy": strategy, "width": width,
+                   "direction": self.direction, "charsets": self.charsets, "fill": self.fill}
+        if resume and self.checkpoint and os.path.exists(self.checkpoint):
+            start, states, stalled = self.load(options)
+            print(f"[+] Resuming at position {start} from {self.checkpoint}")
+        else:
+            init = bytes([self.fill]) * self.size
+            start, states, stalled = 0, [(init, self.score(init))], []
+            print(f"[+] Baseline metric {states[0][1]!r}")
+        t0 = time.time()
+        for pos in range(start, self.size):
+            states, progressed = self.step(states, pos, width)
+            best, metric = states[0]
+            if not progressed:
+                stalled.append(pos)
+            shown = bytes(best[:pos + 1]).decode("latin-1")
+            print(f"  pos {pos:3d}: {'byte %02x' % best[pos] if progressed else 'no progress'} "
+                  f"metric={metric!r} beam={len(states)} {shown!r}", flush=True)
+            self.save({"options": options, "pos": pos + 1, "stalled": stalled,
+                       "beam": [[c.hex(), m] for c, m in states]})
+            if target is not None and metric == target:
+                break
+        print(f"[+] {self.evaluations} oracle calls in {time.time() - t0:.2f}s")
+        return states[0][0], states[0][1], stalled
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Recover an input byte by byte against a progress oracle")
+    p.add_argument("oracle", help="factory module:callable, called as factory(buf, size) in every worker")
+    p.add_argument("--size", type=int, required=True, help="input length in bytes")
+    p.add_argument("--strategy", choices=("greedy", "beam"), default="greedy")
+    p.add_argument("--beam", type=int, default=4, help="beam width")
+    p.add_argument("--direction", choices=("max", "min", "change"), default="max",
+                   help="progress = metric goes up / goes down / differs from the previous position's")
+    p.add_argument("--charsets", default="printable,all",
+                   help=f"comma-separated tiers tried in order ({', '.join(CHARSETS)})")
+    p.add_argument("--fill", type=lambda s: int(s, 0), default=0, help="initial byte value of every position")
+    p.add_argument("--target", type=int, default=None, help="stop once the metric reaches this value")
+    p.add_argument("--workers", type=int, default=cpu_count())
+    p.add_argument("--checkpoint", default="oracle_state.json")
+    p.add_argument("--resume", action="store_true")
+    args = p.parse_args()
+    if args.strategy == "beam" and args.direction == "change":
+        sys.exit("beam search needs an ordered metric (--direction max or min)")
+
+    sys.path.insert(0, os.getcwd())
+    with OracleSearch(args.oracle, args.size, args.workers, args.direction, args.charsets.split(","),
+                      args.fill, args.checkpoint) as search:
+        result, metric, stalled = search.run(args.strategy, args.beam, args.target, args.resume)
+    print("Final hex:", " ".join(f"{b:02x}" for b in result))
+    print("Final ascii:", "".join(chr(b) if 0x20 <= b <= 0x7e else "\\x%02x" % b for b in result))
+    print(f"✅ metric {metric!r}" + (f", no progress at positions {stalled}" if stalled else ""))
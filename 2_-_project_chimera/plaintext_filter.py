@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+plaintext_filter.py
+
+Staged early-exit plaintext predicates for the RC4 key searches.
+
+Instead of decrypting the whole ciphertext and then trying zlib.decompress and a
+full printable scan, a FilterPipeline asks each Stage for only as many plaintext
+bytes as it needs (Stage.nbytes). The RC4 keystream is generated lazily with
+RC4Stream, so a key rejected on the first byte costs the KSA plus one PRGA step.
+Only candidates that survive every prefix stage are expanded to the full blob and
+handed to the final classifier.
+
+Default stages (both hypotheses are kept alive until one is ruled out):
+  1. first-byte   : a valid zlib CMF byte (CM=8, CINFO<=7; 0x78 for the usual
+                    32K window) or a printable byte
+  2. header-2     : valid zlib header (CMF/FLG checksum) or two printable bytes
+  3. full         : zlib.decompress() succeeds, or every byte is printable
+
+Stages are plain (name, nbytes, test) tuples, so scripts can plug in their own,
+e.g. Stage("marshal", 1, lambda p: p[0] in (0x63, 0xe3)).
+
+Per-stage hit rates are kept in pipeline.stats and printed with report().
+"""
+import zlib
+from collections import namedtuple
+import numpy as np
+
+from rc4_batch import RC4Stream, rc4_keystream_batch
+
+PRINTABLE = frozenset(list(range(32, 127)) + [9, 10, 13])
+
+# test(prefix: bytes) -> bool ; prefix has exactly nbytes plaintext bytes
+Stage = namedtuple("Stage", "name nbytes test")
+
+def is_printable(data):
+    return all(b in PRINTABLE for b in data)
+
+def zlib_cmf_ok(cmf):
+    """RFC 1950 CMF byte: CM=8 (deflate), CINFO<=7 (window up to 32K)."""
+    return (cmf & 0x0f) == 8 and (cmf >> 4) <= 7
+
+def zlib_header_ok(data):
+    """RFC 1950 header check: CM=8, CINFO<=7, (CMF*256 + FLG) % 31 == 0."""
+    cmf, flg = data[0], data[1]
+    return zlib_cmf_ok(cmf) and ((cmf << 8) | flg) % 31 == 0
+
+def classify_full(dec):
+    """Final check on a fully decrypted blob; same result shape as try_decrypt_with_key()."""
+    try:
+        plain = zlib.decompress(dec)
+        try:
+            text = plain.decode('utf-8')
+        except Exception:
+            text = repr(plain)
+        return ("zlib_ok", text)
+    except Exception:
+        if len(dec) > 0 and is_printable(dec):
+            return ("printable", dec.decode('latin1'))
+        return (None, None)
+
+DEFAULT_STAGES = (
+    Stage("first-byte", 1, lambda p: zlib_cmf_ok(p[0]) or p[0] in PRINTABLE),
+    Stage("header-2", 2, lambda p: zlib_header_ok(p) or is_printable(p)),
+)
+
+class FilterPipeline:
+    def __init__(self, ciphertext, stages=DEFAULT_STAGES, classify=classify_full):
+        self.ciphertext = bytes(ciphertext)
+        self.stages = sorted(stages, key=lambda s: s.nbytes)
+        self.classify = classify
+        # stats[name] = [tested, passed]; the final classifier is recorded as "full"
+        self.stats = {s.name: [0, 0] for s in self.stages}
+        self.stats["full"] = [0, 0]
+
+    def run(self, key):
+        """Decrypt under `key` with early exit; returns (status, output) or (None, None)."""
+        ct = self.ciphertext
+        stream = RC4Stream(key)
+        ks = b""
+        for stage in self.stages:
+            if stage.nbytes > len(ks):
+                ks += stream.keystream(stage.nbytes - len(ks))
+            st = self.stats[stage.name]
+            st[0] += 1
+            prefix = bytes(c ^ k for c, k in zip(ct, ks[:stage.nbytes]))
+            if not stage.test(prefix):
+                return (None, None)
+            st[1] += 1
+        ks += stream.keystream(len(ct) - len(ks))
+        return self._finish(bytes(c ^ k for c, k in zip(ct, ks)))
+
+    def run_batch(self, keys):
+        """Batched variant: one rc4_keystream_batch() call for the longest prefix stage,
+        then the full decrypt only for survivors. Yields (key, status, output) for hits."""
+        if not keys:
+            return
+        width = self.stages[-1].nbytes if self.stages else 0
+        alive = list(range(len(keys)))
+        if width:
+            ks = rc4_keystream_batch(keys, width)
+            prefixes = [bytes(row) for row in ks ^ np.frombuffer(self.ciphertext[:width], dtype=np.uint8)]
+            for stage in self.stages:
+                st = self.stats[stage.name]
+                st[0] += len(alive)
+                alive = [n for n in alive if stage.test(prefixes[n][:stage.nbytes])]
+                st[1] += len(alive)
+        for n in alive:
+            stream = RC4Stream(keys[n])
+            ks = stream.keystream(len(self.ciphertext))
+            status, out = self._finish(bytes(c ^ k for c, k in zip(self.ciphertext, ks)))
+            if status:
+                yield keys[n], status, out
+
+    def _finish(self, dec):
+        st = self.stats["full"]
+        st[0] += 1
+        status, out = self.classify(dec)
+        if status:
+            st[1] += 1
+        return status, out
+
+    def merge_stats(self, other):
+        """Add counters from another pipeline's stats dict (e.g. returned by a worker)."""
+        for name, (tested, passed) in other.items():
+            st = self.stats.setdefault(name, [0, 0])
+            st[0] += tested
+            st[1] += passed
+
+    def report(self):
+        lines = ["stage          bytes      tested      passed   hit-rate"]
+        widths = {s.name: s.nbytes for s in self.stages}
+        widths["full"] = len(self.ciphertext)
+        for name, (tested, passed) in self.stats.items():
+            rate = (100.0 * passed / tested) if tested else 0.0
+            lines.append(f"{name:<14} {widths.get(name, 0):>5} {tested:>11} {passed:>11}   {rate:7.3f}%")
+        return "\n".join(lines)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+pyc_header.py
+
+Header-aware .pyc loading.
+
+The loaders here used a fixed data[16:] while our own writers (auto_find_pyc.py,
+ctest2.py, testing33.py, ...) emitted magic + timestamp + 4 zero bytes, i.e. a
+12-byte header, and several dumps are bare marshal data with no header at all.
+A wrong slice costs a full marshal.loads() failure per file. parse_header()
+decides the payload offset from the first 17 bytes only:
+
+  magic (u16 LE) + b"\\r\\n"   -> CPython version from MAGIC_RANGES
+  3.7+ (PEP 552), 16 bytes:  flags u32; bit 0 = hash-based (8-byte source hash),
+                             bit 1 = check_source; otherwise mtime u32 + size u32
+  legacy 12-byte layout:     magic + mtime + size (3.3-3.6, and our old writers,
+                             recognised by a flags word that is not 0/1/3 and a
+                             code tag at offset 12)
+  bare marshal:              first byte is a code tag ('c' or 0xe3), offset 0
+
+open_pyc() and map_pyc() memory-map the file so triaging thousands of pycs only touches the
+pages that are actually read.
+
+Usage:
+  hdr, code = load_pyc("chimera_payload5.pyc")
+  python3 pyc_header.py *.pyc        # one line per file: version, layout, offset
+"""
+import bisect, importlib.util, marshal, mmap, struct, sys, time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from marshal_scan import CODE_TAGS
+
+# (first magic, last magic, version) -- last magic of each release per Lib/importlib/_bootstrap_external.py
+MAGIC_RANGES = [
+    (3000, 3131, "3.0"), (3140, 3151, "3.1"), (3160, 3180, "3.2"), (3190, 3230, "3.3"),
+    (3250, 3310, "3.4"), (3320, 3351, "3.5"), (3360, 3379, "3.6"), (3390, 3394, "3.7"),
+    (3400, 3413, "3.8"), (3420, 3425, "3.9"), (3430, 3439, "3.10"), (3450, 3495, "3.11"),
+    (3500, 3531, "3.12"), (3550, 3571, "3.13"), (3600, 3699, "3.14"),
+]
+_RANGE_STARTS = [lo for lo, _, _ in MAGIC_RANGES]
+
+FLAG_HASH_BASED = 0x1
+FLAG_CHECK_SOURCE = 0x2
+
+PycHeader = namedtuple("PycHeader", "magic version layout flags offset mtime source_size source_hash")
+
+def magic_to_version(magic):
+    """Return the CPython version string for a magic number, or None."""
+    i = bisect.bisect_right(_RANGE_STARTS, magic) - 1
+    if i >= 0 and magic <= MAGIC_RANGES[i][1]:
+        return MAGIC_RANGES[i][2]
+    return None
+
+def _is_code_tag(buf, pos):
+    return pos < len(buf) and buf[pos:pos + 1] in CODE_TAGS
+
+def parse_header(buf):
+    """Parse the header at the start of buf (bytes, mmap or memoryview); raises ValueError."""
+    if _is_code_tag(buf, 0):
+        return PycHeader(None, None, "bare", 0, 0, None, None, None)
+    if len(buf) < 12 or bytes(buf[2:4]) != b"\r\n":
+        raise ValueError(f"no pyc magic and no marshal code tag (starts with {bytes(buf[:4])!r})")
+    magic = struct.unpack_from("<H", buf, 0)[0]
+    version = magic_to_version(magic)
+    if version is None:
+        raise ValueError(f"unknown pyc magic {magic}")
+    major_minor = tuple(int(x) for x in version.split("."))
+    if major_minor < (3, 3):
+        return PycHeader(magic, version, "legacy-8", 0, 8, struct.unpack_from("<I", buf, 4)[0], None, None)
+    flags = struct.unpack_from("<I", buf, 4)[0]
+    if major_minor >= (3, 7) and flags in (0, FLAG_HASH_BASED, FLAG_HASH_BASED | FLAG_CHECK_SOURCE) \
+            and (_is_code_tag(buf, 16) or not _is_code_tag(buf, 12)):
+        if flags & FLAG_HASH_BASED:
+            return PycHeader(magic, version, "pep552-hash", flags, 16, None, None, bytes(buf[8:16]))
+        mtime, size = struct.unpack_from("<II", buf, 8)
+        return PycHeader(magic, version, "pep552-timestamp", flags, 16, mtime, size, None)
+    mtime, size = struct.unpack_from("<II", buf, 4)
+    return PycHeader(magic, version, "legacy-12", 0, 12, mtime, size, None)
+
+def build_header(mtime=None, source_size=0, magic=importlib.util.MAGIC_NUMBER):
+    """Return a 16-byte PEP 552 timestamp header for the running interpreter."""
+    if mtime is None:
+        mtime = int(time.time())
+    return magic + struct.pack("<III", 0, mtime & 0xFFFFFFFF, source_size & 0xFFFFFFFF)
+
+@contextmanager
+def open_pyc(path):
+    """Yield (PycHeader, memoryview of the marshal payload) over an mmap of path."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as mv:
+                hdr = parse_header(mm)
+                payload = mv[hdr.offset:]
+                try:
+                    yield hdr, payload
+                finally:
+                    payload.release()
+
+def map_pyc(path):
+    """Return (PycHeader, memoryview of the marshal payload) over an mmap of path.
+
+    Unlike open_pyc() nothing is closed on return: the mapping lives as long as the
+    view or any slice of it, so zero-copy decoders (marshal_reader.loads) can keep
+    memoryview slices of the payload.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    hdr = parse_header(mm)
+    return hdr, memoryview(mm)[hdr.offset:]
+
+def load_pyc(path, force=False):
+    """Return (PycHeader, code object).
+
+    Raises ValueError if the pyc was written by a different CPython version than the
+    running one (marshal formats differ), unless force=True.
+    """
+    running = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    with open_pyc(path) as (hdr, payload):
+        if hdr.version is not None and hdr.version != running and not force:
+            raise ValueError(f"{path} is a CPython {hdr.version} pyc, running {running}")
+        return hdr, marshal.loads(payload)
+
+if __name__ == "__main__":
+    import argparse, glob
+    p = argparse.ArgumentParser(description="Identify pyc headers (version, layout, payload offset)")
+    p.add_argument("files", nargs="+", help="pyc files or glob patterns")
+    args = p.parse_args()
+    paths = [m for pat in args.files for m in (sorted(glob.glob(pat)) or [pat])]
+    start = time.time()
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                hdr = parse_header(f.read(17))
+        except (OSError, ValueError) as e:
+            print(f"{path}: error: {e}")
+            continue
+        print(f"{path}: version={hdr.version or '?'} layout={hdr.layout} offset={hdr.offset} "
+              f"flags={hdr.flags:#x}" + (f" mtime={hdr.mtime}" if hdr.mtime is not None else ""))
+    print(f"[+] {len(paths)} file(s) in {(time.time() - start) * 1000:.1f} ms")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+rc4_batch.py
+
+Shared RC4 (ARC4) implementation for the Chimera attack scripts.
+
+  - rc4(key, data, drop=0)        : reference single-key RC4 (the same routine that used
+                                    to be pasted into largeFile.py, testing63.py, testing65.py
+                                    and chimera_decrypt_attempts.py).
+  - RC4Stream(key).keystream(n)  : resumable single-key keystream, used for early-exit
+                                    prefix checks (see plaintext_filter.py).
+  - rc4_keystream_batch(keys, n)  : KSA + PRGA for N keys at once over an (N, 256) NumPy
+                                    state matrix, returns an (N, n) uint8 keystream.
+  - rc4_batch(keys, data)         : (N, len(data)) uint8 array, data XOR keystream per key.
+
+The batched version is a straight vectorisation: every key in the batch executes
+the same 256 KSA rounds and len(data) PRGA rounds, only the column index j differs
+per row, so each round is a handful of fancy-indexed NumPy ops over N rows instead
+of N Python-level loops. The state is stored column-major so the S[:, i] column
+touched every round is one contiguous slice.
+
+Benchmark (keys/second vs. the pure-Python rc4):
+  python3 rc4_batch.py --keys 20000 --batch 4096
+"""
+import argparse, binascii, os, time
+import numpy as np
+
+SIG_HEX = "6d1b40491d416f6540075a465b424c0d4e0a0c53"
+ENC_HEX = "7232622d0d9ef21f70183582cffc9014f14fad235df3e2c04cd0c1650ceaecae1162a78caa21a19dc290"
+
+SIG = binascii.unhexlify(SIG_HEX)
+ENC = binascii.unhexlify(ENC_HEX)
+
+# --- reference RC4 ---
+def rc4(key, data: bytes, drop=0) -> bytes:
+    S = list(range(256))
+    j = 0
+    if not isinstance(key, (bytes, bytearray)):
+        key = key if key is not None else b''
+        key = str(key).encode('utf-8', errors='ignore')
+    for i in range(256):
+        j = (j + S[i] + key[i % len(key)]) & 0xff
+        S[i], S[j] = S[j], S[i]
+    i = j = 0
+    # drop keystream bytes if requested (RC4-dropN)
+    for _ in range(drop):
+        i = (i + 1) & 0xff
+        j = (j + S[i]) & 0xff
+        S[i], S[j] = S[j], S[i]
+    out = bytearray()
+    for b in data:
+        i = (i + 1) & 0xff
+        j = (j + S[i]) & 0xff
+        S[i], S[j] = S[j], S[i]
+        out.append(b ^ S[(S[i] + S[j]) & 0xff])
+    return bytes(out)
+
+class RC4Stream:
+    """Resumable single-key RC4: keystream bytes are generated only on demand."""
+    __slots__ = ("S", "i", "j")
+
+    def __init__(self, key):
+        if not isinstance(key, (bytes, bytearray)):
+            key = str(key if key is not None else '').encode('utf-8', errors='ignore')
+        S = list(range(256))
+        j = 0
+        for i in range(256):
+            j = (j + S[i] + key[i % len(key)]) & 0xff
+            S[i], S[j] = S[j], S[i]
+        self.S = S
+        self.i = self.j = 0
+
+    def keystream(self, n):
+        S, i, j = self.S, self.i, self.j
+        out = bytearray(n)
+        for k in range(n):
+            i = (i + 1) & 0xff
+            j = (j + S[i]) & 0xff
+            S[i], S[j] = S[j], S[i]
+            out[k] = S[(S[i] + S[j]) & 0xff]
+        self.i, self.j = i, j
+        return bytes(out)
+
+# --- batched RC4 ---
+def _key_schedule_matrix(keys):
+    """Return an (N, 256) uint8 matrix where row n is keys[n] repeated to 256 bytes."""
+    rows = []
+    for k in keys:
+        if not isinstance(k, (bytes, bytearray)):
+            k = str(k if k is not None else '').encode('utf-8', errors='ignore')
+        if not k:
+            raise ValueError("RC4 key must not be empty")
+        rows.append((bytes(k) * (256 // len(k) + 1))[:256])
+    return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), 256)
+
+def rc4_ksa_batch(keys):
+    """Run the RC4 key schedule for every key; returns the (N, 256) uint8 state matrix.
+
+    The matrix is column-major (a transposed view of a (256, N) buffer) so that
+    S[:, i] -- the column every round touches -- is contiguous in memory.
+    """
+    K = np.ascontiguousarray(_key_schedule_matrix(keys).T)
+    n = K.shape[1]
+    St = np.repeat(np.arange(256, dtype=np.uint8)[:, None], n, axis=1)
+    # flat buffer: state byte c of key r lives at c * n + r
+    flat = St.reshape(-1)
+    cols = np.arange(n, dtype=np.intp)
+    j = np.zeros(n, dtype=np.intp)
+    for i in range(256):
+        si = St[i].copy()
+        j += si; j += K[i]; j &= 0xff
+        idx = j * n + cols
+        St[i] = flat[idx]
+        flat[idx] = si
+    return St.T
+
+def rc4_keystream_batch(keys, length, drop=0, S=None):
+    """Return an (N, length) uint8 keystream for every key (after dropping `drop` bytes).
+
+    A precomputed state matrix from rc4_ksa_batch() can be passed as S; it is
+    advanced in place (it is copied first if it is not column-major).
+    """
+    if S is None:
+        S = rc4_ksa_batch(keys)
+    St = S.T
+    if not St.flags.c_contiguous:
+        St = np.ascontiguousarray(St)
+    n = St.shape[1]
+    flat = St.reshape(-1)
+    cols = np.arange(n, dtype=np.intp)
+    out = np.empty((length, n), dtype=np.uint8)
+    j = np.zeros(n, dtype=np.intp)
+    i = 0
+    for t in range(drop + length):
+        i = (i + 1) & 0xff
+        si = St[i].copy()
+        j += si; j &= 0xff
+        idx = j * n + cols
+        sj = flat[idx]
+        St[i] = sj
+        flat[idx] = si
+        if t >= drop:
+            out[t - drop] = flat[((si.astype(np.intp) + sj) & 0xff) * n + cols]
+    return out.T
+
+def rc4_batch(keys, data: bytes, drop=0):
+    """Decrypt `data` under every key; returns an (N, len(data)) uint8 array."""
+    ks = rc4_keystream_batch(keys, len(data), drop=drop)
+    return ks ^ np.frombuffer(bytes(data), dtype=np.uint8)
+
+# --- benchmark ---
+def benchmark(n_keys=20000, batch=4096, data=ENC):
+    keys = [os.urandom(1 + (k % 32)) for k in range(n_keys)]
+
+    start = time.time()
+    ref = [rc4(k, data) for k in keys]
+    t_ref = time.time() - start
+
+    start = time.time()
+    got = []
+    for off in range(0, n_keys, batch):
+        got.extend(bytes(row) for row in rc4_batch(keys[off:off + batch], data))
+    t_batch = time.time() - start
+
+    if got != ref:
+        raise AssertionError("rc4_batch output differs from reference rc4()")
+    print(f"[+] {n_keys} keys, {len(data)}-byte ciphertext, batch size {batch}")
+    print(f"    rc4()       : {t_ref:8.2f}s  {n_keys / t_ref:12.0f} keys/s")
+    print(f"    rc4_batch() : {t_batch:8.2f}s  {n_keys / t_batch:12.0f} keys/s")
+    print(f"    speedup     : {t_ref / t_batch:8.1f}x")
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Benchmark batched RC4 against the pure-Python rc4()")
+    p.add_argument("--keys", type=int, default=20000, help="number of random keys to test")
+    p.add_argument("--batch", type=int, default=4096, help="keys per rc4_batch() call")
+    args = p.parse_args()
+    benchmark(args.keys, args.batch)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+signature_solver.py
+
+Solve a payload's per-byte signature check for its input instead of guessing it.
+
+activate_catalyst builds
+    user_signature = bytes(c ^ (i + 42) for i, c in enumerate(current_user))
+and compares it to LEAD_RESEARCHER_SIGNATURE; largeFile.py and
+chimera_decrypt_attempts.py spent their time guessing current_user from word
+lists. When every output byte depends only on its position and the input byte at
+that position, the check can be inverted directly.
+
+The analysis works on the bytecode of any 3.8 - 3.13 payload (decompile.instructions,
+so no matching interpreter is needed):
+
+  1. find comprehension loops of the form "for i, c in enumerate(x)" (or
+     "for c in x") whose element expression uses only i, c, integer constants
+     and arithmetic / bitwise operators -- genexprs, pre-3.12 <listcomp> code
+     objects and 3.12+ inlined list comprehensions;
+  2. check the result is passed to bytes()/bytearray() and stored in a name, and
+     find ==/!= comparisons of that name against a bytes constant (directly or
+     through a name assigned from one);
+  3. for every position i, evaluate the expression for all 256 input bytes and
+     keep those that produce the target byte (bytes() rejects values outside
+     0..255, so a transform without "& 0xFF" can also have no preimage).
+
+Each position with exactly one preimage is "unique"; if all are, the input is
+recovered outright. Anything the pattern does not cover (hash calls, key-dependent
+constants, cross-byte dependencies) is reported as not recognised -- those are the
+cases where a word-list search is still needed.
+
+Usage:
+  for inp in solved_inputs("decompressed.bin", "3.12"): ...
+  python3 signature_solver.py decompressed.bin --version 3.12
+"""
+import itertools
+from collections import namedtuple
+
+from decompile import OLD_BINARY, UNARY, as_code, instructions
+from marshal_reader import Code, MissingVersion, iter_code, load_code
+
+Transform = namedtuple("Transform", "code_name index_var byte_var expr source_var result_var")
+Solution = namedtuple("Solution", "transform target preimages status")
+
+_LOADS = {"LOAD_FAST", "LOAD_FAST_CHECK", "LOAD_NAME", "LOAD_GLOBAL", "LOAD_DEREF"}
+_STORES = {"STORE_FAST", "STORE_NAME", "STORE_GLOBAL", "STORE_DEREF"}
+_OPS = {
+    "+": lambda a, b: a + b, "-": lambda a, b: a - b, "*": lambda a, b: a * b,
+    "^": lambda a, b: a ^ b, "&": lambda a, b: a & b, "|": lambda a, b: a | b,
+    "<<": lambda a, b: a << b, ">>": lambda a, b: a >> b,
+    "%": lambda a, b: a % b if b else None, "//": lambda a, b: a // b if b else None,
+}
+_UNARY = {"-": lambda a: -a, "+": lambda a: a, "~": lambda a: ~a}
+
+# --- element expression ------------------------------------------------------------
+
+def _expr(instrs, loopvars):
+    """Stack-evaluate a straight-line element expression into a tuple tree, or None."""
+    stack = []
+    for ins in instrs:
+        n = ins.opname
+        if n in ("NOP", "EXTENDED_ARG", "RESUME"):
+            continue
+        if n in ("LOAD_FAST", "LOAD_FAST_CHECK") and ins.argval in loopvars:
+            stack.append(("var", ins.argval))
+        elif n == "LOAD_FAST_LOAD_FAST" and all(v in loopvars for v in ins.argval):
+            stack.extend(("var", v) for v in ins.argval)
+        elif n == "LOAD_CONST" and type(ins.argval) is int:
+            stack.append(("const", ins.argval))
+        elif n == "LOAD_SMALL_INT":
+            stack.append(("const", ins.arg))
+        elif n == "BINARY_OP" or (n.startswith(("BINARY_", "INPLACE_")) and n.split("_", 1)[1] in OLD_BINARY):
+            op = ins.argval.rstrip("=") if n == "BINARY_OP" else OLD_BINARY[n.split("_", 1)[1]]
+            if op not in _OPS or len(stack) < 2:
+                return None
+            r, l = stack.pop(), stack.pop()
+            stack.append(("op", op, l, r))
+        elif n in UNARY and UNARY[n].strip() in _UNARY and stack:
+            stack.append(("unary", UNARY[n].strip(), stack.pop()))
+        else:
+            return None
+    return stack[0] if len(stack) == 1 else None
+
+def evaluate(expr, i, c):
+    kind = expr[0]
+    if kind == "const":
+        return expr[1]
+    if kind == "var":
+        return i if expr[1] == "i" else c
+    if kind == "unary":
+        v = evaluate(expr[2], i, c)
+        return None if v is None else _UNARY[expr[1]](v)
+    l, r = evaluate(expr[2], i, c), evaluate(expr[3], i, c)
+    if l is None or r is None or (expr[1] in ("<<", ">>") and not 0 <= r < 64):
+        return None
+    return _OPS[expr[1]](l, r)
+
+def render(expr, names=("i", "c")):
+    kind = expr[0]
+    if kind == "const":
+        return hex(expr[1]) if expr[1] in (0xFF, 0xFFFF) else str(expr[1])
+    if kind == "var":
+        return names[0] if expr[1] == "i" else names[1]
+    if kind == "unary":
+        return f"{expr[1]}{render(expr[2], names)}"
+    return f"({render(expr[2], names)} {expr[1]} {render(expr[3], names)})"
+
+def _canonical(expr, index_var, byte_var):
+    # rename the loop variables to "i" / "c" so evaluate() does not need a mapping
+    if expr[0] == "var":
+        return ("var", "i" if expr[1] == index_var else "c")
+    if expr[0] == "const":
+        return expr
+    if expr[0] == "unary":
+        return ("unary", expr[1], _canonical(expr[2], index_var, byte_var))
+    return ("op", expr[1], _canonical(expr[2], index_var, byte_var), _canonical(expr[3], index_var, byte_var))
+
+# --- loop / call-site recognition ----------------------------------------------------
+
+def _loops(instrs):
+    """Yield (for_iter index, index var or None, byte var, element expr, loop end index)."""
+    by_offset = {ins.offset: k for k, ins in enumerate(instrs)}
+    for k, ins in enumerate(instrs):
+        if ins.opname != "FOR_ITER":
+            continue
+        j = k + 1
+        names, pending = [], []
+        want = 2 if j < len(instrs) and instrs[j].opname == "UNPACK_SEQUENCE" and instrs[j].arg == 2 else 1
+        j += want == 2
+        while j < len(instrs) and len(names) < want:
+            ins_j = instrs[j]
+            if ins_j.opname == "STORE_FAST_STORE_FAST":
+                names.extend(ins_j.argval)
+            elif ins_j.opname == "STORE_FAST_LOAD_FAST":
+                # 3.13: store the last loop variable and load the first operand in one op
+                names.append(ins_j.argval[0])
+                pending.append(ins_j._replace(opname="LOAD_FAST", argval=ins_j.argval[1]))
+            elif ins_j.opname in _STORES:
+                names.append(ins_j.argval)
+            else:
+                break
+            j += 1
+        if len(names) != want:
+            continue
+        index_var, byte_var = names if want == 2 else (None, names[0])
+        end = j
+        while end < len(instrs) and instrs[end].opname not in ("YIELD_VALUE", "LIST_APPEND"):
+            end += 1
+        if end == len(instrs):
+            continue
+        loopvars = {byte_var} | ({index_var} if index_var else set())
+        expr = _expr(pending + instrs[j:end], loopvars)
+        if expr is None:
+            continue
+        yield k, index_var, byte_var, _canonical(expr, index_var, byte_var), by_offset.get(ins.target, end)
+
+def _site(instrs, first, last, loopvars):
+    """Names loaded around a comprehension and the name its result is stored to."""
+    back = first
+    while back > 0 and instrs[back - 1].opname not in _STORES:
+        back -= 1
+    fwd = last + 1
+    while fwd < len(instrs) and not (instrs[fwd].opname in _STORES and instrs[fwd].argval not in loopvars):
+        fwd += 1
+    loaded = [ins.argval for ins in instrs[back:fwd] if ins.opname in _LOADS]
+    result = instrs[fwd].argval if fwd < len(instrs) else None
+    return loaded, result, fwd
+
+def find_transforms(co):
+    """Yield (Transform, code object holding the result, index after the result store)."""
+    codes = list(iter_code(as_code(co)))
+    parent = {id(k): c for c in codes for k in c.consts if isinstance(k, Code)}
+    listing = {id(c): instructions(c) for c in codes}
+    for c in codes:
+        for k, index_var, byte_var, expr, end in _loops(listing[id(c)]):
+            loopvars = {index_var, byte_var, ".0"}
+            if id(c) in parent and listing[id(c)][:k] and \
+                    any(ins.opname == "LOAD_FAST" and ins.argval == ".0" for ins in listing[id(c)][:k]):
+                # genexpr / pre-3.12 listcomp: the call site is in the parent code object
+                host = parent[id(c)]
+                pins = listing[id(host)]
+                m = next((n for n, ins in enumerate(pins) if ins.opname == "LOAD_CONST" and ins.argval is c), None)
+                if m is None:
+                    continue
+                loaded, result, fwd = _site(pins, m, m, loopvars)
+            else:
+                host = c
+                loaded, result, fwd = _site(listing[id(c)], k, end, loopvars)
+            if result is None or not {"bytes", "bytearray"} & set(loaded):
+                continue
+            if index_var is not None and "enumerate" not in loaded:
+                continue
+            sources = [n for n in loaded if n not in ("bytes", "bytearray", "enumerate") and n not in loopvars]
+            yield (Transform(c.qualname, index_var, byte_var, expr, sources[0] if sources else None, result),
+                   host, fwd)
+
+def _bytes_assignments(instrs):
+    consts = {}
+    for a, b in zip(instrs, instrs[1:]):
+        if a.opname == "LOAD_CONST" and isinstance(a.argval, (bytes, memoryview)) and b.opname in _STORES:
+            consts[b.argval] = bytes(a.argval)
+    return consts
+
+def find_targets(host, after, result_var, module=None):
+    """Return the bytes constants the stored result is compared against with == or !=.
+
+    Names are resolved through bytes-constant assignments in host, then in module
+    (the top-level code object) for globals.
+    """
+    instrs = instructions(host)
+    consts = _bytes_assignments(instructions(module)) if module is not None and module is not host else {}
+    consts.update(_bytes_assignments(instrs))
+    targets = []
+    for k in range(after, len(instrs)):
+        ins = instrs[k]
+        if ins.opname != "COMPARE_OP" or ins.argval not in ("==", "!="):
+            continue
+        operands = []
+        for prev in (instrs[k - 1], instrs[k - 2]) if k >= 2 else ():
+            if prev.opname == "LOAD_FAST_LOAD_FAST":
+                operands = [("name", n) for n in prev.argval]
+                break
+            if prev.opname == "LOAD_CONST" and isinstance(prev.argval, (bytes, memoryview)):
+                operands.append(("const", bytes(prev.argval)))
+            elif prev.opname in _LOADS:
+                operands.append(("name", prev.argval))
+        if ("name", result_var) not in operands:
+            continue
+        for kind, v in operands:
+            t = v if kind == "const" else consts.get(v) if v != result_var else None
+            if t is not None and t not in targets:
+                targets.append(t)
+    return targets
+
+# --- solving -------------------------------------------------------------------------
+
+def invert(expr, target):
+    """Return, per position, the input bytes c with expr(i, c) == target[i]."""
+    return [[c for c in range(256) if evaluate(expr, i, c) == t] for i, t in enumerate(target)]
+
+def solve(co):
+    """Return a Solution for every recognised transform / comparison pair in co."""
+    out = []
+    root = as_code(co)
+    for tr, host, after in find_transforms(root):
+        for target in find_targets(host, after, tr.result_var, root):
+            pre = invert(tr.expr, target)
+            status = ("unsatisfiable" if any(not p for p in pre) else
+                      "unique" if all(len(p) == 1 for p in pre) else "ambiguous")
+            out.append(Solution(tr, target, pre, status))
+    return out
+
+def solved_inputs(path_or_code, version=None, limit=16):
+    """Inputs that pass the payload's signature check, at most `limit` (empty if none is invertible).
+
+    A bare dump needs `version`: load_code() raises MissingVersion rather than
+    guessing an opcode table, since a wrong guess would look like "nothing found".
+    """
+    co = load_code(path_or_code, version)[1] if isinstance(path_or_code, str) else path_or_code
+    found = []
+    for sol in solve(co):
+        if sol.status == "unsatisfiable":
+            continue
+        for combo in itertools.islice(itertools.product(*sol.preimages), limit - len(found)):
+            found.append(bytes(combo))
+        if len(found) >= limit:
+            break
+    return found
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Invert per-byte signature checks in a pyc / marshal dump")
+    p.add_argument("payload", help="pyc or bare marshal dump")
+    p.add_argument("--version", default=None, help="CPython version (3.X) of a bare dump")
+    p.add_argument("--limit", type=int, default=16, help="inputs to list for ambiguous transforms")
+    args = p.parse_args()
+
+    try:
+        hdr, co = load_code(args.payload, args.version)
+    except MissingVersion as e:
+        raise SystemExit(f"[!] {e}; pass --version 3.X (a wrong version finds nothing, it does not prove anything)")
+    sols = solve(co)
+    if not sols:
+        source = "its pyc header" if args.version is None else "--version"
+        print(f"[-] no invertible per-byte transform compared against a bytes constant when decoded as "
+              f"CPython {hdr.version} ({source}); if that version is right, the check needs a word-list search")
+    for sol in sols:
+        tr = sol.transform
+        expr = render(tr.expr, (tr.index_var or "i", tr.byte_var))
+        print(f"[+] {tr.code_name}: {tr.result_var} = bytes({expr} for "
+              f"{tr.index_var + ', ' if tr.index_var else ''}{tr.byte_var} in "
+              f"{'enumerate(' + str(tr.source_var) + ')' if tr.index_var else tr.source_var})")
+        print(f"    compared with {sol.target!r} ({len(sol.target)} bytes): {sol.status}")
+        if sol.status == "unsatisfiable":
+            bad = [i for i, pre in enumerate(sol.preimages) if not pre]
+            print(f"    no input byte reaches the target at positions {bad[:10]}")
+            continue
+        n = 1
+        for pre in sol.preimages:
+            n *= len(pre)
+        for combo in itertools.islice(itertools.product(*sol.preimages), args.limit):
+            inp = bytes(combo)
+            text = inp.decode("latin-1")
+            print(f"✅ {tr.source_var or 'input'} = {inp!r}" + (f"  ({text})" if text.isprintable() else ""))
+        if n > args.limit:
+            print(f"    ... {n} inputs in total")
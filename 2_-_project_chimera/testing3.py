@@ -11,6 +11,7 @@ import cowsay
 import pyjokes
 import art
 from arc4 import ARC4
+from pyc_header import build_header
 
 base64.FunctionType = types.FunctionType
 
@@ -36,14 +37,10 @@ pyc_filename = "chimera_payload42.pyc"
 
 # Generate valid .pyc header
 # Use current interpreter's magic number
-magic = importlib.util.MAGIC_NUMBER
-timestamp = struct.pack("I", int(time.time()))
-padding = b'\x00\x00\x00\x00'  # for hash-based pyc, just filler
+header = build_header()   # 16-byte PEP 552 header (flags=0, mtime, size)
 
 with open(pyc_filename, "wb") as f:
-    f.write(magic)
-    f.write(timestamp)
-    f.write(padding)
+    f.write(header)
     f.write(marshal.dumps(code))
 
 print(f"✅ Successfully wrote {pyc_filename}")
@@ -24,21 +24,8 @@ ENC_HEX = "7232622d0d9ef21f70183582cffc9014f14fad235df3e2c04cd0c1650ceaecae1162a
 SIG = binascii.unhexlify(SIG_HEX)
 ENC = binascii.unhexlify(ENC_HEX)
 
-def rc4(key: bytes, data: bytes) -> bytes:
-    S = list(range(256))
-    j = 0
-    key_bytes = key if isinstance(key, (bytes, bytearray)) else key.encode()
-    for i in range(256):
-        j = (j + S[i] + key_bytes[i % len(key_bytes)]) & 0xff
-        S[i], S[j] = S[j], S[i]
-    i = j = 0
-    out = bytearray()
-    for b in data:
-        i = (i + 1) & 0xff
-        j = (j + S[i]) & 0xff
-        S[i], S[j] = S[j], S[i]
-        out.append(b ^ S[(S[i] + S[j]) & 0xff])
-    return bytes(out)
+# shared RC4 implementation (see rc4_batch.py)
+from rc4_batch import rc4
 
 def try_decrypt_with_key(key_bytes: bytes):
     dec = rc4(key_bytes, ENC)
@@ -1,8 +1,14 @@
-import ast, base64, zlib, marshal, types, asyncio, json, os, sys, binascii
+import ast, base64, zlib, marshal, types, asyncio, os, sys, binascii, time
 from collections import deque
 
-OUT_JSON = "instrumented_output.json"
-OUT_TXT  = "instrumented_output.txt"
+from async_driver import VirtualClock, run_all
+from trace_sink import TraceSink
+
+# JSON lines (rewritten each run), one "run" record + its "call" records per candidate;
+# query / render as text with: python3 trace_sink.py instrumented_output.jsonl --text
+OUT_TRACE = "instrumented_output.jsonl"
+CONCURRENCY = 64          # candidates in flight on the single event loop
+VIRTUAL_CLOCK = True      # payload's asyncio.sleep advances a virtual clock instead of waiting
 
 # --- Safety: helper mocks to minimize side-effects ---
 class ARC4Mock:
@@ -12,14 +18,16 @@ class ARC4Mock:
         cls.instances.clear()
     def __init__(self, key=None):
         self.key = key
-        ARC4Mock.instances.append({"call":"init", "key":repr(key)})
+        type(self).instances.append({"call":"init", "key":repr(key), "t":time.perf_counter()})
     def decrypt(self, data):
-        ARC4Mock.instances.append({"call":"decrypt", "key":repr(self.key), "data_hex":binascii.hexlify(data).decode()})
+        type(self).instances.append({"call":"decrypt", "key":repr(self.key), "data_len":len(data),
+                                     "t":time.perf_counter(), "data_hex":binascii.hexlify(data).decode()})
         # return empty bytes (we're only recording calls)
         return b''
-    @staticmethod
-    def decrypt_static(key, data):
-        ARC4Mock.instances.append({"call":"decrypt_static", "key":repr(key), "data_hex":binascii.hexlify(data).decode()})
+    @classmethod
+    def decrypt_static(cls, key, data):
+        cls.instances.append({"call":"decrypt_static", "key":repr(key), "data_len":len(data),
+                              "t":time.perf_counter(), "data_hex":binascii.hexlify(data).decode()})
         return b''
 
 class SafeOS:
@@ -72,7 +80,7 @@ def load_blob2_from_source(path="testing2.py"):
         raise RuntimeError("Tidak menemukan literal blob2 dalam testing2.py")
     return blob2_text.encode("latin1")
 
-def safe_globals_for(login_value):
+def safe_globals_for(login_value, clock=None):
     printed = []
     # copy builtins but override print
     safe_builtins = SAFE_BUILTINS.copy()
@@ -81,10 +89,12 @@ def safe_globals_for(login_value):
     # mocks
     g["os"] = SafeOS(login_value)
     g["getpass"] = SafeGetpass(login_value)
-    g["ARC4"] = ARC4Mock
-    g["arc4"] = ARC4Mock
+    # per-run recorder class, so concurrent runs don't share ARC4Mock.instances
+    arc4 = type("ARC4Mock", (ARC4Mock,), {"instances": []})
+    g["ARC4"] = arc4
+    g["arc4"] = arc4
     # common harmless mocks
-    g["asyncio"] = __import__("asyncio")
+    g["asyncio"] = clock.asyncio if clock is not None else __import__("asyncio")
     g["random"] = types.SimpleNamespace(choice=lambda seq: seq[0])
     g["pyjokes"] = types.SimpleNamespace(get_joke=lambda: "jk")
     g["art"] = types.SimpleNamespace(tprint=lambda *a, **k: None)
@@ -134,7 +144,6 @@ def main():
         return
 
     print("Ditemukan code object activate_catalyst. Membuat function dan menjalankan dengan mocks.")
-    results = []
     # candidates: kamu bisa tambahkan nama/email di sini sebelum menjalankan
     candidates = [
         "alistair", "alistair.khem", "alistair_khem", "dr.alistair",
@@ -142,23 +151,22 @@ def main():
         "teddy", "teddy.zugana"
     ]
 
-    for cand in candidates:
-        print(f"\n-- Running candidate login: {cand}")
-      
+    clock = VirtualClock() if VIRTUAL_CLOCK else None
+
+    async def run_candidate(cand):
+        print(f"-- Running candidate login: {cand}")
+        g, printed = safe_globals_for(cand, clock)
+        entry = {"candidate": cand, "status": None}
+        if clock is not None:
+            clock.reset()
+        t0 = time.perf_counter()
         try:
-            ARC4Mock.reset()
-            g, printed = safe_globals_for(cand)
             # Build function object bound to our safe globals
             func = types.FunctionType(act_co, g)
-            entry = {"candidate": cand, "status": None, "printed": [], "arc4_calls": []}
-            # act_co is often async; if so, run with asyncio.run
-            res = None
-            if asyncio.iscoroutinefunction(func):
-                # run via asyncio.run (safe local process)
-                asyncio.run(func())   # if it triggers SystemExit, will propagate
-            else:
-                # sync function
-                func()
+            # act_co is often async; it runs as one task on the shared loop
+            res = func()
+            if asyncio.iscoroutine(res):
+                await res
             entry["status"] = "ran_ok"
         except SystemExit as se:
             entry["status"] = "system_exit"
@@ -166,25 +174,18 @@ def main():
         except Exception as e:
             entry["status"] = "error"
             printed.append(f"Exception: {type(e).__name__}: {e}")
+        entry["seconds"] = round(time.perf_counter() - t0, 6)
+        if clock is not None:
+            entry["virtual_sleep"] = clock.time()
         entry["printed"] = printed[:]
-        # record ARC4Mock instances
-        entry["arc4_calls"] = list(ARC4Mock.instances)
-        results.append(entry)
-
-    # save results
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2)
-    with open(OUT_TXT, "w", encoding="utf-8") as f:
-        for r in results:
-            f.write(f"Candidate: {r['candidate']} | status: {r['status']}\n")
-            f.write("Printed:\n")
-            for p in r["printed"]:
-                f.write("  " + p + "\n")
-            f.write("ARC4 records:\n")
-            for a in r["arc4_calls"]:
-                f.write("  " + repr(a) + "\n")
-            f.write("\n---\n\n")
-    print("\nDone. Results written to", OUT_JSON, "and", OUT_TXT)
+        # this run's ARC4 calls, written after the run record
+        return entry, g["ARC4"].instances, t0
+
+    with TraceSink(OUT_TRACE) as sink:
+        run_all(candidates, run_candidate, CONCURRENCY,
+                on_result=lambda cand, res: sink.run(*res))
+
+    print("\nDone. Trace written to", OUT_TRACE, f"({sink.runs} runs, {sink.records} records)")
     print("Silakan periksa file tersebut. Jika kamu ingin kandidat lain tambahkan di list 'candidates' di file ini dan jalankan ulang.")
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+trace_sink.py
+
+Streaming JSON-lines trace for the mock ARC4 / OS harness, and a query tool.
+
+testing68.py kept every result and every ARC4Mock record in memory and wrote
+them with json.dump(indent=2) at the very end, so RAM grew with the candidate
+set and a crash lost everything. TraceSink appends one JSON object per line as
+each run finishes (the file is truncated when the sink opens, as the old output
+was overwritten, so run numbers are unique within a file; pass mode="a" to
+append, and every record then carries the "session" it was written by):
+
+  {"type": "run",  "run": 0, "candidate": "alistair", "status": "system_exit",
+   "seconds": 0.0004, "virtual_sleep": 0.01, "printed": [...]}
+  {"type": "call", "run": 0, "candidate": "alistair", "call": "decrypt",
+   "key": "b'alistair'", "data_len": 1085, "t": 0.00012, "data_hex": "..."}
+
+"t" is seconds since the start of the run. Lines go through a normal buffered
+file that is flushed at most every `flush_interval` seconds and on close, so a
+hard kill loses at most that window and never leaves a half-written file
+unreadable (a torn last line is skipped by query()).
+
+Query without loading the file (line by line; --key / --candidate are checked on
+the raw line before it is parsed):
+  python3 trace_sink.py instrumented_output.jsonl --status ran_ok
+  python3 trace_sink.py instrumented_output.jsonl --type call --key "b'alistair'" --count
+  python3 trace_sink.py instrumented_output.jsonl --text          # old .txt layout
+"""
+import argparse, json, os, sys, time
+
+class TraceSink:
+    def __init__(self, path, flush_interval=1.0, mode="w"):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._f = open(path, mode, encoding="utf-8")
+        # appended sessions restart their run numbers, so tag records to keep them apart
+        self._tag = {"session": f"{os.getpid()}-{time.time_ns()}"} if mode == "a" else {}
+        self._last_flush = time.time()
+        self.runs = 0
+        self.records = 0
+
+    def write(self, rec):
+        self._f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self.records += 1
+
+    def run(self, entry, calls=(), t0=None):
+        """Write one run record followed by its ARC4 call records; returns the run index."""
+        n = self.runs
+        self.write({"type": "run", "run": n, **self._tag, **entry})
+        for c in calls:
+            c = dict(c)
+            if t0 is not None and "t" in c:
+                c["t"] = round(c["t"] - t0, 6)
+            self.write({"type": "call", "run": n, **self._tag, "candidate": entry.get("candidate"), **c})
+        self.runs += 1
+        if time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return n
+
+    def flush(self):
+        self._f.flush()
+        self._last_flush = time.time()
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def query(path, type_=None, status=None, key=None, candidate=None):
+    """Yield records matching every given filter.
+
+    status applies to run records; key to call records (the repr()'d key, as
+    written by ARC4Mock). Filtering on key or candidate drops non-matching lines
+    before json.loads by a substring test.
+    """
+    needles = [json.dumps(s, ensure_ascii=False) for s in (key, candidate) if s is not None]
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if needles and not all(n in line for n in needles):
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if type_ and rec.get("type") != type_:
+                continue
+            if status is not None and rec.get("status") != status:
+                continue
+            if key is not None and rec.get("key") != key:
+                continue
+            if candidate is not None and rec.get("candidate") != candidate:
+                continue
+            yield rec
+
+def format_text(recs, out):
+    """Render records in the layout of the old instrumented_output.txt."""
+    pending = None
+    for rec in recs:
+        if rec.get("type") == "run":
+            if pending is not None:
+                out.write("\n---\n\n")
+            pending = rec["run"]
+            out.write(f"Candidate: {rec['candidate']} | status: {rec['status']}\n")
+            out.write("Printed:\n")
+            for p in rec.get("printed", []):
+                out.write("  " + p + "\n")
+            out.write("ARC4 records:\n")
+        elif rec.get("type") == "call":
+            out.write("  " + repr({k: v for k, v in rec.items() if k not in ("type", "run", "session", "candidate")}) + "\n")
+    if pending is not None:
+        out.write("\n---\n\n")
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Filter a harness trace (JSON lines) without loading it")
+    p.add_argument("trace", help="trace file written by TraceSink")
+    p.add_argument("--type", choices=("run", "call"), default=None)
+    p.add_argument("--status", default=None, help="run status (ran_ok, system_exit, error, ...)")
+    p.add_argument("--key", default=None, help="ARC4 key exactly as recorded, e.g. \"b'alistair'\"")
+    p.add_argument("--candidate", default=None)
+    p.add_argument("--count", action="store_true", help="only print the number of matches")
+    p.add_argument("--text", action="store_true", help="human-readable layout (old .txt)")
+    args = p.parse_args()
+
+    start = time.time()
+    recs = query(args.trace, args.type, args.status, args.key, args.candidate)
+    if args.count:
+        n = sum(1 for _ in recs)
+        print(f"[+] {n} matching record(s) in {time.time() - start:.2f}s")
+    elif args.text:
+        format_text(recs, sys.stdout)
+    else:
+        for rec in recs:
+            sys.stdout.write(json.dumps(rec, ensure_ascii=False) + "\n")
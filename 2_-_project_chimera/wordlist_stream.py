@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+wordlist_stream.py
+
+Streaming wordlist access for the offline attack scripts.
+
+The parent process never materialises the word list: byte_ranges() memory-maps
+the file and yields (start, end) byte offsets, each snapped forward to the next
+newline, so a range always holds whole lines. Only integers cross the process
+boundary; each worker calls read_words() to read and split its own slice, or
+maps the file once with map_wordlist() and splits slices of the mapping.
+Startup is O(file_size / chunk_bytes) newline lookups and parent RSS stays flat
+no matter how large the list is (rockyou: ~14M lines, ~140MB).
+
+Usage:
+  for start, end in byte_ranges("rockyou.txt", 1 << 16):
+      pool.apply_async(job, (path, start, end))
+"""
+import mmap, os
+
+def byte_ranges(path, chunk_bytes=1 << 16, start=0):
+    """Yield (start, end) offsets covering the file from `start`, split on line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < size:
+            end = min(pos + chunk_bytes, size)
+            if end < size:
+                nl = mm.find(b"\n", end - 1)
+                end = size if nl < 0 else nl + 1
+            yield pos, end
+            pos = end
+
+def estimate_lines(path, sample_bytes=1 << 20):
+    """Estimate the line count from the average line length of the first sample_bytes."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    if not sample:
+        return 0
+    if len(sample) == size:
+        return sample.count(b"\n") + (not sample.endswith(b"\n"))
+    return max(1, size * sample.count(b"\n") // len(sample))
+
+def map_wordlist(path):
+    """Read-only mmap of the whole file (b"" if empty); every process mapping it shares the page cache."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def read_words(path, start, end):
+    """Return the stripped, non-empty lines in byte range [start, end) of `path`."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return split_words(data)
+
+def split_words(data):
+    """Return the stripped, non-empty lines of a bytes-like slice (e.g. of a shared-memory copy)."""
+    data = bytes(data)
+    words = []
+    for line in data.split(b"\n"):
+        w = line.decode("utf-8", errors="ignore").strip()
+        if w:
+            words.append(w)
+    return words